@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+스크립트 모듈 import 시간 벤치마크
+
+모듈마다 새 인터프리터에서 `python -X importtime -c "import <모듈>"` 을 실행해
+해당 모듈의 누적 import 시간(하위 import 포함, 인터프리터 기동 · site 제외)을 잰다.
+Supabase · 쿠팡 · TMDB 자격 증명을 뺀 환경에서 실행하므로 import 만으로 클라이언트를
+만들거나 환경변수를 검사하는 모듈은 '실패'로 표시된다. 무거운 의존성(requests,
+pandas, pytrends …)이 import 시점에 로드되는지도 함께 보여 준다.
+
+Usage:
+    python bench_import.py                       # 기본 모듈, 5회 반복 중앙값
+    python bench_import.py --repeat 10
+    python bench_import.py --modules blog_generator trend_fetcher
+    python bench_import.py --detail 10           # 모듈별 하위 import 상위 10개
+    python bench_import.py --json import.json    # 결과 기록 (추이 추적용)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+DEFAULT_MODULES = [
+    "blog_generator", "trend_fetcher", "coupang_api", "supabase_rest", "llm_pool",
+    "steam_etl", "tmdb_etl", "refresh_prices",
+]
+# import 시점에 로드되면 안 되는(지연 로드 대상) 의존성
+HEAVY_MODULES = ["requests", "urllib3", "pandas", "pytrends", "supabase"]
+# import 부수효과 검사를 위해 비우는 자격 증명
+CREDENTIAL_VARS = [
+    "NEXT_PUBLIC_SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY",
+    "COUPANG_ACCESS_KEY", "COUPANG_SECRET_KEY", "TMDB_API_KEY",
+]
+
+_PROBE = (
+    "import json, sys; __import__(sys.argv[1]); "
+    "print(json.dumps([m for m in sys.argv[2:] if m in sys.modules]))"
+)
+
+
+def _clean_env() -> dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if k not in CREDENTIAL_VARS}
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """-X importtime 출력 → [(들여쓴 모듈 이름, self µs, 누적 µs)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((name.rstrip(), int(self_us), int(cum_us)))
+        except ValueError:
+            continue   # 헤더 줄
+    return rows
+
+
+def _subtree(rows: list[tuple[str, int, int]], module: str) -> list[tuple[str, int, int]]:
+    """module 이 끌어온 하위 import 만 (자식 줄이 부모 줄보다 먼저, 더 깊게 들여써 출력된다)."""
+    for i, (name, _, _) in enumerate(rows):
+        if name == f" {module}":
+            j = i
+            while j > 0 and rows[j - 1][0].startswith("   "):
+                j -= 1
+            return rows[j:i]
+    return []
+
+
+def measure(module: str) -> dict:
+    """새 인터프리터에서 1회 import. {ok, ms, heavy, rows, error}"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module, *HEAVY_MODULES],
+        cwd=SCRIPTS_DIR, env=_clean_env(), capture_output=True, text=True,
+    )
+    rows = _parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        last = [l for l in proc.stderr.splitlines() if l and not l.startswith("import time:")]
+        return {"ok": False, "ms": 0.0, "heavy": [], "rows": rows,
+                "error": last[-1] if last else f"exit {proc.returncode}"}
+    top = next((cum for name, _, cum in rows if name == f" {module}"), 0)
+    return {"ok": True, "ms": top / 1000, "heavy": json.loads(proc.stdout.strip().splitlines()[-1]),
+            "rows": rows, "error": ""}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="스크립트 모듈 import 시간 벤치마크")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="측정할 모듈")
+    parser.add_argument("--repeat",  type=int, default=5, help="반복 횟수 (기본: 5)")
+    parser.add_argument("--detail",  type=int, default=0,
+                        help="모듈별 누적 시간 상위 N개 하위 import 출력")
+    parser.add_argument("--json",    default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    print(f"\n{'모듈':<18}{'import':>11}  {'자격 증명 없이':<14}무거운 의존성")
+    print("─" * 70)
+    results: dict[str, dict] = {}
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        first = runs[0]
+        if not first["ok"]:
+            results[module] = {"ok": False, "error": first["error"]}
+            print(f"{module:<18}{'-':>11}  {'실패':<14}{first['error'][:60]}")
+            continue
+        ms = statistics.median(r["ms"] for r in runs)
+        results[module] = {"ok": True, "median_ms": round(ms, 2), "heavy": first["heavy"]}
+        print(f"{module:<18}{ms:>9.1f}ms  {'OK':<14}{', '.join(first['heavy']) or '-'}")
+        if args.detail:
+            subs = sorted(_subtree(first["rows"], module), key=lambda r: -r[2])[:args.detail]
+            for name, _, cum in subs:
+                print(f"    {name.strip():<40}{cum / 1000:>8.1f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+블로그 후처리 마이크로 벤치마크
+
+실제 리뷰 글과 같은 구조(H2/H3 섹션, 비교표, 리스트, 이미지, 구매 링크, tags 줄)의
+5k~20k자 합성 문서를 만들어 blog_generator 후처리 함수의 글 1건당 소요 시간을 측정한다.
+마지막 행은 run_pipeline 의 후처리 순서(assemble → stage_review 검수 → md_to_html) 합계.
+
+Usage:
+    python bench_postprocess.py                 # 기본 (5k/10k/20k자, 200회 반복)
+    python bench_postprocess.py --repeat 50
+    python bench_postprocess.py --sizes 5000 20000
+    python bench_postprocess.py --only review assemble
+    python bench_postprocess.py --json bench.json   # 결과 기록 (추이 추적용)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import re
+import statistics
+import time
+from typing import Callable
+
+import blog_generator as bg
+from md_doc import Document
+from text_patterns import RX
+
+
+# ── 기존 regex 캐스케이드 md_to_html (비교 기준) ──────────────────────────────
+
+def _legacy_md_table_to_html(block: str) -> str:
+    lines = [l.strip() for l in block.strip().split("\n") if l.strip()]
+    if len(lines) < 2:
+        return block
+
+    def parse_row(line: str) -> list[str]:
+        return [c.strip() for c in line.strip().strip("|").split("|")]
+
+    header_cells = parse_row(lines[0])
+    if not re.match(r"^[\s|:-]+$", lines[1]):
+        return block
+    rows = [parse_row(l) for l in lines[2:] if not re.match(r"^[\s|:-]+$", l)]
+
+    html = '<div class="overflow-x-auto mb-6"><table class="w-full text-sm border-collapse">\n<thead><tr>'
+    for cell in header_cells:
+        html += f'<th class="border border-zinc-700 bg-zinc-800/50 px-3 py-2 text-left text-xs font-semibold text-zinc-200">{cell}</th>'
+    html += '</tr></thead>\n<tbody>'
+    for row in rows:
+        html += '<tr>'
+        for cell in row:
+            html += f'<td class="border border-zinc-800 px-3 py-2 text-zinc-300">{cell}</td>'
+        html += '</tr>\n'
+    html += '</tbody></table></div>'
+    return html
+
+
+def legacy_md_to_html(md: str) -> str:
+    html = md
+    html = re.sub(
+        r"```(\w*)\n([\s\S]*?)```",
+        lambda m: f'<pre><code class="language-{m.group(1)}">{m.group(2).rstrip()}</code></pre>',
+        html,
+    )
+    html = re.sub(r"`([^`]+)`", r"<code>\1</code>", html)
+    html = re.sub(
+        r"(?:^[ \t]*\|.+\|[ \t]*\n){3,}",
+        lambda m: _legacy_md_table_to_html(m.group(0)),
+        html,
+        flags=re.MULTILINE,
+    )
+    for n in range(4, 0, -1):
+        html = re.sub(r"^" + "#" * n + r" (.+)$", rf"<h{n}>\1</h{n}>", html, flags=re.MULTILINE)
+    html = re.sub(r"\*\*\*(.+?)\*\*\*", r"<strong><em>\1</em></strong>", html)
+    html = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html)
+    html = re.sub(r"\*(.+?)\*",     r"<em>\1</em>",         html)
+    html = re.sub(r"^---+$", "<hr>", html, flags=re.MULTILINE)
+    html = re.sub(r"^\*\*\*+$", "<hr>", html, flags=re.MULTILINE)
+    html = re.sub(r"^[-*] (.+)$", r"<li>\1</li>", html, flags=re.MULTILINE)
+    html = re.sub(r"(<li>.*</li>)", r"<ul>\1</ul>", html, flags=re.DOTALL)
+    paragraphs = re.split(r"\n{2,}", html.strip())
+    parts = []
+    for p in paragraphs:
+        p = p.strip()
+        if not p:
+            continue
+        if p.startswith(("<h", "<ul", "<pre", "<hr", "<div", "<table")):
+            parts.append(p)
+        else:
+            parts.append(f"<p>{p.replace(chr(10), '<br>')}</p>")
+    return "\n".join(parts)
+
+
+# ── 합성 문서 ─────────────────────────────────────────────────────────────────
+
+_SENTENCES = [
+    "재택근무가 늘면서 화상회의 화질 고민이 많아졌습니다.",
+    "가격 대비 **해상도와 마이크 품질**을 함께 보는 것이 중요합니다.",
+    "리뷰 12,400개 기준 평점 4.8점으로 *꾸준한 만족도*를 보여줍니다.",
+    "다만 저조도 환경에서는 노이즈가 눈에 띄는 편입니다.",
+    "설치는 USB 연결만으로 끝나 별도 드라이버가 필요 없습니다.",
+    "Full HD 1080p 30fps 를 지원해 일반적인 회의에는 충분합니다.",
+]
+
+
+def make_products(count: int) -> list[dict]:
+    """벤치마크용 상품 데이터 (coupang_api 필드와 동일한 dict)."""
+    return [
+        {
+            "product_name":  f"홈플래닛 HD 웹캠 모델{i} (마이크내장 오토포커스)",
+            "product_price": 17990 + i * 5000,
+            "product_image": f"https://ads-partners.coupang.com/image1/bench{i}.jpg",
+            "product_url":   f"https://link.coupang.com/re/AFFSDP?itemId={1000 + i}&subid=thivelab",
+        }
+        for i in range(count)
+    ]
+
+
+def make_article(target_chars: int, products: list[dict], seed: int = 0) -> str:
+    """target_chars 이상 분량의 리뷰 형식 마크다운 문서 생성."""
+    rnd = random.Random(seed)
+
+    def para(k: int = 3) -> str:
+        return " ".join(rnd.choice(_SENTENCES) for _ in range(k))
+
+    out = [
+        "## 웹캠, 어떤 기준으로 골라야 할까?", "", para(), "",
+        "- 해상도: 1080p 이상", "- 마이크: 노이즈 캔슬링 여부", "- 화각: 90도 내외", "",
+        "| 제품명 | 가격 | 핵심 스펙 | 평점 | 구매링크 |", "|---|---|---|---|---|",
+    ]
+    for p in products:
+        out.append(f"| {p['product_name'][:20]} | {p['product_price']:,}원 | 1080p | 4.5 | "
+                   f"[구매하러가기]({p['product_url']}) |")
+    out.append("")
+    section = 0
+    while len("\n".join(out)) < target_chars:
+        p = products[section % len(products)]
+        out += [
+            f"### {p['product_name']}", "", para(4), "",
+            "**장점**", "- 선명한 화질", "- 간편한 설치", "",
+            "**단점**", "- 저조도 노이즈", "",
+            para(2), "",
+            f"[🛒 쿠팡에서 구매하기]({p['product_url']})", "",
+        ]
+        section += 1
+        if section % 3 == 0:
+            out += [f"## 가격대별로 정리하면? ({section})", "", para(), "", "---", ""]
+    out += ["## 최종 가이드", "", "이런 분에게 적합합니다. " + para(), "",
+            "tags: 웹캠, 재택근무, 화상회의, 웹캠추천, 가성비"]
+    return "\n".join(out)
+
+
+# ── 측정 ──────────────────────────────────────────────────────────────────────
+
+def bench(fn: Callable[[str], object], doc: str, repeat: int) -> float:
+    """함수 1회 호출 중앙값 (ms)."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(doc)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def build_cases(products: list[dict]) -> list[tuple[str, Callable[[str], object]]]:
+    """(이름, 문서 → 결과) 측정 대상 목록."""
+    topic = {"title": "재택근무 웹캠 추천 가이드", "category": "가전/IT"}
+    seo   = {"seo_title": "재택근무 웹캠 추천", "meta_description": "웹캠 비교", "tags": ["웹캠"]}
+
+    def review(doc: str) -> object:
+        # stage_review 본체 (스테이지 마커 출력 제외)
+        return bg.ReviewEngine(bg.default_rules(), bg._BANNED_MATCHER).run(doc, products)
+
+    def assemble(doc: str) -> object:
+        return bg.assemble(topic, doc, seo, products=products, render_html=False)
+
+    def section_headings(doc: str) -> object:
+        return [bg._is_section_heading(line.strip()) for line in doc.split("\n")]
+
+    def pipeline(doc: str) -> object:
+        # run_pipeline 과 동일 — assemble 문서 모델을 검수 엔진이 그대로 고친 뒤 HTML 1회 직렬화
+        document = assemble(doc)["document"]
+        bg.ReviewEngine(bg.default_rules(), bg._BANNED_MATCHER).run_doc(document, products)
+        return document.to_html()
+
+    return [
+        ("md_to_html (legacy regex)",   legacy_md_to_html),
+        ("md_to_html",                  bg.md_to_html),
+        ("review (stage_review)",       review),
+        ("strip_non_korean",            bg._strip_non_korean),
+        ("fix_md_tables",               lambda doc: bg._fix_md_tables(Document.parse(doc))),
+        ("inject_product_images",       lambda doc: bg._inject_product_images(Document.parse(doc), products)),
+        ("is_section_heading (all lines)", section_headings),
+        ("assemble",                    assemble),
+        ("postprocess total per article", pipeline),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="블로그 후처리 마이크로 벤치마크")
+    parser.add_argument("--sizes",  type=int, nargs="+", default=[5000, 10000, 20000],
+                        help="문서 분량 (문자 수)")
+    parser.add_argument("--repeat", type=int, default=200, help="반복 횟수 (기본: 200)")
+    parser.add_argument("--only",   nargs="+", default=None,
+                        help="이름에 해당 문자열이 포함된 항목만 측정")
+    parser.add_argument("--json",   default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)   # 이미지 삽입 위치 경고 등 측정 중 로그 억제
+    RX.compile_all()
+
+    products = make_products(5)
+    cases = build_cases(products)
+    if args.only:
+        cases = [(name, fn) for name, fn in cases if any(o in name for o in args.only)]
+
+    print(f"\n{'함수':<34}" + "".join(f"{f'{s:,}자':>12}" for s in args.sizes))
+    print("─" * (34 + 12 * len(args.sizes)))
+    docs = {s: make_article(s, products, seed=s) for s in args.sizes}
+    results: dict[str, dict[str, float]] = {}
+    for name, fn in cases:
+        results[name] = {str(s): bench(fn, docs[s], args.repeat) for s in args.sizes}
+        row = "".join(f"{results[name][str(s)]:>10.3f}ms" for s in args.sizes)
+        print(f"{name:<34}{row}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "results_ms": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
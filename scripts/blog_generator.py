@@ -17,23 +17,29 @@ Usage:
     python blog_generator.py --dry-run    # 저장 없이 출력만
     python blog_generator.py --pipeline-mode  # 구조화 마커 출력
     python blog_generator.py --category 가전/IT  # 특정 카테고리만
+    python blog_generator.py --quality-mode full  # 품질 단계 전체 재작성 모드
+    python blog_generator.py --write-mode sectioned  # H2 섹션별 동시 작성
+    python blog_generator.py --benchmark-models      # 설치 모델 처리량 측정
 """
 
 from __future__ import annotations
 
 import argparse
+import atexit
 import json
 import logging
 import os
 import random
-import re
 import sys
+import threading
 import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Union
 
-import requests
 from dotenv import load_dotenv
 
 # ── 환경 변수 ──────────────────────────────────────────────────
@@ -42,6 +48,8 @@ load_dotenv(Path(__file__).parent.parent / ".env.local")
 SUPABASE_URL        = (os.getenv("NEXT_PUBLIC_SUPABASE_URL") or "").rstrip("/")
 SUPABASE_KEY        = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 OLLAMA_BASE_URL     = (os.getenv("OLLAMA_BASE_URL") or "http://localhost:11434").rstrip("/")
+# 여러 Ollama 호스트를 쉼표로 나열하면 부하 기반 라우팅 + 페일오버 (미설정 시 OLLAMA_BASE_URL 단일)
+OLLAMA_BASE_URLS    = [u.strip().rstrip("/") for u in (os.getenv("OLLAMA_BASE_URLS") or OLLAMA_BASE_URL).split(",") if u.strip()]
 BLOG_LLM_MODEL      = os.getenv("BLOG_LLM_MODEL", "gemma4:e4b")
 COUPANG_ACCESS_KEY  = os.getenv("COUPANG_ACCESS_KEY", "")
 COUPANG_SECRET_KEY  = os.getenv("COUPANG_SECRET_KEY", "")
@@ -53,9 +61,30 @@ try:
 except ImportError:
     _COUPANG_AVAILABLE = False
 
+# ── 마크다운 렌더러 · 문서 모델 ───────────────────────────────
+from md_doc import Document, Node, classify, parse_nodes
+from md_render import render_markdown
+
+# ── 정규식 레지스트리 ─────────────────────────────────────────
+from text_patterns import RX
+
+# ── 검수 엔진 (stage_review · 사전 채점) · 다중 문구 매처 ─────
+from phrase_matcher import PhraseMatcher
+from review_engine import ReviewEngine, collect_metrics, default_rules
+
+# ── Ollama 백엔드 풀 ───────────────────────────────────────────
+from llm_pool import LLMBackendPool
+from model_registry import MODEL_POLICIES, ModelRegistry
+
+# ── 실행 상태 저장소 (--stage 재개) ───────────────────────────
+from run_state import RunState, RunStateStore
+
+# ── Supabase REST 공용 클라이언트 ─────────────────────────────
+from supabase_rest import SupabaseError, SupabaseREST, get_client
+
 # ── Google Trends ──────────────────────────────────────────────
 try:
-    from trend_fetcher import get_trending_topics
+    from trend_fetcher import get_trending_topics, log_trend_cache_stats
     _TRENDS_AVAILABLE = True
 except ImportError:
     _TRENDS_AVAILABLE = False
@@ -87,10 +116,19 @@ MODEL_PRIORITY = [
     "phi4", "phi3",
 ]
 
-STATE_FILE   = Path(__file__).parent / ".pipeline_state.json"
+# 모델 선택 정책: quality(MODEL_PRIORITY 순) | balanced | speed(실측 tokens/sec 우선)
+MODEL_POLICY        = os.getenv("BLOG_MODEL_POLICY", "quality")
+MODEL_REGISTRY_FILE = Path(__file__).parent / ".model_registry.json"
+MODEL_TAGS_TTL      = 600   # /api/tags 디스크 캐시 유효 시간 (초)
+BENCHMARK_PROMPT    = "에어프라이어를 고를 때 확인해야 할 기준 3가지를 한국어로 5문장 이내로 설명하세요."
+
+STATE_DB     = Path(__file__).parent / ".pipeline_state.db"     # 실행(run id)별 상태 저장소
+STATE_FILE   = Path(__file__).parent / ".pipeline_state.json"   # 구버전 단일 상태 파일 (가져오기 전용)
 HISTORY_FILE = Path(__file__).parent / ".blog_history.json"
 COUPANG_API_LOG = Path(__file__).parent / ".coupang_api_log.json"
 COUPANG_HOURLY_LIMIT = 10
+PUBLISHED_PAGE_SIZE  = 1000   # 발행 키워드 색인 · slug 조회 페이지 크기 (PostgREST 기본 최대 행 수)
+SLUG_CONFLICT_RETRY  = 3      # 저장 시 slug UNIQUE 충돌(동시 발행) 재할당 횟수
 HISTORY_KEEP = 30
 MIN_QUALITY_SCORE = 72
 MAX_WRITE_RETRY   = 3
@@ -187,40 +225,93 @@ def _save_history(key: str) -> None:
     except Exception:
         pass
 
-def _fetch_published_keywords() -> set[str]:
+class _PublishedKeywordIndex:
     """
-    DB에 이미 발행된 blog_posts의 search_keyword 목록을 조회한다.
-
-    - search_keyword 컬럼에서 직접 수집
-    - topic_key 컬럼 기반으로도 TOPICS 매핑 → 컬럼 추가 전 기존 레코드 보완
+    DB에 이미 발행된 blog_posts 의 search_keyword 색인.
+
+    - 프로세스당 1회 전체 로드 (created_at 오름차순 페이지 단위 — 1000행 제한 없음)
+    - 이후 조회는 created_at >= 마지막으로 본 created_at 증분 갱신만 수행
+      (같은 시각에 늦게 커밋된 행도 받도록 경계 포함 — 경계 시각에 이미 본 id 는 건너뜀)
+    - search_keyword 컬럼에서 직접 수집 + topic_key 컬럼 기반 TOPICS 매핑으로 보완
+      (컬럼 추가 전 기존 레코드 대응)
+    - keywords / topic_keys 는 set — 중복 검사 O(1)
     """
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        return set()
-    keywords: set[str] = set()
-    try:
-        resp = requests.get(
-            f"{SUPABASE_URL}/rest/v1/blog_posts",
-            params={"select": "search_keyword,topic_key", "limit": 1000},
-            headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
-            timeout=10,
-        )
-        if resp.ok:
-            # topic_key → search_keyword 역매핑 (기존 레코드 대응)
-            key_to_kw = {t["key"]: t.get("search_keyword", "") for t in TOPICS}
-            for r in resp.json():
-                kw = (r.get("search_keyword") or "").strip()
-                if kw:
-                    keywords.add(kw)
-                # topic_key 로도 보완
-                tk = (r.get("topic_key") or "").strip()
-                if tk and tk in key_to_kw and key_to_kw[tk]:
-                    keywords.add(key_to_kw[tk])
-            log.info("[DB] 발행된 키워드 %d개 조회 완료", len(keywords))
-        else:
-            log.warning("[DB] _fetch_published_keywords 실패: %s %s", resp.status_code, resp.text[:100])
-    except Exception as e:
-        log.warning("[DB] _fetch_published_keywords 예외: %s", e)
-    return keywords
+
+    def __init__(self, page_size: int = PUBLISHED_PAGE_SIZE):
+        self.page_size = page_size
+        self.keywords:   set[str] = set()
+        self.topic_keys: set[str] = set()   # 발행 키워드에 해당하는 고정 TOPICS key
+        self.last_seen = ""                 # 지금까지 본 최대 created_at
+        self._seen_at_last: set[str] = set()  # created_at == last_seen 인 행 중 이미 반영한 id
+        self.loaded    = False
+        self._kw_by_topic:  dict[str, str] = {}
+        self._topics_by_kw: dict[str, list[str]] = {}
+        for t in TOPICS:
+            kw = t.get("search_keyword", "")
+            self._kw_by_topic[t["key"]] = kw
+            self._topics_by_kw.setdefault(kw.strip(), []).append(t["key"])
+
+    def add(self, keyword: str = "", topic_key: str = "") -> None:
+        """발행 레코드 1건 반영 (DB 조회 결과 · 방금 저장한 글 공용)."""
+        kw = (keyword or "").strip()
+        if kw:
+            self._add_keyword(kw)
+        # topic_key 로도 보완
+        tk = (topic_key or "").strip()
+        if tk and self._kw_by_topic.get(tk):
+            self._add_keyword(self._kw_by_topic[tk])
+
+    def _add_keyword(self, kw: str) -> None:
+        if kw not in self.keywords:
+            self.keywords.add(kw)
+            self.topic_keys.update(self._topics_by_kw.get(kw, ()))
+
+    def refresh(self) -> set[str]:
+        """첫 호출은 전체 로드, 이후는 새로 발행된 행만 조회. 실패해도 기존 색인 유지."""
+        if not SUPABASE_URL or not SUPABASE_KEY:
+            return self.keywords
+        params = {
+            "select": "id,search_keyword,topic_key,created_at",
+            "order":  "created_at.asc,id.asc",
+        }
+        if self.loaded and self.last_seen:
+            params["created_at"] = f"gte.{self.last_seen}"
+        fetched = 0
+        try:
+            for r in _db().iter_select("blog_posts", params, page_size=self.page_size):
+                created, rid = r.get("created_at") or "", str(r.get("id", ""))
+                if created == self.last_seen and rid in self._seen_at_last:
+                    continue
+                self.add(r.get("search_keyword"), r.get("topic_key"))
+                if created > self.last_seen:
+                    self.last_seen = created
+                    self._seen_at_last = set()
+                if created == self.last_seen:
+                    self._seen_at_last.add(rid)
+                fetched += 1
+        except SupabaseError as e:
+            log.warning("[DB] _fetch_published_keywords 실패: %s %s", e.status_code, e.text[:100])
+            return self.keywords
+        except Exception as e:
+            log.warning("[DB] _fetch_published_keywords 예외: %s", e)
+            return self.keywords
+        if not self.loaded:
+            self.loaded = True
+            log.info("[DB] 발행된 키워드 %d개 조회 완료 (%d행)", len(self.keywords), fetched)
+        elif fetched:
+            log.info("[DB] 신규 발행 %d행 반영 — 키워드 %d개", fetched, len(self.keywords))
+        return self.keywords
+
+
+_PUBLISHED_INDEX = _PublishedKeywordIndex()
+
+def _db() -> SupabaseREST:
+    """blog_posts 조회 · 발행용 공용 REST 클라이언트 (keep-alive 세션 재사용)."""
+    return get_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _fetch_published_keywords() -> set[str]:
+    """DB에 이미 발행된 search_keyword 집합 (프로세스 공용 색인, 호출 시 증분 갱신)."""
+    return _PUBLISHED_INDEX.refresh()
 
 def pick_topic(category_filter: Optional[str] = None) -> dict:
     """
@@ -272,10 +363,7 @@ def pick_topic(category_filter: Optional[str] = None) -> dict:
 
     # ── 폴백: 고정 TOPICS ────────────────────────────────────────
     local_recent = set(_load_history())
-    db_used_keys = {
-        t["key"] for t in TOPICS
-        if t.get("search_keyword", "").strip() in db_keywords
-    }
+    db_used_keys = _PUBLISHED_INDEX.topic_keys
     used = local_recent | db_used_keys | _SESSION_USED_KEYS
 
     pool = TOPICS
@@ -302,136 +390,131 @@ def pick_topic(category_filter: Optional[str] = None) -> dict:
 
 def slugify(text: str) -> str:
     """영문/숫자/하이픈만 남기는 URL-safe slug 생성 (한글 제거)"""
-    text = re.sub(r"[^a-zA-Z0-9\s-]", "", text.lower())
-    text = re.sub(r"[\s_]+", "-", text)
-    text = re.sub(r"-+", "-", text)
+    text = RX.SLUG_INVALID.sub("", text.lower())
+    text = RX.SLUG_SEPARATOR.sub("-", text)
+    text = RX.SLUG_DASHES.sub("-", text)
     return text.strip("-")[:80] or "post"
 
-def unique_slug(base_slug: str) -> str:
-    slug = slugify(base_slug)
+def _taken_slugs(base: str) -> set[str]:
+    """base 또는 base-N 형태로 이미 사용 중인 slug — 'slug LIKE base*' 1회 조회 (1000행 단위 페이지)."""
+    # slugify 결과는 [a-z0-9-] 뿐이라 LIKE 와일드카드(_ %)가 섞이지 않는다
+    # offset 페이지가 겹치거나 빠지지 않도록 고유 키(slug) 순으로 고정
+    rows = _db().iter_select("blog_posts", {"slug": f"like.{base}*", "select": "slug", "order": "slug.asc"},
+                             page_size=PUBLISHED_PAGE_SIZE)
+    return {r["slug"] for r in rows if r.get("slug")}
+
+def unique_slug(base_slug: str, taken: Iterable[str] = ()) -> str:
+    """
+    base, base-2, base-3 … 중 비어 있는 첫 slug. 사용 중인 slug 는 한 번에 조회해
+    로컬에서 다음 번호를 고른다 (taken: 조회 결과에 더해 제외할 slug).
+    """
+    base = slugify(base_slug)
+    used = _taken_slugs(base) | set(taken)
+    if base not in used:
+        return base
     suffix = 2
-    while True:
-        resp = requests.get(
-            f"{SUPABASE_URL}/rest/v1/blog_posts",
-            params={"slug": f"eq.{slug}", "select": "id", "limit": 1},
-            headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
-            timeout=10,
-        )
-        if resp.ok and not resp.json():
-            return slug
-        slug = f"{slugify(base_slug)}-{suffix}"
+    while f"{base}-{suffix}" in used:
         suffix += 1
-
-def _md_table_to_html(block: str) -> str:
-    """마크다운 테이블 블록 → HTML <table> 변환"""
-    lines = [l.strip() for l in block.strip().split("\n") if l.strip()]
-    if len(lines) < 2:
-        return block
-
-    def parse_row(line: str) -> list[str]:
-        cells = [c.strip() for c in line.strip().strip("|").split("|")]
-        return cells
-
-    header_cells = parse_row(lines[0])
-    # 두 번째 줄이 구분선(---|---)인지 확인
-    if not re.match(r"^[\s|:-]+$", lines[1]):
-        return block
-
-    rows = [parse_row(l) for l in lines[2:] if not re.match(r"^[\s|:-]+$", l)]
-
-    html = '<div class="overflow-x-auto mb-6"><table class="w-full text-sm border-collapse">\n<thead><tr>'
-    for cell in header_cells:
-        html += f'<th class="border border-zinc-700 bg-zinc-800/50 px-3 py-2 text-left text-xs font-semibold text-zinc-200">{cell}</th>'
-    html += '</tr></thead>\n<tbody>'
-    for row in rows:
-        html += '<tr>'
-        for cell in row:
-            html += f'<td class="border border-zinc-800 px-3 py-2 text-zinc-300">{cell}</td>'
-        html += '</tr>\n'
-    html += '</tbody></table></div>'
-    return html
-
+    return f"{base}-{suffix}"
 
 def md_to_html(md: str) -> str:
-    """마크다운 → prose-blog 클래스 호환 HTML 변환"""
-    html = md
-
-    # 1. 코드 블록 (먼저 처리 — 내부 | 등이 테이블로 오인되지 않도록)
-    html = re.sub(
-        r"```(\w*)\n([\s\S]*?)```",
-        lambda m: f'<pre><code class="language-{m.group(1)}">{m.group(2).rstrip()}</code></pre>',
-        html,
-    )
-    html = re.sub(r"`([^`]+)`", r"<code>\1</code>", html)
-
-    # 2. 마크다운 테이블 → HTML <table>
-    # 테이블 블록: | 로 시작하는 연속 줄 (최소 3줄: 헤더 + 구분선 + 데이터)
-    def replace_table(m: re.Match) -> str:
-        return _md_table_to_html(m.group(0))
-    html = re.sub(
-        r"(?:^[ \t]*\|.+\|[ \t]*\n){3,}",
-        replace_table,
-        html,
-        flags=re.MULTILINE,
-    )
-
-    # 3. 헤딩
-    for n in range(4, 0, -1):
-        html = re.sub(r"^" + "#" * n + r" (.+)$", rf"<h{n}>\1</h{n}>", html, flags=re.MULTILINE)
-
-    # 4. 강조
-    html = re.sub(r"\*\*\*(.+?)\*\*\*", r"<strong><em>\1</em></strong>", html)
-    html = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html)
-    html = re.sub(r"\*(.+?)\*",     r"<em>\1</em>",         html)
-
-    # 5. 수평선 (테이블 구분선과 혼동 방지 — 테이블은 이미 처리됨)
-    html = re.sub(r"^---+$", "<hr>", html, flags=re.MULTILINE)
-    html = re.sub(r"^\*\*\*+$", "<hr>", html, flags=re.MULTILINE)
-
-    # 6. 리스트
-    html = re.sub(r"^[-*] (.+)$", r"<li>\1</li>", html, flags=re.MULTILINE)
-    html = re.sub(r"(<li>.*</li>)", r"<ul>\1</ul>", html, flags=re.DOTALL)
-
-    # 7. 단락
-    paragraphs = re.split(r"\n{2,}", html.strip())
-    parts = []
-    for p in paragraphs:
-        p = p.strip()
-        if not p:
-            continue
-        if p.startswith(("<h", "<ul", "<pre", "<hr", "<div", "<table")):
-            parts.append(p)
-        else:
-            parts.append(f"<p>{p.replace(chr(10), '<br>')}</p>")
-    return "\n".join(parts)
+    """마크다운 → prose-blog 클래스 호환 HTML 변환 (md_render 단일 패스 렌더러)"""
+    return render_markdown(md)
 
 
 # ══════════════════════════════════════════════════════════════
 # 모델 선택
 # ══════════════════════════════════════════════════════════════
 
-def get_available_models() -> list[str]:
-    try:
-        resp = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
-        resp.raise_for_status()
-        embed_keywords = ("embed", "nomic", "bge", "e5-")
-        return [
-            m["name"] for m in resp.json().get("models", [])
-            if not any(kw in m["name"].lower() for kw in embed_keywords)
-        ]
-    except Exception as e:
-        log.error("[Ollama] 모델 목록 조회 실패: %s", e)
+# 풀 · 레지스트리는 처음 쓸 때 만든다 (import 만 하는 도구 · 테스트는 파일을 읽지 않음)
+_LLM_POOL:       Optional[LLMBackendPool] = None
+_MODEL_REGISTRY: Optional[ModelRegistry]  = None
+_LAZY_LOCK = threading.Lock()
+
+def _llm_pool() -> LLMBackendPool:
+    """Ollama 백엔드 풀 (처음 호출 시 생성)."""
+    global _LLM_POOL
+    with _LAZY_LOCK:
+        if _LLM_POOL is None:
+            _LLM_POOL = LLMBackendPool(OLLAMA_BASE_URLS)
+        return _LLM_POOL
+
+def _model_registry() -> ModelRegistry:
+    """모델 레지스트리 (처음 호출 시 디스크에서 로드, 종료 시 저장 등록)."""
+    global _MODEL_REGISTRY
+    with _LAZY_LOCK:
+        if _MODEL_REGISTRY is None:
+            _MODEL_REGISTRY = ModelRegistry(MODEL_REGISTRY_FILE)
+            atexit.register(_MODEL_REGISTRY.save)   # 단계 사이에 못 쓴 지표까지 종료 시 기록
+        return _MODEL_REGISTRY
+
+def get_available_models(use_cache: bool = True) -> list[str]:
+    """
+    정상 Ollama 백엔드 전체의 채팅 모델 목록. 모든 백엔드 장애 시 종료.
+
+    MODEL_TAGS_TTL 이내의 디스크 캐시가 있으면 /api/tags 조회 없이 재사용하되,
+    복원한 백엔드가 실제로 응답하는지 /api/version 으로 한 번 확인한다.
+    살아 있는 백엔드가 없으면 전체 조회로 넘어간다.
+    """
+    if use_cache:
+        cached = _model_registry().cached_tags(MODEL_TAGS_TTL)
+        if cached and _llm_pool().restore(cached):
+            alive = _llm_pool().ping()
+            if alive:
+                log.info("[Ollama] 모델 목록 캐시 사용 (백엔드 %d/%d개 응답)", len(alive), len(cached))
+                return _llm_pool().available_models()
+            log.warning("[Ollama] 캐시된 백엔드 무응답 — 모델 목록 재조회")
+    if not _llm_pool().probe():
+        log.error("[Ollama] 모델 목록 조회 실패 — 연결 가능한 백엔드 없음 (%s)",
+                  ", ".join(OLLAMA_BASE_URLS))
         sys.exit(1)
+    _model_registry().set_tags(_llm_pool().snapshot())
+    _model_registry().save()
+    return _llm_pool().available_models()
 
 def select_best_model(available: list[str]) -> str:
-    available_lower = {m.lower(): m for m in available}
-    for preferred in MODEL_PRIORITY:
-        for avail_key, avail_name in available_lower.items():
-            if avail_key == preferred.lower() or avail_key.startswith(preferred.lower() + ":"):
-                return avail_name
-    if BLOG_LLM_MODEL in available:
-        return BLOG_LLM_MODEL
-    return available[0] if available else BLOG_LLM_MODEL
+    return _model_registry().select(available, MODEL_PRIORITY, MODEL_POLICY, BLOG_LLM_MODEL)
+
+def benchmark_models(models: list[str]) -> None:
+    """고정 프롬프트로 모델별 처리량 측정 → 레지스트리 갱신 후 결과 출력."""
+    rows: list[tuple[str, str, str, str]] = []
+    for model in models:
+        log.info("[Benchmark] %s 측정 중...", model)
+        t0 = time.time()
+        try:
+            data = _llm_pool().chat(
+                {
+                    "model": model,
+                    "messages": [{"role": "user", "content": BENCHMARK_PROMPT}],
+                    "stream": False,
+                    "options": {"temperature": 0},
+                },
+                timeout=600,
+            )
+        except Exception as e:
+            log.warning("[Benchmark] %s 실패: %s", model, e)
+            rows.append((model, "-", "-", "실패"))
+            continue
+        _model_registry().record(model, data)
+        st = _model_registry().stats(model)
+        eval_s = (data.get("eval_duration") or 0) / 1e9
+        tps    = (data.get("eval_count") or 0) / eval_s if eval_s else 0.0
+        rows.append((
+            model,
+            f"{tps:.1f}",
+            f"{(data.get('load_duration') or 0) / 1e9:.1f}s",
+            f"{time.time() - t0:.1f}s (평균 {st.get('tokens_per_sec', 0):.1f} tok/s, {st.get('runs', 0)}회)",
+        ))
+    _model_registry().save()
+
+    print("\n" + "═" * 65)
+    print(f"  {'모델':<28}{'tok/s':>8}{'로드':>8}  총 소요")
+    print("─" * 65)
+    for model, tps, load, total in rows:
+        print(f"  {model:<28}{tps:>8}{load:>8}  {total}")
+    print("═" * 65)
+    for policy in MODEL_POLICIES:
+        print(f"  정책 {policy:<9}→ {_model_registry().select(models, MODEL_PRIORITY, policy, BLOG_LLM_MODEL)}")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -439,9 +522,8 @@ def select_best_model(available: list[str]) -> str:
 # ══════════════════════════════════════════════════════════════
 
 def _chat(model: str, system: str, user: str, temperature: float = 0.7, timeout: int = 300) -> str:
-    resp = requests.post(
-        f"{OLLAMA_BASE_URL}/api/chat",
-        json={
+    data = _llm_pool().chat(
+        {
             "model": model,
             "messages": [
                 {"role": "system", "content": system},
@@ -452,24 +534,30 @@ def _chat(model: str, system: str, user: str, temperature: float = 0.7, timeout:
         },
         timeout=timeout,
     )
-    resp.raise_for_status()
-    raw = resp.json()["message"]["content"].strip()
+    _model_registry().record(model, data)
+    raw = data["message"]["content"].strip()
     # deepseek-r1 등 추론 모델의 <think> 블록 제거
-    return re.sub(r"<think>[\s\S]*?</think>", "", raw, flags=re.IGNORECASE).strip()
+    return RX.THINK_BLOCK.sub("", raw).strip()
 
 
 # ══════════════════════════════════════════════════════════════
 # Pipeline 상태 저장/불러오기
 # ══════════════════════════════════════════════════════════════
 
-def save_state(state: dict) -> None:
-    STATE_FILE.write_text(json.dumps(state, ensure_ascii=False, indent=2), "utf-8")
+_STATE_STORE = RunStateStore(STATE_DB)
 
-def load_state() -> dict:
-    try:
-        return json.loads(STATE_FILE.read_text("utf-8"))
-    except Exception:
-        return {}
+def save_state(state: RunState) -> None:
+    """직전 저장 이후 바뀐 필드만 원자적으로 기록."""
+    state.save()
+
+def load_state(run_id: Optional[str] = None) -> Optional[RunState]:
+    """
+    재개할 실행 상태 — run_id 지정 시 해당 실행, 없으면 가장 최근에 갱신된 미완료 실행.
+    저장소가 비어 있으면 구버전 .pipeline_state.json 을 실행 1건으로 가져온다.
+    """
+    if run_id:
+        return _STATE_STORE.open(run_id)
+    return _STATE_STORE.latest() or _STATE_STORE.import_json(STATE_FILE)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -486,6 +574,8 @@ def _stage_done(name: str, t0: float, extra: str = "") -> float:
     suffix = f":extra={extra}" if extra else ""
     _emit(f"[PIPELINE:stage={name}:status=done:elapsed={elapsed}{suffix}]")
     log.info("  완료 (%.1fs)", elapsed)
+    if _MODEL_REGISTRY is not None:
+        _MODEL_REGISTRY.save()   # 단계 중 _chat 이 쌓은 모델 지표 (바뀐 게 없으면 건너뜀)
     return elapsed
 
 def _stage_fail(name: str, reason: str) -> None:
@@ -587,7 +677,7 @@ def stage_topic(topic: dict, model: str) -> dict:
 }}"""
     raw = _chat(model, system, user, temperature=0.5)
     try:
-        m = re.search(r"\{[\s\S]+\}", raw)
+        m = RX.JSON_OBJECT.search(raw)
         analysis = json.loads(m.group()) if m else {}
     except Exception:
         analysis = {
@@ -665,22 +755,20 @@ def stage_outline(topic: dict, analysis: dict, model: str) -> str:
 # Stage 3 · 리뷰 본문 작성
 # ══════════════════════════════════════════════════════════════
 
-def stage_write(topic: dict, analysis: dict, outline: str, model: str,
-                products: list | None = None, attempt: int = 1) -> str:
-    t0 = _stage_start("write")
-    if attempt > 1:
-        log.info("  재시도 %d/%d", attempt, MAX_WRITE_RETRY + 1)
-
-    # 실제 상품 데이터 주입
-    product_context = ""
-    if products and _COUPANG_AVAILABLE:
-        product_context = "\n" + format_products_for_prompt(products) + "\n"
-        log.info("  실제 상품 %d개 데이터 주입", len(products))
+_WRITE_TABLE_RULES = """━━ 마크다운 테이블 필수 규칙 (위반 시 감점) ━━
+- 모든 테이블 행(Row)은 반드시 단 한 줄에 작성 (줄바꿈 절대 금지)
+- 형식 예시 (이 형식만 허용):
+  | 항목 | 값 | 설명 |
+  |------|-----|------|
+  | 상품A | 30,000원 | 가성비 우수 |
+- 각 셀 내용은 40자 이내로 요약 (긴 내용은 다음 줄이 아닌 요약문으로)
+- 구분선은 반드시 |---|---|---| 형식 (언더스코어_ 사용 금지)
+- 셀 안에 줄바꿈(\n) 절대 금지"""
 
-    longtail = analysis.get('longtail_keyword', topic.get('search_keyword', ''))
-    emotional = analysis.get('emotional_hook', '실패 없는')
 
-    system = f"""\
+def _write_system_prompt(analysis: dict, longtail: str, emotional: str) -> str:
+    """stage_write 시스템 프롬프트 (단일/섹션 모드 공용)"""
+    return f"""\
 당신은 심리학 기반의 카피라이팅 전문가이자, 2026년 구글 SEO 및 GEO(생성형 엔진 최적화)에 정통한 시니어 콘텐츠 에디터입니다.
 글의 톤: {analysis.get('tone', '친절하지만 객관적인 큐레이터')}
 
@@ -717,6 +805,232 @@ def stage_write(topic: dict, analysis: dict, outline: str, model: str,
 - 예시 ✓ 올바른 표기: "현재 29,900원 (정가 49,900원에서 40% 할인)"
 - 예시 ✗ 잘못된 표기: "49,900원짜리 제품"(정가를 판매가인 것처럼 표기)"""
 
+
+def _write_product_rules(products: list | None) -> str:
+    """상품 데이터 유무에 따른 이미지·CTA·비교표 링크 규칙 (단일/섹션 모드 공용)"""
+    return f"""{"- 각 ### 상품 섹션 헤딩 바로 다음 첫 줄에 해당 상품 이미지를 마크다운 이미지 형식으로 삽입 (이미지 URL은 상품 데이터의 '상품이미지' 항목 사용):" if products else ""}
+{"  ![상품명](실제 product_image URL)  ← URL이 없으면 생략, 있으면 반드시 삽입" if products else ""}
+{"- 각 상품 섹션 끝에 반드시 아래 형식으로 구매 버튼 삽입 (절대 raw URL만 쓰지 말 것):" if products else "- 상품 데이터가 없으므로 구매 링크·CTA 버튼을 절대 생성하지 말 것. [텍스트](URL) 형식 링크 자체를 작성 금지:"}
+{"  [🛒 쿠팡에서 구매하기](실제 product_url)" if products else "  ← 링크 없음. 독자가 직접 검색하도록 안내 문구로 대체할 것."}
+{"- 비교표(Table) 구매링크 열에도 반드시 마크다운 링크 형식 사용:" if products else "- 비교표(Table)에 구매링크 열 추가 금지. URL 없이 특징/장단점 위주로 구성할 것:"}
+{"  [구매하러가기](실제 product_url)  ← 괄호 안에 실제 URL 필수" if products else "  ← 링크 열 완전 제외"}
+- "구매링크: https://..." 형식(콜론+raw URL) 절대 금지 — 항상 [텍스트](URL) 형식만 사용
+{"- CTA는 각 상품 섹션 끝마다 개별 링크 삽입 + 결론부에 대표 상품 1회 추가" if products else "- CTA 버튼 완전 생성 금지. 구매 유도는 '~을 검색해보세요' 형태 자연 문장으로 대체"}"""
+
+
+# 본문 작성 모드
+#   single    : 전체 본문을 _chat 1회로 작성 (기존 방식)
+#   sectioned : 아웃라인의 H2 섹션별로 독립 요청 → 동시 실행 후 이어붙임
+#               실패한 섹션만 개별 재시도, 그래도 실패하면 완성된 섹션은 두고 그 섹션만
+#               단일 호출로 다시 작성 — 그마저 실패해야 single 로 전체 재작성
+WRITE_MODES       = ("single", "sectioned")
+WRITE_MODE        = os.getenv("BLOG_WRITE_MODE", "single")
+WRITE_CONCURRENCY = int(os.getenv("BLOG_WRITE_CONCURRENCY", "2"))  # Ollama OLLAMA_NUM_PARALLEL 에 맞출 것
+SECTION_RETRY     = 2
+
+
+def _parse_outline_sections(outline: str) -> list[dict]:
+    """stage_outline 결과에서 H2 섹션 목록 추출 — [{"heading", "notes"}, ...]"""
+    sections: list[dict] = []
+    for line in outline.split("\n"):
+        stripped = line.strip()
+        if RX.H2_OUTLINE.match(stripped):
+            sections.append({"heading": stripped, "notes": []})
+        elif sections and stripped:
+            sections[-1]["notes"].append(line.rstrip())
+    return [{"heading": s["heading"], "notes": "\n".join(s["notes"])} for s in sections]
+
+
+def _clean_section_heading(heading: str) -> str:
+    """아웃라인 헤딩에서 번호 이모지·단계 표기 제거 → 본문용 '## 소제목'"""
+    text = RX.HEADING_MARKS.sub("", heading.strip())
+    text = RX.OUTLINE_LABEL.sub("", text)
+    text = text.rstrip(")").strip(" *") or RX.HEADING_MARKS.sub("", heading.strip())
+    return f"## {text}"
+
+
+def _normalize_section(text: str, heading: str, is_last: bool) -> str:
+    """섹션 응답 정리 — 코드펜스·H1 제거, H2 헤딩 보장, 마지막 섹션 외 tags 줄 제거"""
+    text = RX.FENCE_OPEN_MD.sub("", text.strip())
+    text = RX.FENCE_CLOSE.sub("", text)
+    lines = [l for l in text.split("\n") if not RX.H1_LINE.match(l)]
+    if not is_last:
+        lines = [l for l in lines if not RX.TAGS_LINE.match(l.strip())]
+    text = "\n".join(lines).strip()
+    if not text.startswith("## "):
+        text = f"{_clean_section_heading(heading)}\n\n{text}"
+    return text
+
+
+def _product_section_index(sections: list[dict]) -> int:
+    """
+    상품별 ### 섹션을 맡을 아웃라인 섹션 번호 (1부터). 헤딩 · 노트가 3단계(상품 등장)와
+    일치하는 첫 섹션, 없으면 도입부 · 결론을 뺀 가운데 중 뒤쪽 (5단계 아웃라인의 3번째 자리).
+    """
+    for idx, sec in enumerate(sections, 1):
+        if RX.PRODUCT_SECTION.search(sec["heading"]):
+            return idx
+    for idx, sec in enumerate(sections, 1):
+        if RX.PRODUCT_SECTION.search(sec["notes"]):
+            return idx
+    total = len(sections)
+    return min(3, total - 1) if total > 2 else total
+
+
+def _write_section(topic: dict, analysis: dict, outline: str, section: dict,
+                   idx: int, total: int, model: str, system: str,
+                   product_context: str, products: list | None, attempt: int,
+                   retries: int = SECTION_RETRY, written: str = "",
+                   product_idx: int = 0) -> str:
+    """
+    H2 섹션 1개 작성. 실패 시 해당 섹션만 retries 회 재시도.
+    written: 이미 완성된 다른 섹션의 헤딩 목록 — 주어지면 중복 작성 금지 안내를 덧붙인다.
+    product_idx: 상품별 ### 섹션을 쓰는 유일한 섹션 번호 — 다른 섹션은 상품 목록을 쓰지 않는다.
+    """
+    longtail = analysis.get('longtail_keyword', topic.get('search_keyword', ''))
+    is_first = idx == 1
+    is_last  = idx == total
+    rules = []
+    if is_first:
+        rules.append("- 도입부 섹션: 첫 2~3문단에 즉답 배치 (역피라미드: 결론 먼저 → 상세)")
+    if is_last:
+        rules.append("- 결론 섹션: \"이런 분에게 적합 / 이런 분은 다른 선택지가 나을 수 있음\" 형태")
+    if idx == product_idx:
+        rules.append("- 상품 소개 섹션: 전체 상품 요약 비교표 + 상품별 ### 섹션 (상품당 1개, 이 섹션에서만 작성)")
+    elif idx < product_idx:
+        rules.append("- 특정 상품명 언급 금지 (공감·기준 단계)")
+    else:
+        rules.append(f"- 상품별 ### 섹션 · 상품 목록 작성 금지 (상품 소개는 {product_idx}번째 섹션 담당)"
+                     " — 필요하면 상품명만 본문에서 짧게 언급")
+    position_rule = "\n".join(rules)
+    written_block = (
+        f"\n━━ 이미 작성된 섹션 (이 헤딩들의 내용·상품 섹션을 다시 쓰지 말 것) ━━\n{written}\n"
+        if written else ""
+    )
+    user = f"""주제: {topic['title']}
+카테고리: {topic['category']}
+타깃 페르소나: {analysis.get('target_buyer', '')}
+핵심 고민: {analysis.get('purchase_pain', '')}
+롱테일 키워드: {longtail}
+비교 기준: {analysis.get('review_focus', '')}
+{product_context}
+전체 아웃라인 (참고용 — 다른 섹션 내용은 작성하지 말 것):
+{outline}
+
+━━ 지금 작성할 섹션 ({idx}/{total}) ━━
+{section['heading']}
+{section['notes']}
+{written_block}
+━━ 작성 규칙 ━━
+- 위 섹션 하나만 작성. 첫 줄은 '## ' 로 시작하는 질문형 H2 소제목 (번호 이모지·단계 표기 제외)
+- 분량: 최소 {max(300, 1500 // total)}자 이상 (한글 기준)
+- 포맷: 완벽한 마크다운 형식 (##, ###, -, |, **) — HTML 금지
+- 다른 섹션에서 다룰 내용 반복 금지
+{position_rule}
+{_write_product_rules(products)}
+- 존재하지 않는 내부 링크(/blog/...) 절대 생성 금지 — 쿠팡 URL만 사용
+
+{_WRITE_TABLE_RULES}
+
+{"- 마지막 줄: tags: 태그1, 태그2, 태그3, 태그4, 태그5" if is_last else "- tags 줄 작성 금지 (마지막 섹션에서만 작성)"}"""
+
+    temperature = 0.75 + (attempt - 1) * 0.05
+    last_error: object = None
+    for tries in range(1, retries + 2):
+        try:
+            text = _chat(model, system, user, temperature=temperature, timeout=300)
+            if len(RX.WHITESPACE.sub("", text)) >= 100:
+                return _normalize_section(text, section["heading"], is_last)
+            last_error = f"응답 과소 ({len(text)} chars)"
+        except Exception as e:
+            last_error = e
+        log.warning("  [섹션 %d/%d] 실패 (%s) — 재시도 %d/%d",
+                    idx, total, last_error, tries, retries + 1)
+    raise RuntimeError(f"섹션 {idx}/{total} 작성 실패: {last_error}")
+
+
+def _write_sectioned(topic: dict, analysis: dict, outline: str, sections: list[dict],
+                     model: str, system: str, product_context: str,
+                     products: list | None, attempt: int) -> str:
+    """
+    섹션별 동시 작성 후 순서대로 이어붙인 마크다운 반환.
+    재시도 후에도 빠진 섹션은 완성된 섹션의 헤딩을 알려주고 1회씩 다시 작성한다.
+    그래도 채우지 못하면 빈 문자열.
+    """
+    total = len(sections)
+    workers = max(1, min(WRITE_CONCURRENCY, total))
+    product_idx = _product_section_index(sections)
+    log.info("  섹션 %d개 작성 (동시 %d, 상품 섹션 %d번)", total, workers, product_idx)
+    results: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_write_section, topic, analysis, outline, sec, idx, total,
+                        model, system, product_context, products, attempt,
+                        product_idx=product_idx): idx
+            for idx, sec in enumerate(sections, 1)
+        }
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            try:
+                results[idx] = fut.result()
+                log.info("  [섹션 %d/%d] 완료 (%d chars)", idx, total, len(results[idx]))
+            except Exception as e:
+                log.warning("  %s", e)
+
+    missing = [idx for idx in range(1, total + 1) if idx not in results]
+    if not results:
+        return ""
+    if missing:
+        log.info("  섹션 %s 누락 — 완성된 %d개는 유지하고 누락 섹션만 다시 작성",
+                 missing, len(results))
+    for idx in missing:
+        written = "\n".join(
+            line for i in sorted(results) for line in results[i].split("\n")
+            if RX.HEADING_ANY.match(line.strip())
+        )
+        try:
+            results[idx] = _write_section(topic, analysis, outline, sections[idx - 1], idx, total,
+                                          model, system, product_context, products, attempt,
+                                          retries=0, written=written, product_idx=product_idx)
+            log.info("  [섹션 %d/%d] 보충 완료 (%d chars)", idx, total, len(results[idx]))
+        except Exception as e:
+            log.warning("  %s", e)
+            return ""
+    return "\n\n".join(results[idx] for idx in range(1, total + 1))
+
+
+def stage_write(topic: dict, analysis: dict, outline: str, model: str,
+                products: list | None = None, attempt: int = 1,
+                mode: Optional[str] = None) -> str:
+    mode = mode or WRITE_MODE
+    t0 = _stage_start("write")
+    if attempt > 1:
+        log.info("  재시도 %d/%d", attempt, MAX_WRITE_RETRY + 1)
+
+    # 실제 상품 데이터 주입
+    product_context = ""
+    if products and _COUPANG_AVAILABLE:
+        product_context = "\n" + format_products_for_prompt(products) + "\n"
+        log.info("  실제 상품 %d개 데이터 주입", len(products))
+
+    longtail = analysis.get('longtail_keyword', topic.get('search_keyword', ''))
+    emotional = analysis.get('emotional_hook', '실패 없는')
+
+    system = _write_system_prompt(analysis, longtail, emotional)
+
+    if mode == "sectioned":
+        sections = _parse_outline_sections(outline)
+        if len(sections) >= 2:
+            draft = _write_sectioned(topic, analysis, outline, sections, model, system,
+                                     product_context, products, attempt)
+            if draft:
+                log.info("  단어 수: ~%d (섹션 %d개)", len(draft.split()), len(sections))
+                _stage_done("write", t0, extra=f"sections={len(sections)}")
+                return draft
+            log.warning("  섹션 보충 실패 — 단일 호출로 전체 재작성")
+        else:
+            log.warning("  아웃라인 H2 섹션 %d개 — 단일 호출 모드로 작성", len(sections))
+
     user = f"""주제: {topic['title']}
 카테고리: {topic['category']}
 타깃 페르소나: {analysis.get('target_buyer', '')}
@@ -734,26 +1048,11 @@ def stage_write(topic: dict, analysis: dict, outline: str, model: str,
 - 글의 전반부(1~2단계)에서는 특정 상품명 언급하지 않고 기준만 제시
 - 글의 중후반부(3단계)에서 수집된 상품 {len(products) if products else 0}개를 비교표로 자연스럽게 등장
 - 각 상품 개별 섹션(### 제품명): 실제 제품명, 실제 가격, 핵심 스펙, 장단점, 적합한 사용자 기재
-{"- 각 ### 상품 섹션 헤딩 바로 다음 첫 줄에 해당 상품 이미지를 마크다운 이미지 형식으로 삽입 (이미지 URL은 상품 데이터의 '상품이미지' 항목 사용):" if products else ""}
-{"  ![상품명](실제 product_image URL)  ← URL이 없으면 생략, 있으면 반드시 삽입" if products else ""}
-{"- 각 상품 섹션 끝에 반드시 아래 형식으로 구매 버튼 삽입 (절대 raw URL만 쓰지 말 것):" if products else "- 상품 데이터가 없으므로 구매 링크·CTA 버튼을 절대 생성하지 말 것. [텍스트](URL) 형식 링크 자체를 작성 금지:"}
-{"  [🛒 쿠팡에서 구매하기](실제 product_url)" if products else "  ← 링크 없음. 독자가 직접 검색하도록 안내 문구로 대체할 것."}
-{"- 비교표(Table) 구매링크 열에도 반드시 마크다운 링크 형식 사용:" if products else "- 비교표(Table)에 구매링크 열 추가 금지. URL 없이 특징/장단점 위주로 구성할 것:"}
-{"  [구매하러가기](실제 product_url)  ← 괄호 안에 실제 URL 필수" if products else "  ← 링크 열 완전 제외"}
-- "구매링크: https://..." 형식(콜론+raw URL) 절대 금지 — 항상 [텍스트](URL) 형식만 사용
-{"- CTA는 각 상품 섹션 끝마다 개별 링크 삽입 + 결론부에 대표 상품 1회 추가" if products else "- CTA 버튼 완전 생성 금지. 구매 유도는 '~을 검색해보세요' 형태 자연 문장으로 대체"}
+{_write_product_rules(products)}
 - 존재하지 않는 내부 링크(/blog/...) 절대 생성 금지 — 쿠팡 URL만 사용
 - 결론: "이런 분에게 적합 / 이런 분은 다른 선택지가 나을 수 있음" 형태
 
-━━ 마크다운 테이블 필수 규칙 (위반 시 감점) ━━
-- 모든 테이블 행(Row)은 반드시 단 한 줄에 작성 (줄바꿈 절대 금지)
-- 형식 예시 (이 형식만 허용):
-  | 항목 | 값 | 설명 |
-  |------|-----|------|
-  | 상품A | 30,000원 | 가성비 우수 |
-- 각 셀 내용은 40자 이내로 요약 (긴 내용은 다음 줄이 아닌 요약문으로)
-- 구분선은 반드시 |---|---|---| 형식 (언더스코어_ 사용 금지)
-- 셀 안에 줄바꿈(\n) 절대 금지
+{_WRITE_TABLE_RULES}
 
 - 마지막 줄: tags: 태그1, 태그2, 태그3, 태그4, 태그5"""
     draft = _chat(model, system, user, temperature=0.75 + (attempt - 1) * 0.05, timeout=400)
@@ -767,21 +1066,17 @@ def stage_write(topic: dict, analysis: dict, outline: str, model: str,
 # Stage 4 · 품질 검토 및 스코어링
 # ══════════════════════════════════════════════════════════════
 
-def stage_quality(draft: str, analysis: dict, model: str) -> tuple[str, int]:
-    t0 = _stage_start("quality")
-    system = (
-        "당신은 심리학 기반 카피라이팅과 GEO/SEO에 정통한 시니어 에디터입니다. "
-        "초고를 검토하고 '5단계 심리 동선'과 'GEO 최적화 규칙'에 부합하도록 개선합니다. "
-        "과장 광고 표현, 1인칭 체험 표현이 있으면 반드시 제거합니다."
-    )
-    longtail = analysis.get('longtail_keyword', '')
-    user = f"""타깃 페르소나: {analysis.get('target_buyer', '일반 소비자')}
-롱테일 키워드: {longtail}
+# 품질 검토 모드
+#   full : LLM이 개선된 전체 본문(improved_content)을 JSON 문자열로 반환 (기존 방식)
+#   diff : LLM이 점수 + 섹션 단위 수정안(edits)만 반환 → 로컬에서 초고에 적용
+#          출력 토큰이 수정 섹션 분량으로 줄고, 전체 본문 truncation 손실이 없음
+QUALITY_MODES = ("full", "diff")
+QUALITY_MODE  = os.getenv("BLOG_QUALITY_MODE", "diff")
 
-아래 15개 기준으로 초고를 검토하고 개선된 최종본을 JSON으로 반환하세요.
-각 항목은 점수뿐 아니라 실제로 수정해서 improved_content에 반영해야 합니다.
 
-━━ 콘텐츠 품질 (6항목, 각 8점) ━━
+def _quality_rubric(longtail: str) -> str:
+    """stage_quality 의 15개 검토 기준 (full/diff 모드 공용)"""
+    return f"""━━ 콘텐츠 품질 (6항목, 각 8점) ━━
 1. [공감] 도입부 첫 문단이 독자의 구체적 고민·상황을 공감하며 시작하는가?
    → 아니면: 공감 문장 추가 또는 강화
 2. [정보] 전반부(H2 1~2개)에서 상품명 없이 선택 기준·체크리스트만 제시하는가?
@@ -817,7 +1112,133 @@ def stage_quality(draft: str, analysis: dict, model: str) -> tuple[str, int]:
 14. [분량] 공백 제외 1800자 이상인가?
     → 아니면: 부족한 섹션 보강
 15. [태그] 마지막 줄에 "tags: 태그1, 태그2, ..." 형식이 있는가?
-    → 아니면: 관련 태그 5개 추가
+    → 아니면: 관련 태그 5개 추가"""
+
+
+def _heading_key(line: str) -> str:
+    """헤딩 비교용 정규화 키 (# 기호·공백·문장부호 제거, 소문자)"""
+    return RX.HEADING_KEY_DROP.sub("", line.strip().lstrip("#").lower())
+
+
+def _heading_level(line: str) -> int:
+    """마크다운 헤딩 레벨 (# 개수). 헤딩이 아니면 0."""
+    s = line.strip()
+    return len(s) - len(s.lstrip("#")) if RX.HEADING_ANY.match(s) else 0
+
+
+def _heading_counts(lines: list[str]) -> Counter:
+    """(레벨, 정규화 키) → 등장 횟수 — 수정안 적용 전후 헤딩 구조 비교용."""
+    return Counter(
+        (_heading_level(line), _heading_key(line)) for line in lines if _heading_level(line)
+    )
+
+
+def _apply_section_edits(draft: str, edits: list) -> tuple[str, int]:
+    """
+    diff 모드 수정안을 초고에 적용.
+
+    edits = [{"heading": "### 제품A", "content": "교체할 섹션 본문"}, ...]
+      - heading 과 일치하는 헤딩 줄을 찾아, 다음 헤딩(레벨 무관) 또는 tags 줄 직전까지의
+        본문만 교체 — 하위 ### 섹션은 그대로 남는다 (프롬프트의 "하위 ### 섹션 제외" 와 같음)
+      - 일치하는 헤딩이 없으면 tags 줄 앞에 새 섹션으로 추가 (누락된 결론부 등)
+      - heading 이 "tags" 이면 tags 줄 자체를 교체/추가
+      - 적용 결과 기존 헤딩이 사라지거나 이미 있는 헤딩이 중복되면 그 수정안은 버린다
+
+    Returns:
+        (적용된 본문, 적용된 수정 수)
+    """
+    lines = draft.split("\n")
+    applied = 0
+
+    def _tags_idx() -> int:
+        for idx in range(len(lines) - 1, -1, -1):
+            if RX.TAGS_LINE.match(lines[idx].strip()):
+                return idx
+        return len(lines)
+
+    for edit in edits:
+        if not isinstance(edit, dict):
+            continue
+        heading = str(edit.get("heading", "")).strip()
+        content = str(edit.get("content", "")).strip()
+        if not heading or not content:
+            continue
+
+        # tags 줄 교체
+        if RX.TAGS_HEADING.match(heading):
+            tag_line = content if RX.TAGS_LINE.match(content) else f"tags: {content}"
+            ti = _tags_idx()
+            if ti < len(lines):
+                lines[ti] = tag_line
+            else:
+                lines += ["", tag_line]
+            applied += 1
+            continue
+
+        key = _heading_key(heading)
+        if not key:
+            continue
+        body = content.split("\n")
+        # 수정안 첫 줄에 헤딩을 반복한 경우 제거
+        if body and body[0].lstrip().startswith("#") and _heading_key(body[0]) == key:
+            body = body[1:]
+        body = "\n".join(body).strip().split("\n")
+
+        start = next(
+            (idx for idx, line in enumerate(lines)
+             if line.lstrip().startswith("#") and _heading_key(line) == key),
+            None,
+        )
+        candidate = list(lines)
+        if start is None:
+            # 새 섹션 추가 (tags 줄 앞)
+            title = heading if heading.startswith("#") else f"## {heading}"
+            ti = _tags_idx()
+            candidate[ti:ti] = [title, "", *body, ""]
+        else:
+            end = start + 1
+            while end < len(candidate):
+                s = candidate[end].strip()
+                if RX.HEADING_ANY.match(s) or RX.TAGS_LINE.match(s):
+                    break
+                end += 1
+            candidate[start + 1:end] = ["", *body, ""]
+
+        before, after = _heading_counts(lines), _heading_counts(candidate)
+        lost = [k for k, n in before.items() if after[k] < n]
+        duplicated = [k for k, n in after.items() if n > max(before[k], 1)]
+        if lost or duplicated:
+            log.warning("  수정안 '%s' 건너뜀 — 헤딩 %s %s", heading,
+                        "누락" if lost else "중복", [k for _, k in (lost or duplicated)][:3])
+            continue
+        lines = candidate
+        applied += 1
+
+    return "\n".join(lines), applied
+
+
+def _parse_quality_json(raw: str) -> dict:
+    """LLM 응답에서 JSON 객체 추출 (```json 펜스 제거). 실패 시 빈 dict."""
+    cleaned = RX.FENCE_OPEN_JSON.sub("", raw.strip())
+    cleaned = RX.FENCE_CLOSE.sub("", cleaned)
+    try:
+        m = RX.JSON_OBJECT.search(cleaned)
+        if m:
+            data = json.loads(m.group())
+            return data if isinstance(data, dict) else {}
+    except Exception:
+        pass
+    return {}
+
+
+def _quality_full(draft: str, model: str, system: str, header: str, rubric: str) -> tuple[str, int]:
+    """full 모드 — 개선된 전체 본문(improved_content)을 반환받는다."""
+    user = f"""{header}
+
+아래 15개 기준으로 초고를 검토하고 개선된 최종본을 JSON으로 반환하세요.
+각 항목은 점수뿐 아니라 실제로 수정해서 improved_content에 반영해야 합니다.
+
+{rubric}
 
 총점 = 100점. 각 항목 문제를 실제로 수정한 후 improved_content에 반영하세요.
 문제가 없는 항목은 원문 그대로 유지하세요. 내용을 임의로 요약·생략하지 마세요.
@@ -838,14 +1259,9 @@ JSON 형식:
     score = 70
     improved = draft
 
-    # JSON 파싱 시도 — LLM이 ```json 펜스로 감쌀 수 있으므로 제거
-    cleaned = re.sub(r"^```(?:json)?\s*", "", raw.strip(), flags=re.IGNORECASE)
-    cleaned = re.sub(r"\s*```$", "", cleaned)
-
     try:
-        m = re.search(r"\{[\s\S]+\}", cleaned)
-        if m:
-            data = json.loads(m.group())
+        data = _parse_quality_json(raw)
+        if data:
             score = int(data.get("score", 70))
             issues = data.get("issues", [])
             if issues:
@@ -864,8 +1280,8 @@ JSON 형식:
     # fallback: JSON 파싱 실패 시 raw에서 마크다운만 추출
     if improved == draft and len(raw) > 300:
         # raw가 JSON 래핑 없이 순수 마크다운일 수 있음
-        stripped = re.sub(r"^```(?:json|markdown)?\s*", "", raw.strip(), flags=re.IGNORECASE)
-        stripped = re.sub(r"\s*```$", "", stripped)
+        stripped = RX.FENCE_OPEN_ANY.sub("", raw.strip())
+        stripped = RX.FENCE_CLOSE.sub("", stripped)
         # JSON 구조가 아닌 순수 마크다운이면 사용
         if not stripped.lstrip().startswith("{") and "##" in stripped:
             improved = stripped
@@ -873,13 +1289,92 @@ JSON 형식:
     # 최종 안전장치: improved에 JSON 잔재가 남아있으면 제거
     if improved.lstrip().startswith("{") and '"improved_content"' in improved[:200]:
         try:
-            data = json.loads(re.search(r"\{[\s\S]+\}", improved).group())  # type: ignore
+            data = json.loads(RX.JSON_OBJECT.search(improved).group())  # type: ignore
             improved = data.get("improved_content", draft)
         except Exception:
             improved = draft
 
+    return improved, score
+
+
+def _quality_diff(draft: str, model: str, system: str, header: str, rubric: str) -> tuple[str, int]:
+    """diff 모드 — 점수 + 섹션 단위 수정안만 반환받아 로컬에서 적용한다."""
+    user = f"""{header}
+
+아래 15개 기준으로 초고를 검토하고, 점수와 '섹션 단위 수정안'만 JSON으로 반환하세요.
+전체 본문을 다시 쓰지 마세요. 수정이 필요한 섹션만 edits에 포함합니다.
+
+{rubric}
+
+총점 = 100점.
+
+[edits 작성 규칙]
+- heading: 초고에 있는 헤딩 줄을 그대로 복사 (예: "### 제품A 장단점은?")
+- content: 해당 헤딩 바로 아래 본문을 대체할 마크다운 (헤딩 줄 제외, 하위 ### 섹션 제외 —
+  하위 섹션은 그대로 유지되므로 고칠 하위 섹션은 그 ### 헤딩으로 edits 를 따로 작성)
+- 초고에 없는 섹션(예: 누락된 결론부)은 새 heading("## ...")으로 추가
+- tags 줄 수정은 heading을 "tags"로, content를 "태그1, 태그2, ..." 로 작성
+- 문제가 없는 섹션은 edits에 넣지 마세요. 내용을 임의로 요약·생략하지 마세요.
+
+JSON 형식:
+{{
+  "score": 75,
+  "issues": ["3번 단점 누락 — 섹션 A에 단점 추가", "7번 '강력 추천' 표현 제거"],
+  "edits": [
+    {{"heading": "### 제품A", "content": "교체할 본문 (마크다운)"}}
+  ]
+}}
+
+초고:
+---
+{draft}
+---"""
+    raw = _chat(model, system, user, temperature=0.4, timeout=400)
+
+    data = _parse_quality_json(raw)
+    if not data:
+        log.warning("  품질 응답 JSON 파싱 실패 — 원본 유지")
+        return draft, 70
+
+    try:
+        score = int(data.get("score", 70))
+    except (TypeError, ValueError):
+        score = 70
+    for iss in (data.get("issues") or [])[:8]:
+        log.info("  [품질이슈] %s", iss)
+
+    edits = data.get("edits") or []
+    if not isinstance(edits, list):
+        edits = []
+    improved, applied = _apply_section_edits(draft, edits)
+    log.info("  섹션 수정안 %d건 중 %d건 적용", len(edits), applied)
+    return improved, score
+
+
+def stage_quality(draft: str, analysis: dict, model: str,
+                  mode: Optional[str] = None) -> tuple[str, int]:
+    mode = mode or QUALITY_MODE
+    if mode not in QUALITY_MODES:
+        log.warning("  알 수 없는 품질 모드 '%s' — full 모드 사용", mode)
+        mode = "full"
+    t0 = _stage_start("quality")
+    system = (
+        "당신은 심리학 기반 카피라이팅과 GEO/SEO에 정통한 시니어 에디터입니다. "
+        "초고를 검토하고 '5단계 심리 동선'과 'GEO 최적화 규칙'에 부합하도록 개선합니다. "
+        "과장 광고 표현, 1인칭 체험 표현이 있으면 반드시 제거합니다."
+    )
+    longtail = analysis.get('longtail_keyword', '')
+    header = f"""타깃 페르소나: {analysis.get('target_buyer', '일반 소비자')}
+롱테일 키워드: {longtail}"""
+    rubric = _quality_rubric(longtail)
+
+    if mode == "diff":
+        improved, score = _quality_diff(draft, model, system, header, rubric)
+    else:
+        improved, score = _quality_full(draft, model, system, header, rubric)
+
     score = max(0, min(100, score))
-    log.info("  품질 점수: %d/100", score)
+    log.info("  품질 점수: %d/100 (mode=%s)", score, mode)
     _stage_done("quality", t0, extra=f"score={score}")
     return improved, score
 
@@ -920,14 +1415,14 @@ def stage_seo(topic: dict, content: str, analysis: dict, model: str,
     raw = _chat(model, system, user, temperature=0.3)
     seo: dict = {}
     try:
-        m = re.search(r"\{[\s\S]+\}", raw)
+        m = RX.JSON_OBJECT.search(raw)
         if m:
             seo = json.loads(m.group())
     except Exception:
         pass
 
     # content의 tags 줄 백업
-    tag_match = re.search(r"tags?:\s*(.+)$", content, re.IGNORECASE | re.MULTILINE)
+    tag_match = RX.TAGS_VALUE.search(content)
     if tag_match and not seo.get("tags"):
         seo["tags"] = [t.strip() for t in tag_match.group(1).split(",") if t.strip()]
 
@@ -962,8 +1457,67 @@ _BANNED_EXPRESSIONS: dict[str, list[str]] = {
     ],
 }
 
+# 금지 표현 오토마톤 — 모듈 로드 시 1회 구성, 검수 · 사전 채점 공용
+_BANNED_MATCHER = PhraseMatcher(_BANNED_EXPRESSIONS)
+
 
-def stage_review(content: str, products: list[dict]) -> tuple[str, dict]:
+# 사전 채점 — stage_quality(LLM) 호출 전 규칙 기반으로 판정 가능한 루브릭 항목만 채점
+PRESCORE_MIN_CHARS = 1500   # 구조 최소 기준: 분량 (공백 제외)
+PRESCORE_MIN_H2    = 3      # 구조 최소 기준: H2 수
+
+
+def prescore_draft(draft: str, products: list | None = None) -> tuple[int, list[str]]:
+    """
+    초고의 규칙 기반 사전 점수(0-100)와 구조 최소 기준 미달 목록 반환.
+
+    점수는 결정적으로 판정 가능한 루브릭 항목(4·6·7·9·12·13·14·15)의 득점 비율.
+    미달 목록이 비어 있지 않으면 LLM 품질 검토 없이 재작성 대상으로 판단한다.
+    """
+    m = collect_metrics(draft, _BANNED_MATCHER)
+    n_products = len(products) if products else 0
+    banned = m["banned"]
+
+    # (루브릭 항목 번호, 배점, 통과 여부) — 번호는 stage_quality 15개 기준과 동일
+    checks: list[tuple[int, int, bool]] = [
+        (4,  8, m["has_conclusion"]),
+        (6,  8, not banned.get("불필요한 어미·표현")),
+        (7,  8, not banned.get("광고성 과장") and not banned.get("1인칭 체험")),
+        (12, 7, m["has_table"] and m["list_items"] >= 2),
+        (13, 7, m["h2"] >= PRESCORE_MIN_H2 and m["h3"] >= n_products),
+        (14, 4, m["char_count"] >= 1800),
+        (15, 4, m["has_tags"]),
+    ]
+    if n_products:
+        checks.append((9, 8, m["buy_links"] >= n_products))
+
+    total  = sum(pts for _, pts, _ in checks)
+    earned = sum(pts for _, pts, ok in checks if ok)
+    score  = round(earned * 100 / total) if total else 100
+
+    failures: list[str] = []
+    if m["h2"] < PRESCORE_MIN_H2:
+        failures.append(f"H2 {m['h2']}개 < {PRESCORE_MIN_H2}")
+    if not m["has_table"]:
+        failures.append("비교 테이블 없음")
+    if m["char_count"] < PRESCORE_MIN_CHARS:
+        failures.append(f"분량 {m['char_count']}자 < {PRESCORE_MIN_CHARS}")
+    if n_products and m["h3"] == 0:
+        failures.append(f"상품 섹션(H3) 없음 (상품 {n_products}개)")
+    return score, failures
+
+
+def stage_prescore(draft: str, products: list | None = None) -> tuple[int, list[str]]:
+    """LLM 품질 검토 전 규칙 기반 사전 채점 (스테이지 마커 포함)."""
+    t0 = _stage_start("prescore")
+    score, failures = prescore_draft(draft, products)
+    for f in failures:
+        log.info("  [구조미달] %s", f)
+    log.info("  사전 점수: %d/100%s", score, " (구조 미달)" if failures else "")
+    _stage_done("prescore", t0, extra=f"score={score}")
+    return score, failures
+
+
+def stage_review(content: Union[str, Document], products: list[dict]) -> tuple[str, dict]:
     """
     파이프라인 마지막 자동 검수 단계.
 
@@ -972,270 +1526,17 @@ def stage_review(content: str, products: list[dict]) -> tuple[str, dict]:
       Warnings  : 자동 수정 불가 or 판단이 필요한 항목 경고 로그
       Passed    : 정상 확인 항목 (로그 확인용)
 
+    규칙(review_engine.default_rules)은 문서를 한 번만 순회하며 함께 적용된다.
+    content 가 Document 면 그 문서를 제자리에서 고친다 (assemble 문서 재사용).
+
     Returns:
         (fixed_content, report)  — report = {fixed, warnings, passed}
     """
     t0 = _stage_start("review")
-    report: dict[str, list[str]] = {"fixed": [], "warnings": [], "passed": []}
-    fixed = content
-
-    # ── Auto-fix ─────────────────────────────────────────────
-
-    # 1. ] (URL) 공백 → ](URL)
-    before = fixed
-    fixed = re.sub(r'\]\s+\(http', '](http', fixed)
-    if fixed != before:
-        n = len(re.findall(r'\]\s+\(http', before))
-        report["fixed"].append(f"깨진 링크 {n}건 수정 ('] URL' 공백 제거)")
-
-    # 2. 연속 빈 줄 3개 이상 → 2개
-    before = fixed
-    fixed = re.sub(r'\n{4,}', '\n\n\n', fixed)
-    if fixed != before:
-        report["fixed"].append("과다 빈 줄 압축 (3줄 이상 → 2줄)")
-
-    # 3. 줄 끝 불필요 공백 제거
-    fixed = re.sub(r'[ \t]+$', '', fixed, flags=re.MULTILINE)
-
-    # 4. 테이블 셀 안 개행 제거 (| 사이에 \n 이 있는 경우)
-    before = fixed
-    fixed = re.sub(r'(\|[^\n|]+)\n([^\n|]*\|)', r'\1 \2', fixed)
-    if fixed != before:
-        report["fixed"].append("테이블 셀 내부 개행 제거")
-
-    # 5. LaTeX 수식 기호 → 유니코드 치환
-    #
-    # LLM이 LaTeX 명령어를 세 가지 형태로 출력할 수 있음:
-    #   A) $\rightarrow$   — 달러 기호 포함 (raw string으로 매핑)
-    #   B) \rightarrow     — 달러 없이 백슬래시 그대로 (raw string으로 매핑)
-    #   C) JSON 파싱 후 \r → CR(0x0D), \n → LF, \t → TAB 으로 변환된 케이스
-    #      예: \rightarrow → CR + "ightarrow" → 브라우저에서 "ightarrow"만 노출
-    before = fixed
-
-    # A+B: 달러 유무 × 백슬래시 그대로인 경우
-    latex_map = {
-        r'$\leftrightarrow$': '↔', r'$\rightarrow$': '→', r'$\leftarrow$': '←',
-        r'$\uparrow$': '↑',        r'$\downarrow$': '↓', r'$\Rightarrow$': '⇒',
-        r'$\Leftarrow$': '⇐',      r'$\leq$': '≤',        r'$\geq$': '≥',
-        r'$\neq$': '≠',             r'$\approx$': '≈',     r'$\times$': '×',
-        r'\rightarrow':  '→',  r'\leftarrow':  '←',  r'\leftrightarrow': '↔',
-        r'\Rightarrow':  '⇒',  r'\Leftarrow':  '⇐',
-        r'\uparrow':     '↑',  r'\downarrow':  '↓',
-        r'\leq':         '≤',  r'\geq':        '≥',
-        r'\approx':      '≈',
-    }
-    for latex, uni in latex_map.items():
-        fixed = fixed.replace(latex, uni)
-
-    # C: JSON 파싱으로 이미 escape 문자로 바뀐 케이스
-    #    \r(CR)+ightarrow, \n(LF)+eq, \t(TAB)+imes, \t(TAB)+o (→ \to)
-    escape_map = {
-        '\rightarrow':  '→',   # \r = CR(0x0D)
-        '\neq':         '≠',   # \n = LF(0x0A)
-        '\times':       '×',   # \t = TAB(0x09)
-        '\to':          '→',   # \t = TAB + o
-    }
-    for esc, uni in escape_map.items():
-        fixed = fixed.replace(esc, uni)
-
-    # 남은 $...$ 패턴 달러 기호만 제거
-    fixed = re.sub(r'\$[^$\n]{1,40}\$', lambda m: m.group().strip('$'), fixed)
-    if fixed != before:
-        report["fixed"].append("LaTeX 수식 기호 유니코드로 치환")
-
-    # 5b. 중복 H3 섹션 제거 (동일 제목 또는 동일 상품 구매링크가 반복되는 경우)
-    before = fixed
-    seen_headings: set[str] = set()
-    seen_buy_urls: set[str] = set()
-    lines = fixed.split('\n')
-    result_lines: list[str] = []
-    skip_until_next_h3 = False
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if line.startswith('### '):
-            heading_key = re.sub(r'[^\w가-힣]', '', line.lower())
-            if heading_key in seen_headings:
-                # 이 섹션 전체를 다음 ### 또는 ## 또는 *** 까지 스킵
-                skip_until_next_h3 = True
-                i += 1
-                continue
-            seen_headings.add(heading_key)
-            skip_until_next_h3 = False
-        elif skip_until_next_h3 and re.match(r'^#{2,3} |^\*{3}$', line):
-            skip_until_next_h3 = False
-
-        if not skip_until_next_h3:
-            # 동일 구매 URL 중복 링크도 제거 (같은 URL이 2번 이상 CTA로 등장)
-            buy_url_match = re.search(r'\[🛒[^\]]*\]\((https?://[^\)]+)\)', line)
-            if buy_url_match:
-                url = buy_url_match.group(1)
-                if url in seen_buy_urls:
-                    i += 1
-                    continue
-                seen_buy_urls.add(url)
-            result_lines.append(line)
-        i += 1
-    fixed = '\n'.join(result_lines)
-    if fixed != before:
-        report["fixed"].append("중복 H3 섹션 또는 중복 구매링크 제거")
-
-    # 6. Raw 쿠팡 URL → 마크다운 링크로 자동 래핑
-    before = fixed
-    def _wrap_raw_url(m: re.Match) -> str:
-        url = m.group(0)
-        return f"[쿠팡에서 보기]({url})"
-    # 이미 링크 안에 있는 URL은 제외하고, 줄 단독으로 노출된 쿠팡 URL만 래핑
-    fixed = re.sub(
-        r'(?<!\()(?<!\[)(https?://(?:link\.coupang\.com|ads-partners\.coupang\.com)/[^\s\)\"\'\>]+)',
-        _wrap_raw_url, fixed
-    )
-    if fixed != before:
-        report["fixed"].append("Raw 쿠팡 URL 마크다운 링크로 자동 래핑")
-
-    # 7. ** 강조 미닫힘 자동 수정 (홀수 개 → 마지막 줄 끝에 ** 추가)
-    before = fixed
-    bold_count = len(re.findall(r'\*\*', fixed))
-    if bold_count % 2 != 0:
-        # 마지막 ** 뒤에 닫는 ** 추가
-        fixed = fixed.rstrip() + "**"
-        report["fixed"].append("** 마크다운 강조 미닫힘 자동 수정")
-
-    # 8. 가격 표기 일관성 — "숫자원" → "숫자,000원" 콤마 추가
-    before = fixed
-    def _fix_price(m: re.Match) -> str:
-        digits = m.group(1)
-        if len(digits) >= 4 and ',' not in digits:
-            return f"{int(digits):,}원"
-        return m.group(0)
-    fixed = re.sub(r'(\d{4,})원', _fix_price, fixed)
-    if fixed != before:
-        report["fixed"].append("가격 표기 콤마 자동 삽입")
-
-    # (금지 표현 자동 교체는 한국어 문맥 오염 위험으로 경고만 처리 — 아래에서 감지)
-
-    # ── Warnings ─────────────────────────────────────────────
-
-    # 9. Raw URL 잔존 체크 (쿠팡 외 raw URL)
-    # (이미 위에서 쿠팡 URL은 래핑했으므로 나머지만 체크)
-    raw_urls = re.findall(
-        r'(?<!\()(?<!\[)(?<!image:\s)https?://[^\s\)\"\'\>]+(?!\))', fixed
-    )
-    if raw_urls:
-        report["warnings"].append(
-            f"Raw URL {len(raw_urls)}개 감지 (마크다운 링크 미적용): "
-            + ", ".join(u[:60] for u in raw_urls[:3])
-        )
-    else:
-        report["passed"].append("모든 URL 마크다운 링크 형식 ✓")
-
-    # 7. 구매 링크 수 vs 상품 수
-    if products:
-        buy_links = len(re.findall(
-            r'\[.*?(?:구매|바로가기|보러가기|주문).*?\]\(https?://', fixed
-        ))
-        if buy_links == 0:
-            report["warnings"].append(
-                f"구매 링크 없음 (상품 {len(products)}개 대비 0개)"
-            )
-        elif buy_links < len(products):
-            report["warnings"].append(
-                f"구매 링크 {buy_links}개 < 상품 {len(products)}개 (일부 누락 가능)"
-            )
-        else:
-            report["passed"].append(f"구매 링크 {buy_links}개 ✓")
-
-    # 8. 분량 체크 (공백 제외 문자 수)
-    char_count = len(re.sub(r'\s', '', fixed))
-    if char_count < 1500:
-        report["warnings"].append(f"분량 부족: {char_count}자 (최소 1500자 권장)")
-    else:
-        report["passed"].append(f"분량 {char_count:,}자 ✓")
-
-    # 9. 금지 표현 감지 (자동 교체 대상이 아닌 나머지)
-    for category, expressions in _BANNED_EXPRESSIONS.items():
-        found = [e for e in expressions if e in fixed]
-        if found:
-            report["warnings"].append(f"{category} 표현 잔류: {', '.join(found)}")
-        else:
-            report["passed"].append(f"{category} 표현 없음 ✓")
-
-    # 10. 비교 테이블 포함 여부
-    if re.search(r'^\|.+\|.+\|', fixed, re.MULTILINE):
-        report["passed"].append("비교 테이블 포함 ✓")
-    else:
-        report["warnings"].append("비교 테이블 없음 (구조화 데이터 부재 → SEO 감점 가능)")
-
-    # 11. H2 헤딩 수
-    h2_count = len(re.findall(r'^## ', fixed, re.MULTILINE))
-    if h2_count >= 3:
-        report["passed"].append(f"H2 헤딩 {h2_count}개 ✓")
-    else:
-        report["warnings"].append(f"H2 헤딩 {h2_count}개 (최소 3개 권장)")
-
-    # 12. 상품별 이미지 삽입 확인
-    if products:
-        missing_imgs = [
-            p.get('product_name', '')[:20]
-            for p in products
-            if p.get('product_image') and p['product_image'] not in fixed
-        ]
-        if missing_imgs:
-            report["warnings"].append(
-                f"이미지 미삽입 상품 {len(missing_imgs)}개: {', '.join(missing_imgs)}"
-            )
-        else:
-            img_count = sum(1 for p in products if p.get('product_image'))
-            if img_count:
-                report["passed"].append(f"전체 상품 이미지 삽입 확인 ({img_count}개) ✓")
-
-    # 13. 존재하지 않는 내부 링크 감지
-    internal = re.findall(r'\(/blog/[^\)]+\)', fixed)
-    if internal:
-        report["warnings"].append(
-            f"내부 /blog/ 링크 {len(internal)}개 감지 (존재하지 않는 URL 가능성)"
-        )
-
-    # W7. ** 강조 미닫힘 잔존 체크 (auto-fix 후에도 남은 경우)
-    bold_markers = len(re.findall(r'\*\*', fixed))
-    if bold_markers % 2 != 0:
-        report["warnings"].append("** 마크다운 강조 미닫힘 감지 (렌더링 오류 가능성)")
-    else:
-        report["passed"].append("마크다운 강조 정상 닫힘 ✓")
-
-    # W8. 결론부 존재 여부
-    conclusion_keywords = ["이런 분", "이런 경우", "결론", "최종 정리", "어떤 분", "추천 대상"]
-    if any(kw in fixed for kw in conclusion_keywords):
-        report["passed"].append("결론부 존재 ✓")
-    else:
-        report["warnings"].append("결론부 누락 — '이런 분에게 적합/이런 분은 다른 선택' 형태 결론 권장")
-
-    # W9. H3 수 vs 상품 수 불일치
-    if products:
-        h3_count = len(re.findall(r'^### ', fixed, re.MULTILINE))
-        if h3_count < len(products):
-            report["warnings"].append(
-                f"H3 섹션 {h3_count}개 < 상품 {len(products)}개 (일부 상품 섹션 누락 가능)"
-            )
-        else:
-            report["passed"].append(f"H3 섹션 {h3_count}개 / 상품 {len(products)}개 ✓")
-
-    # W10. 과도하게 긴 단락 감지 (300자 초과 단락)
-    paragraphs = [p for p in fixed.split('\n\n') if p.strip() and not p.strip().startswith('#') and not p.strip().startswith('|')]
-    long_paras = [p[:40] for p in paragraphs if len(re.sub(r'\s', '', p)) > 300]
-    if long_paras:
-        report["warnings"].append(
-            f"과도하게 긴 단락 {len(long_paras)}개 감지 (300자 초과, 모바일 가독성 저하): "
-            + repr(long_paras[0]) + "..."
-        )
-    else:
-        report["passed"].append("단락 길이 적절 ✓")
-
-    # W11. tags 줄 존재 여부
-    if re.search(r'^tags\s*:', fixed, re.MULTILINE | re.IGNORECASE):
-        report["passed"].append("tags 줄 존재 ✓")
-    else:
-        report["warnings"].append("tags 줄 누락 — 마지막 줄에 'tags: 태그1, 태그2, ...' 형식 필요")
+    engine = ReviewEngine(default_rules(), _BANNED_MATCHER)
+    doc = content if isinstance(content, Document) else Document.parse(content)
+    report, _ = engine.run_doc(doc, products)
+    fixed = doc.to_markdown()
 
     # ── 검수 결과 로그 ────────────────────────────────────────
     for msg in report["fixed"]:
@@ -1256,83 +1557,132 @@ def stage_review(content: str, products: list[dict]) -> tuple[str, dict]:
 
 def _strip_non_korean(text: str) -> str:
     """LLM이 혼입하는 비한국어 스크립트 제거 (한글·영문·숫자·기호·마크다운만 유지)"""
-    # CJK Unified Ideographs (중국어 한자) 제거
-    text = re.sub(r"[\u4e00-\u9fff]+", "", text)
-    # 일본어 히라가나/카타카나 제거
-    text = re.sub(r"[\u3040-\u30ff]+", "", text)
-    # 키릴 문자 (러시아어 등) 제거
-    text = re.sub(r"[\u0400-\u04ff]+", "", text)
-    # 아랍 문자 제거
-    text = re.sub(r"[\u0600-\u06ff\u0750-\u077f\u08a0-\u08ff]+", "", text)
-    # 태국어 제거
-    text = re.sub(r"[\u0e00-\u0e7f]+", "", text)
-    # 데바나가리 (힌디어 등) 제거
-    text = re.sub(r"[\u0900-\u097f]+", "", text)
-    # 기타 비라틴/비한글 스크립트 (그루지아, 아르메니아, 히브리 등) 제거
-    text = re.sub(r"[\u0530-\u058f\u0590-\u05ff\u10a0-\u10ff]+", "", text)
-    # 전체가 비한글인 줄 제거 (한글이 하나도 없고 영문/숫자/공백/기호만 있는 줄은 유지)
-    lines = text.split("\n")
-    cleaned = []
-    for line in lines:
-        stripped = line.strip()
-        # 빈 줄, 마크다운 기호로 시작하는 줄, 한글 포함 줄, 영문/숫자/기호만 있는 줄은 유지
-        if (not stripped
-                or re.search(r"[가-힣ㄱ-ㅎㅏ-ㅣ]", stripped)
-                or re.match(r"^[a-zA-Z0-9\s\-_.,!?:;\'\"()\[\]{}<>/@#$%^&*+=~`|\\/#*>]+$", stripped)):
-            cleaned.append(line)
-    text = "\n".join(cleaned)
-    # 연속 공백 정리 (줄 내부만, 마크다운 후행 더블스페이스 보존)
-    text = re.sub(r"(?<!\n)  +(?!\s*$)", " ", text)
-    return text.strip()
+    doc = Document.parse(text)
+    _strip_non_korean_doc(doc)
+    return doc.to_markdown()
+
+
+def _strip_non_korean_doc(doc: Document) -> None:
+    """_strip_non_korean 의 문서 모델 버전 — 노드 줄을 제자리에서 정리하고 strip."""
+    nodes = doc.nodes
+    changed: list[int] = []
+    suspect = RX.LINE_SUSPECT.search
+    for ni, node in enumerate(nodes):
+        if not any(map(suspect, node.lines)):
+            continue
+        kept: list[str] = []
+        for line in node.lines:
+            # 빈 줄 · 한글 포함 줄 · 영문/숫자/기호만 있는 줄은 유지되므로, 판별 대상은
+            # 한글도 ASCII 기호도 공백도 아닌 문자가 있는 줄뿐
+            if suspect(line):
+                # 한자 · 일본어 가나 · 키릴 · 아랍 · 태국 · 데바나가리 · 그루지아/아르메니아/히브리 문자 제거
+                line = RX.FOREIGN_SCRIPT.sub("", line)
+                # 전체가 비한글인 줄 제거 (한글이 하나도 없고 영문/숫자/공백/기호만 있는 줄은 유지)
+                if RX.HANGUL_CHAR.search(line) is None and suspect(line):
+                    continue
+            kept.append(line)
+        node.lines[:] = kept
+        changed.append(ni)
 
-def _fix_md_tables(text: str) -> str:
+    # 연속 공백 정리 (줄 내부만, 마크다운 후행 더블스페이스 보존)
+    # INNER_SPACES 는 줄 머리('\n' 직후)와 문서 끝 공백을 제외하므로 앞 줄바꿈과
+    # (마지막 내용 줄이 아니면) 뒤따르는 내용을 붙여 문서 전체 치환과 같은 문맥에서 적용
+    last = (-1, -1)
+    for ni in range(len(nodes) - 1, -1, -1):
+        lines = nodes[ni].lines
+        k = next((k for k in range(len(lines) - 1, -1, -1) if lines[k].strip()), -1)
+        if k >= 0:
+            last = (ni, k)
+            break
+    for ni in range(last[0] + 1):
+        lines = nodes[ni].lines
+        for k in range(len(lines) if ni < last[0] else last[1] + 1):
+            line = lines[k]
+            if "  " in line:
+                tail = "" if (ni, k) == last else "\n."
+                fixed = RX.INNER_SPACES.sub(" ", "\n" + line + tail)
+                fixed = fixed[1:len(fixed) - len(tail)]
+                if fixed != line:
+                    lines[k] = fixed
+                    changed.append(ni)
+    doc.retype(changed)
+    doc.strip()
+
+def _fix_md_tables(doc: Document) -> None:
     """
     LLM이 테이블 행을 여러 줄에 걸쳐 작성한 경우 한 줄로 병합.
-    | 로 시작하는 줄 다음에 | 없이 이어지는 텍스트는 직전 행 마지막 셀에 공백과 함께 합침.
+    테이블 노드 다음에 빈 줄 없이 이어지는 노드(H1~H4 헤딩 제외)의 줄은
+    직전 행 마지막 셀에 공백과 함께 합침.
     """
-    lines = text.split('\n')
-    out: list[str] = []
+    out: list[Node] = []
+    merged: set[int] = set()     # 이어 붙인 줄을 받은 노드 (종류 재판정 대상)
     in_table = False
 
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('|'):
+    for node in doc.nodes:
+        kind = node.kind
+        if kind == "table":
             in_table = True
-            out.append(stripped)
-        elif in_table and stripped and not re.match(r'^#{1,4}\s', stripped):
+            node.lines[:] = [line.strip() for line in node.lines]
+            out.append(node)
+        elif in_table and kind != "blank" and not (kind == "heading" and node.level):
             # 헤딩이 아닌 비-파이프 줄 → 직전 테이블 행의 연속
-            if out:
+            for line in node.lines:
+                stripped = line.strip()
                 prev = out[-1]
-                # 직전이 구분선이면 건너뜀
-                if re.match(r'^[\s|:-]+$', prev):
-                    out.append(stripped)
+                # 직전이 구분선이면 합치지 않고 별도 줄로 둔다
+                if RX.TABLE_SEPARATOR.match(prev.lines[-1]):
+                    out.extend(parse_nodes([stripped]))
                 else:
-                    out[-1] = prev.rstrip(' |') + ' ' + stripped
-            else:
-                out.append(line)
+                    prev.lines[-1] = prev.lines[-1].rstrip(' |') + ' ' + stripped
+                    merged.add(len(out) - 1)
         else:
-            if not stripped:
+            if kind == "blank":
                 in_table = False
-            out.append(line)
+            out.append(node)
+
+    doc.nodes = out
+    doc.retype(merged)
 
-    return '\n'.join(out)
+
+def _join_link_breaks(doc: Document) -> None:
+    """
+    ] (URL) → ](URL) 공백 버그 수정. ']' 와 '(http' 사이가 줄바꿈(빈 줄 포함)으로
+    떨어진 경우도 한 줄로 합친다 — 사이 빈 줄과 뒤 노드의 '(http' 줄은 제거.
+    """
+    nodes = doc.nodes
+    changed: set[int] = set()
+    ni = 0
+    while ni < len(nodes):
+        lines = nodes[ni].lines
+        for k, line in enumerate(lines):
+            if "]" not in line:
+                continue
+            fixed = RX.LINK_SPACE.sub('](http', line)
+            while fixed.rstrip().endswith("]"):
+                pos = doc.next_content(ni, k)
+                if pos is None:
+                    break
+                nxt = nodes[pos[0]].lines[pos[1]]
+                if not nxt.lstrip().startswith("(http"):
+                    break
+                fixed = RX.LINK_SPACE.sub('](http', fixed.rstrip() + nxt.lstrip())
+                doc.cut_after(ni, k, *pos)
+            if fixed != line:
+                lines[k] = fixed
+                changed.add(ni)
+        ni += 1
+    doc.retype(changed)
 
 
 def _is_section_heading(stripped: str) -> bool:
-    """섹션 헤딩 줄 여부 — ##/###, 이모지+공백, **bold** 형식"""
-    if not stripped:
-        return False
-    first_cp = ord(stripped[0])
-    return (
-        bool(re.match(r'^#{2,4}\s', stripped)) or
-        (first_cp >= 0x2300 and len(stripped) >= 2 and stripped[1] == ' ') or
-        (stripped.startswith('**') and stripped.endswith('**') and len(stripped) > 4)
-    )
+    """섹션 헤딩 줄 여부 — ##/###, 이모지+공백, **bold** 형식 (H1 을 뺀 헤딩 노드)"""
+    kind, level = classify(stripped)
+    return kind == "heading" and level != 1
 
 
-def _inject_product_images(text: str, products: list[dict]) -> str:
+def _inject_product_images(doc: Document, products: list[dict]) -> None:
     """
-    각 상품 섹션 직전에 이미지 1개 삽입. 3단계 전략으로 누락 최소화.
+    각 상품 섹션 헤딩 노드 앞에 이미지 노드 1개 삽입. 3단계 전략으로 누락 최소화.
 
     전략 우선순위 (상품당 최초 성공 전략 사용):
       1순위 — product_url 역추적
@@ -1343,43 +1693,68 @@ def _inject_product_images(text: str, products: list[dict]) -> str:
       3순위 — 핵심 단어(4자 이상) 매칭
                 product_name의 단어 중 하나라도 헤딩에 포함
 
-    중복 방지: 상품당 1회, 기존 이미지 줄은 0단계에서 모두 제거.
+    중복 방지: 상품당 1회, 기존 상품 이미지 노드는 0단계에서 모두 제거.
+
+    헤딩 색인 · 구매 버튼 색인 · URL→줄 매핑을 노드 1회 순회로 만든 뒤
+    상품별로는 색인만 조회한다 — O(줄 수 + 상품 수 × 헤딩 수).
+    거리 판정(최대 49줄 등)은 노드 줄 수를 누적한 줄 번호로 한다.
     """
     if not products:
-        return text
+        return
 
     image_urls = {p.get('product_image', '') for p in products if p.get('product_image')}
     if not image_urls:
-        return text
-
-    # ── 0단계: 기존 상품 이미지 줄 전부 제거 ────────────────────
-    lines = text.split('\n')
-    cleaned: list[str] = []
-    i = 0
-    while i < len(lines):
-        stripped = lines[i].strip()
-        if stripped.startswith('![') and any(url in stripped for url in image_urls):
-            if cleaned and not cleaned[-1].strip():
-                cleaned.pop()
-            i += 1
-            if i < len(lines) and not lines[i].strip():
-                i += 1
+        return
+
+    # ── 0단계: 기존 상품 이미지 노드 전부 제거 (앞뒤 빈 줄 1개씩 포함) ──
+    nodes: list[Node] = []
+    drop_blank = False
+    for node in doc.nodes:
+        if drop_blank:
+            drop_blank = False
+            if node.kind == "blank":
+                del node.lines[0]
+                if not node.lines:
+                    continue
+        if node.kind == "image" and any(url in node.lines[0] for url in image_urls):
+            if nodes and nodes[-1].kind == "blank":
+                nodes[-1].lines.pop()
+                if not nodes[-1].lines:
+                    nodes.pop()
+            drop_blank = True
+            continue
+        nodes.append(node)
+
+    # ── 색인 구성 (1회) ─────────────────────────────────────────
+    # 헤딩 색인: 섹션 헤딩 노드의 줄 번호(오름차순) · strip 된 헤딩 텍스트 · 노드 위치
+    # 구매 버튼 색인: '쿠팡…구매' 문구가 있는 줄 번호 (1순위 역추적 탐색 경계)
+    # URL → 해당 URL 이 처음 등장하는 비-테이블 줄 (테이블 셀 안의 구매 링크 제외)
+    heading_lines: list[int] = []
+    heading_text:  dict[int, str] = {}
+    heading_node:  dict[int, int] = {}
+    buy_lines:     list[int] = []
+    url_line:      dict[str, int] = {}
+    pending = {p.get('product_url', '') for p in products if p.get('product_url')}
+    li = 0
+    for ni, node in enumerate(nodes):
+        if node.kind == "blank":
+            li += len(node.lines)
             continue
-        cleaned.append(lines[i])
-        i += 1
-
-    # ── 헤딩 스코어링 헬퍼 ───────────────────────────────────────
-    def _score_heading(heading: str, name: str) -> int:
-        """헤딩이 상품명과 얼마나 일치하는지 점수 반환 (높을수록 좋음)"""
-        score = 0
-        tokens = [w for w in re.split(r'[\s,\(\)\[\]/·]+', name) if len(w) >= 2]
-        for t in tokens:
-            if t in heading:
-                score += len(t)  # 긴 토큰일수록 가중치 높음
-        return score
-
-    # ── 1~2순위: 상품별 삽입 위치(줄 인덱스) 결정 ───────────────
-    # insertions: {heading_line_idx: (img_url, img_alt)}
+        if node.kind == "heading" and node.level != 1:
+            heading_lines.append(li)
+            heading_text[li] = node.lines[0].strip()
+            heading_node[li] = ni
+        for line in node.lines:
+            if '쿠팡' in line and '구매' in line and RX.COUPANG_BUY_TEXT.search(line):
+                buy_lines.append(li)
+            if pending and '|' not in line:
+                for url in [u for u in pending if u in line]:
+                    url_line[url] = li
+                    pending.discard(url)
+            li += 1
+
+    # ── 1~2순위: 상품별 삽입 위치(헤딩 줄 번호) 결정 ────────────
+    # insertions: {heading_line: (img_url, img_alt)}
     insertions: dict[int, tuple[str, str]] = {}
     used_headings: set[int] = set()
 
@@ -1393,50 +1768,54 @@ def _inject_product_images(text: str, products: list[dict]) -> str:
             log.warning("  [이미지] URL 없음 — 건너뜀: %s", name[:40])
             continue
 
+        # 상품명 토큰 (2자 이상, 중복 포함 — 긴 토큰일수록 가중치 높음)
+        tokens = [w for w in RX.NAME_TOKEN_SPLIT.split(name) if len(w) >= 2]
+
+        def _score(li: int) -> int:
+            heading = heading_text[li]
+            return sum(len(t) for t in tokens if t in heading)
+
         heading_idx: int | None = None
 
         # 1순위: product_url 역추적 (테이블 행 제외)
         # 비교표 안의 구매 링크는 건너뛰고, 개별 섹션의 구매 링크만 사용
-        if product_url:
-            for li, line in enumerate(cleaned):
-                if product_url not in line:
+        li = url_line.get(product_url) if product_url else None
+        if li is not None:
+            # 위로 탐색 (최대 49줄) — 상품명 키워드 포함 헤딩 우선.
+            # li-4 이하에서 가장 가까운 다른 구매 버튼 줄까지만 (해당 줄 포함)
+            low = max(li - 49, 0)
+            bi  = bisect_right(buy_lines, li - 4) - 1
+            if bi >= 0 and buy_lines[bi] >= low:
+                low = buy_lines[bi]
+            best_ri: int | None = None
+            best_score          = 0
+            hi = bisect_left(heading_lines, li) - 1
+            lo = bisect_left(heading_lines, low)
+            for k in range(hi, lo - 1, -1):
+                ri = heading_lines[k]
+                if ri in used_headings:
                     continue
-                if '|' in line:          # 테이블 셀 안의 URL → 건너뜀
-                    continue
-                # 위로 탐색 (최대 50줄) — 상품명 키워드 포함 헤딩 우선
-                best_ri: int | None  = None
-                best_score           = 0
-                for ri in range(li - 1, max(li - 50, -1), -1):
-                    s = cleaned[ri].strip()
-                    if not s:
-                        continue
-                    if _is_section_heading(s) and ri not in used_headings:
-                        sc = _score_heading(s, name)
-                        if sc > best_score:
-                            best_score = sc
-                            best_ri    = ri
-                        elif best_ri is None:
-                            best_ri = ri   # 점수 없어도 가장 가까운 헤딩 임시 저장
-                    # 다른 구매 버튼 만나면 영역 이탈 → 중단
-                    if re.search(r'쿠팡.*구매|구매.*쿠팡', s) and ri < li - 3:
-                        break
-                if best_ri is not None:
-                    heading_idx = best_ri
-                break  # 첫 번째 비-테이블 URL 줄만 처리
+                sc = _score(ri)
+                if sc > best_score:
+                    best_score = sc
+                    best_ri    = ri
+                elif best_ri is None:
+                    best_ri = ri   # 점수 없어도 가장 가까운 헤딩 임시 저장
+            if best_ri is not None:
+                heading_idx = best_ri
 
         # 2순위: 전체 헤딩 스코어링 (이름 매칭 점수 최고 헤딩 선택)
         # — Strategy 1 실패 또는 URL 없는 경우
         if heading_idx is None:
             best_idx   = None
             best_score = 0
-            for li, line in enumerate(cleaned):
-                s = line.strip()
-                if not _is_section_heading(s) or li in used_headings:
+            for hl in heading_lines:
+                if hl in used_headings:
                     continue
-                sc = _score_heading(s, name)
+                sc = _score(hl)
                 if sc > best_score:
                     best_score = sc
-                    best_idx   = li
+                    best_idx   = hl
             if best_idx is not None and best_score > 0:
                 heading_idx = best_idx
 
@@ -1447,54 +1826,77 @@ def _inject_product_images(text: str, products: list[dict]) -> str:
         else:
             log.warning("  [이미지] 삽입 위치 미탐색: %s", name[:40])
 
-    # ── 이미지 삽입 (뒤 → 앞 순서로 인덱스 유지) ────────────────
+    # ── 이미지 · 빈 줄 노드 삽입 (뒤 → 앞 순서로 노드 위치 유지) ─────
     for li in sorted(insertions.keys(), reverse=True):
         img_url, img_alt = insertions[li]
-        cleaned.insert(li, '')
-        cleaned.insert(li, f"![{img_alt}]({img_url})")
+        ni = heading_node[li]
+        nodes[ni:ni] = [Node("image", [f"![{img_alt}]({img_url})"]), Node("blank", [""])]
 
-    return '\n'.join(cleaned)
+    doc.nodes = nodes
 
 
-def _remove_orphan_links(text: str) -> str:
+def _remove_orphan_links(doc: Document) -> None:
     """
     URL 없는 [텍스트] (마크다운 링크가 아닌 단순 대괄호) 를 텍스트만 남겨 제거.
     예: [🛒 구매하기] → 구매하기
     단, 이미지 ![...] 와 레퍼런스 링크 [text][ref] 는 건드리지 않음.
     """
-    # [text] not followed by ( or [ — strip brackets, keep inner text
-    return re.sub(r'(?<!!)\[([^\]\n]+)\](?!\s*[\(\[])', r'\1', text)
+    nodes = doc.nodes
+    changed: list[int] = []
+    for ni, node in enumerate(nodes):
+        lines = node.lines
+        for k, line in enumerate(lines):
+            if "[" not in line or "]" not in line:
+                continue
+            # [text] not followed by ( or [ — strip brackets, keep inner text
+            # 줄 끝 ']' 뒤 판정은 다음 내용 줄의 첫 글자(원문 기준)까지 본다
+            ctx = ""
+            if line.rstrip().endswith("]"):
+                pos = doc.next_content(ni, k)
+                if pos is not None:
+                    ctx = nodes[pos[0]].lines[pos[1]].lstrip()[0]
+            fixed = RX.ORPHAN_BRACKET.sub(r'\1', line + "\n" + ctx)
+            fixed = fixed[:len(fixed) - len(ctx) - 1]
+            if fixed != line:
+                lines[k] = fixed
+                changed.append(ni)
+    doc.retype(changed)
 
 
 def assemble(topic: dict, content: str, seo: dict,
              affiliate_url: str = "", product_image: str = "",
-             products: list[dict] | None = None) -> dict:
+             products: list[dict] | None = None,
+             render_html: bool = True) -> dict:
     # JSON 래핑 잔재 제거 (LLM이 ```json { "improved_content": "..." } ``` 로 반환한 경우)
     stripped = content.strip()
     if stripped.startswith("```"):
-        stripped = re.sub(r"^```(?:json|markdown)?\s*", "", stripped, flags=re.IGNORECASE)
-        stripped = re.sub(r"\s*```$", "", stripped)
+        stripped = RX.FENCE_OPEN_ANY.sub("", stripped)
+        stripped = RX.FENCE_CLOSE.sub("", stripped)
     if stripped.lstrip().startswith("{") and '"improved_content"' in stripped[:300]:
         try:
-            data = json.loads(re.search(r"\{[\s\S]+\}", stripped).group())  # type: ignore
+            data = json.loads(RX.JSON_OBJECT.search(stripped).group())  # type: ignore
             stripped = data.get("improved_content", content)
         except Exception:
             pass
-    clean = re.sub(r"\ntags?:.*$", "", stripped, flags=re.IGNORECASE | re.MULTILINE).rstrip()
-    clean = re.sub(r"^# .+\n?", "", clean).strip()
-    clean = _fix_md_tables(clean)                         # 분할된 테이블 행 병합
-    clean = re.sub(r'\]\s+\(http', '](http', clean)      # ] (URL) → ](URL) 공백 버그 수정
-    clean = _remove_orphan_links(clean)                   # URL 없는 [텍스트] 제거
+    clean = RX.TAGS_TRAILER.sub("", stripped).rstrip()
+    clean = RX.H1_TITLE.sub("", clean).strip()
+    # 본문은 한 번만 블록 노드로 파싱하고, 수정기들이 같은 노드 목록을 차례로 고친다
+    doc = Document.parse(clean)
+    _fix_md_tables(doc)                                   # 분할된 테이블 행 병합
+    _join_link_breaks(doc)                                # ] (URL) → ](URL) 공백 버그 수정
+    _remove_orphan_links(doc)                             # URL 없는 [텍스트] 제거
     if products:
-        clean = _inject_product_images(clean, products)   # 상품 섹션 앞 이미지 삽입
-    clean = _strip_non_korean(clean)
-    summary_match = re.match(r"^(.+?)(?:\n|$)", clean.strip())
+        _inject_product_images(doc, products)             # 상품 섹션 앞 이미지 삽입
+    _strip_non_korean_doc(doc)
+    clean = doc.to_markdown()
+    summary_match = RX.FIRST_LINE.match(clean)
     summary = summary_match.group(1).strip() if summary_match else topic["title"]
     return {
         "title":         _strip_non_korean(seo.get("seo_title") or topic["title"]),
         "summary":       _strip_non_korean(seo.get("meta_description") or summary[:300]),
         "content":       clean,
-        "content_html":  md_to_html(clean),
+        "content_html":  doc.to_html() if render_html else "",
+        "document":      doc,
         "tags":          seo.get("tags", []),
         "focus_keyword": seo.get("focus_keyword", ""),
         "category":      topic["category"],  # 사이트 카테고리와 동일
@@ -1502,7 +1904,12 @@ def assemble(topic: dict, content: str, seo: dict,
         "product_image": product_image,
     }
 
-def save_to_supabase(topic: dict, assembled: dict, slug: str, quality_score: int) -> None:
+def save_to_supabase(topic: dict, assembled: dict, slug: str, quality_score: int,
+                     slug_base: str = "") -> str:
+    """
+    blog_posts 에 발행. slug 가 그 사이 다른 프로세스에 선점돼 UNIQUE 충돌(409)이 나면
+    slug_base 기준으로 다음 빈 slug 를 다시 골라 재시도한다. 최종 slug 반환.
+    """
     record = {
         "slug":           slug,
         "title":          assembled["title"],
@@ -1521,19 +1928,23 @@ def save_to_supabase(topic: dict, assembled: dict, slug: str, quality_score: int
         record["affiliate_url"] = assembled["affiliate_url"]
     if assembled.get("product_image"):
         record["product_image"] = assembled["product_image"]
-    resp = requests.post(
-        f"{SUPABASE_URL}/rest/v1/blog_posts",
-        headers={
-            "apikey":        SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type":  "application/json",
-            "Prefer":        "return=representation",
-        },
-        json=record,
-        timeout=15,
-    )
-    resp.raise_for_status()
+    conflicts: set[str] = set()
+    for attempt in range(1, SLUG_CONFLICT_RETRY + 2):
+        # 삽입은 재시도하지 않는다 (응답 유실 시 중복 발행 방지) — 409 만 slug 를 바꿔 재요청
+        resp = _db().request("POST", "blog_posts", json=record, prefer="return=representation")
+        if (resp.status_code == 409 and slug_base and attempt <= SLUG_CONFLICT_RETRY
+                and "slug" in resp.text):
+            conflicts.add(record["slug"])
+            record["slug"] = unique_slug(slug_base, taken=conflicts)
+            log.warning("[DB] slug 충돌 (%s) — %s 로 재시도", resp.text[:80], record["slug"])
+            continue
+        if not resp.ok:
+            raise SupabaseError(resp)
+        break
+    slug = record["slug"]
+    _PUBLISHED_INDEX.add(record["search_keyword"], topic["key"])   # 다음 토픽 선택에 즉시 반영
     log.info("[DB] 저장 완료: /blog/%s (score=%d, category=%s)", slug, quality_score, assembled["category"])
+    return slug
 
 
 # ══════════════════════════════════════════════════════════════
@@ -1553,12 +1964,12 @@ def validate_env() -> None:
         log.warning("[쿠팡] COUPANG_ACCESS_KEY / COUPANG_SECRET_KEY 미설정 — 상품 데이터 없이 실행")
 
 def validate_ollama(model: str) -> None:
-    try:
-        requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5).raise_for_status()
-    except Exception as e:
-        log.error("[Ollama] 연결 실패 (%s): %s", OLLAMA_BASE_URL, e)
+    backends = _llm_pool().candidates(model)
+    if not backends:
+        log.error("[Ollama] 모델 '%s' 을 가진 정상 백엔드 없음 (%s)", model, ", ".join(OLLAMA_BASE_URLS))
         sys.exit(1)
-    log.info("[Ollama] 선택 모델: %s", model)
+    log.info("[Ollama] 선택 모델: %s (백엔드 %d개: %s)",
+             model, len(backends), ", ".join(b.url for b in backends))
 
 
 # ══════════════════════════════════════════════════════════════
@@ -1570,9 +1981,16 @@ def run_pipeline(
     model: str,
     dry_run: bool = False,
     resume_stage: Optional[str] = None,
+    run_id: Optional[str] = None,
 ) -> dict:
     STAGE_ORDER = ["products", "topic", "outline", "write", "quality", "seo", "review"]
-    state = load_state() if resume_stage else {}
+    state = load_state(run_id) if resume_stage else None
+    if state is None:
+        if resume_stage:
+            log.warning("[State] 재개할 실행 상태 없음 (%s) — 처음부터 실행", run_id or "최근 미완료 실행")
+        state = _STATE_STORE.create(topic_key=topic.get("key", ""))
+    log.info("[State] run_id=%s", state.run_id)
+    _emit(f"[PIPELINE:run_id={state.run_id}]")
     t_total = time.time()
 
     resume_idx = STAGE_ORDER.index(resume_stage) if resume_stage in STAGE_ORDER else 0
@@ -1648,6 +2066,15 @@ def run_pipeline(
             _emit("[PIPELINE:stage=write:status=skipped]")
 
         if attempt == 1 and resume_idx <= 4 or "improved" not in state:
+            # 구조 최소 기준 미달 초고는 LLM 품질 검토 없이 바로 재작성 (마지막 시도 제외)
+            _, pre_failures = stage_prescore(draft, state.get("products"))
+            if pre_failures and attempt < MAX_WRITE_RETRY + 1:
+                log.info("  구조 미달 — 품질 검토 생략, 재작성 시도 %d", attempt + 1)
+                _emit("[PIPELINE:stage=quality:status=skipped:reason=prescore]")
+                state.pop("draft", None)
+                state.pop("improved", None)
+                save_state(state)   # 재개 시 폐기한 초고를 다시 읽지 않도록
+                continue
             improved, quality_score = stage_quality(draft, analysis, model)
             state["improved"]       = improved
             state["quality_score"]  = quality_score
@@ -1664,6 +2091,7 @@ def run_pipeline(
                  quality_score, MIN_QUALITY_SCORE, attempt + 1)
         state.pop("draft", None)
         state.pop("improved", None)
+        save_state(state)
 
     # Stage 5: SEO
     seo = stage_seo(topic, improved, analysis, model,
@@ -1671,18 +2099,20 @@ def run_pipeline(
     state["seo"] = seo
     save_state(state)
 
+    # HTML 변환은 검수 후 1회만 수행
     assembled = assemble(topic, improved, seo,
                          affiliate_url=affiliate_url, product_image=product_image,
-                         products=state.get("products") or [])
+                         products=state.get("products") or [],
+                         render_html=False)
 
-    # Stage 6: 최종 검수
+    # Stage 6: 최종 검수 (assemble 문서 모델을 그대로 수정 → HTML 1회 직렬화)
+    doc = assembled.pop("document")
     reviewed_content, review_report = stage_review(
-        assembled["content"],
+        doc,
         products=state.get("products") or [],
     )
-    if reviewed_content != assembled["content"]:
-        assembled["content"]      = reviewed_content
-        assembled["content_html"] = md_to_html(reviewed_content)
+    assembled["content"]      = reviewed_content
+    assembled["content_html"] = doc.to_html()
 
     elapsed = round(time.time() - t_total, 1)
 
@@ -1708,9 +2138,11 @@ def run_pipeline(
     else:
         # SEO 단계에서 생성한 영문 slug 우선 사용, 없으면 topic key fallback
         raw_slug = seo.get("slug_suggestion") or topic.get("key", "") or slugify(assembled["title"])
-        slug = unique_slug(slugify(raw_slug))
-        save_to_supabase(topic, assembled, slug, quality_score)
+        slug_base = slugify(raw_slug)
+        slug = save_to_supabase(topic, assembled, unique_slug(slug_base), quality_score,
+                                slug_base=slug_base)
         _save_history(topic["key"])
+        state.finish()   # 발행 완료 — 이후 --stage 재개 대상에서 제외 (dry-run 은 재개 가능)
         log.info("[완료] /blog/%s (score=%d, %.1fs, affiliate=%s, 검수수정=%d건, 경고=%d건)",
                  slug, quality_score, elapsed, "✓" if affiliate_url else "✗",
                  len(review_report["fixed"]), len(review_report["warnings"]))
@@ -1718,6 +2150,7 @@ def run_pipeline(
 
     assembled["quality_score"]  = quality_score
     assembled["review_report"]  = review_report
+    assembled["run_id"]         = state.run_id
     return assembled
 
 
@@ -1725,8 +2158,9 @@ def run_pipeline(
 # 메인
 # ══════════════════════════════════════════════════════════════
 
-def main() -> None:
-    global _PIPELINE_MODE
+def main(argv: Optional[list[str]] = None) -> None:
+    """CLI 진입점. argv 미지정 시 sys.argv (job_runner 는 blog 작업 인자를 넘긴다)."""
+    global _PIPELINE_MODE, QUALITY_MODE, WRITE_MODE, MODEL_POLICY
 
     parser = argparse.ArgumentParser(description="ThiveLab 쿠팡 파트너스 리뷰 자동 생성기")
     parser.add_argument("--count",         type=int,  default=1,  help="생성 개수 (기본: 1)")
@@ -1734,7 +2168,11 @@ def main() -> None:
     parser.add_argument("--pipeline-mode", action="store_true",   help="구조화 마커 출력")
     parser.add_argument("--stage",         type=str,  default=None,
                         choices=["products", "topic", "outline", "write", "quality", "seo"],
-                        help="특정 스테이지부터 재실행")
+                        help="특정 스테이지부터 재실행 (기본: 가장 최근 미완료 실행)")
+    parser.add_argument("--run-id",        type=str,  default=None,
+                        help="--stage 로 재개할 실행 ID (--list-runs 로 확인)")
+    parser.add_argument("--list-runs",     action="store_true",
+                        help="저장된 최근 실행 상태 목록 출력 후 종료")
     parser.add_argument("--category",      type=str,  default=None,
                         choices=SITE_CATEGORIES,
                         help="특정 카테고리만 생성")
@@ -1742,10 +2180,44 @@ def main() -> None:
                         help="(기본값, 무시됨) 트렌드 우선 모드는 항상 활성")
     parser.add_argument("--no-trend",       action="store_true",
                         help="트렌드 무시하고 고정 TOPICS 에서만 선택")
-    args = parser.parse_args()
+    parser.add_argument("--quality-mode",   type=str,  default=None,
+                        choices=QUALITY_MODES,
+                        help="품질 단계 모드 — diff: 섹션 수정안 적용, full: 전체 재작성 (기본: BLOG_QUALITY_MODE)")
+    parser.add_argument("--write-mode",     type=str,  default=None,
+                        choices=WRITE_MODES,
+                        help="본문 작성 모드 — single: 1회 호출, sectioned: H2 섹션별 동시 작성 (기본: BLOG_WRITE_MODE)")
+    parser.add_argument("--model-policy",   type=str,  default=None,
+                        choices=list(MODEL_POLICIES),
+                        help="모델 선택 정책 — quality / balanced / speed (기본: BLOG_MODEL_POLICY)")
+    parser.add_argument("--benchmark-models", action="store_true",
+                        help="설치된 모델별 고정 프롬프트 처리량 측정 후 종료")
+    args = parser.parse_args(argv)
+    if args.run_id and not args.stage:
+        parser.error("--run-id 는 --stage 와 함께 사용하세요")
 
     _PIPELINE_MODE = args.pipeline_mode
 
+    if args.list_runs:
+        for r in _STATE_STORE.list_runs():
+            print(f"{r['run_id']:<32} {r['status']:<8} "
+                  f"{datetime.fromtimestamp(r['updated_at']):%Y-%m-%d %H:%M}  "
+                  f"{r['topic_key'] or '-':<24} {','.join(r['fields'])}")
+        return
+    if args.model_policy:
+        MODEL_POLICY = args.model_policy
+    if args.quality_mode:
+        QUALITY_MODE = args.quality_mode
+    if args.write_mode:
+        WRITE_MODE = args.write_mode
+
+    if args.benchmark_models:
+        available = get_available_models(use_cache=False)
+        if not available:
+            log.error("[Ollama] 사용 가능한 채팅 모델이 없습니다.")
+            sys.exit(1)
+        benchmark_models(available)
+        return
+
     if not args.dry_run:
         validate_env()
 
@@ -1758,7 +2230,7 @@ def main() -> None:
     validate_ollama(model)
 
     log.info("사용 가능한 모델: %s", available)
-    log.info("선택된 모델: %s", model)
+    log.info("선택된 모델: %s (정책=%s)", model, MODEL_POLICY)
     if args.category:
         log.info("카테고리 필터: %s", args.category)
     if args.no_trend:
@@ -1775,12 +2247,9 @@ def main() -> None:
 
         if args.no_trend:
             # 고정 TOPICS 강제 — 트렌드 건너뜀
-            db_keywords = _fetch_published_keywords()
+            _fetch_published_keywords()
             local_recent = set(_load_history())
-            db_used_keys = {
-                t["key"] for t in TOPICS
-                if t.get("search_keyword", "").strip() in db_keywords
-            }
+            db_used_keys = _PUBLISHED_INDEX.topic_keys
             used = local_recent | db_used_keys | _SESSION_USED_KEYS
             pool = [t for t in TOPICS if t["category"] == args.category] if args.category else TOPICS
             available_fixed = [t for t in pool if t["key"] not in used] or pool
@@ -1793,7 +2262,15 @@ def main() -> None:
                  i + 1, args.count, topic["title"], topic["category"],
                  " [🔥TREND]" if topic.get("is_trend") else " [📋고정]")
         _emit(f"[PIPELINE:topic_title={topic['title']}]")
-        run_pipeline(topic, model, dry_run=args.dry_run, resume_stage=args.stage)
+        # 재개는 첫 실행에만 적용 (이후 반복은 새 실행)
+        run_pipeline(topic, model, dry_run=args.dry_run,
+                     resume_stage=args.stage if i == 0 else None,
+                     run_id=args.run_id if i == 0 else None)
+
+    if SUPABASE_URL and SUPABASE_KEY:
+        _db().log_stats()   # 실행 중 DB 요청 수 · 소요 시간 요약
+    if _TRENDS_AVAILABLE and not args.no_trend:
+        log_trend_cache_stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+카테고리 색인 — 키워드 → 가장 잘 맞는 카테고리 (가중 점수)
+
+match_category 는 정의 순서가 가장 앞선 카테고리 하나를 돌려줬다. 그래서 여러
+카테고리에 있는 단어(예: "가습기" — 생활용품 · 아이디어)는 항상 앞 카테고리로 갔고,
+짧은 단어가 긴 단어 속에 우연히 들어 있어도(예: "TV" ⊂ "BTV") 일치로 쳤다.
+
+색인은 한 번만 만들어 두고 조회마다 키워드 길이에 비례하는 시간만 쓴다.
+  - 정방향: 키워드가 포함한 용어 — PhraseMatcher(Aho-Corasick) 한 번 훑기
+  - 역방향: 키워드를 포함하는 용어 (예: "청소" ⊂ "청소기") — 용어의 모든 부분
+    문자열 → {카테고리: 점수} 사전 조회 1회
+
+점수 (카테고리별 합산, 가장 높은 카테고리 선택 · 동점이면 정의 순서):
+  용어 가중치 × 용어 길이 × 위치 계수
+    위치 계수: 어절 전체와 일치 1.0 / 어절 앞 · 뒤에 붙음 0.8 / 어절 중간 0.5
+    (한글 ↔ 영문이 바뀌는 자리도 어절 경계로 본다 — "스마트TV", "LED조명")
+    SHORT_TERM_LEN 글자 이하 용어는 어절 첫머리 일치만 인정 (우연한 부분 일치 방지)
+  역방향 일치: 용어 가중치 × 키워드 길이 × (키워드 길이 / 용어 길이) × REVERSE_FACTOR
+
+용어는 코드의 {카테고리: [용어, ...]} 외에 JSON 파일에서 수천 개 단위로 불러올 수 있다.
+    {"가전/IT": ["청소기", "로봇청소기"], "아이디어": {"가습기": 0.5, "미니": 1.0}}
+    (리스트는 가중치 1.0, 객체는 용어별 가중치)
+
+Usage:
+    from category_index import CategoryIndex
+    index = CategoryIndex(CATEGORY_KEYWORDS).extend_from_file(Path("category_terms.json"))
+    index.best("무선 로봇청소기")          # → "가전/IT"
+    index.scores("미니 가습기")            # → {"아이디어": 5.0, "생활용품": 3.0}
+"""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Union
+
+from phrase_matcher import PhraseMatcher
+
+log = logging.getLogger(__name__)
+
+SHORT_TERM_LEN = 2      # 이 길이 이하 용어는 어절 첫머리에서 시작할 때만 인정
+REVERSE_FACTOR = 0.5    # 역방향(키워드 ⊂ 용어) 일치 감쇠
+MIN_REVERSE_LEN = 2     # 역방향 조회 최소 키워드 길이
+
+_POSITION_WEIGHT = {2: 1.0, 1: 0.8, 0: 0.5}    # 닿은 어절 경계 수 → 계수
+
+Terms = Union[Iterable[str], Mapping[str, float]]
+
+
+def _is_hangul(ch: str) -> bool:
+    return "\uac00" <= ch <= "\ud7a3"
+
+
+def _boundary(text: str, inside: int, outside: int) -> bool:
+    """
+    일치 구간 끝 글자(inside)와 바깥 글자(outside) 사이가 어절 경계인지 —
+    문자열 끝, 영숫자 · 한글이 아닌 문자, 또는 한글 ↔ 그 외 문자 전환.
+    """
+    if outside < 0 or outside >= len(text) or not text[outside].isalnum():
+        return True
+    return _is_hangul(text[inside]) != _is_hangul(text[outside])
+
+
+class CategoryIndex:
+    """카테고리 용어 색인. 생성 후에는 읽기 전용이라 스레드 간 공유 가능."""
+
+    def __init__(self, groups: Mapping[str, Terms]):
+        self._weights: dict[str, dict[str, float]] = {}     # 카테고리 → {용어(소문자): 가중치}
+        self.extend(groups)
+
+    # ── 구성 ──────────────────────────────────────────────────
+
+    def extend(self, groups: Mapping[str, Terms]) -> "CategoryIndex":
+        """용어 추가 (같은 카테고리 · 용어는 나중 가중치로 덮어씀) 후 색인 재구성."""
+        for cat, terms in groups.items():
+            items = terms.items() if isinstance(terms, Mapping) else ((t, 1.0) for t in terms)
+            bucket = self._weights.setdefault(cat, {})
+            for term, weight in items:
+                term = term.strip().lower()
+                if term:
+                    bucket[term] = float(weight)
+        self._build()
+        return self
+
+    def extend_from_file(self, path: Path) -> "CategoryIndex":
+        """JSON 용어 파일 병합. 파일이 없으면 그대로, 형식 오류는 경고 후 무시."""
+        if not path.exists():
+            return self
+        try:
+            groups = json.loads(path.read_text("utf-8"))
+            if not isinstance(groups, dict):
+                raise ValueError("최상위는 {카테고리: 용어 목록} 객체여야 함")
+        except Exception as e:
+            log.warning("[CategoryIndex] %s 로드 실패: %s", path, e)
+            return self
+        self.extend(groups)
+        log.info("[CategoryIndex] %s 병합 — 용어 %d개", path.name, self.term_count)
+        return self
+
+    def _build(self) -> None:
+        self._rank = {cat: i for i, cat in enumerate(self._weights)}
+        self._matcher = PhraseMatcher({cat: list(terms) for cat, terms in self._weights.items()},
+                                      ignore_case=True)
+        # 역방향: 용어의 진부분 문자열 → {카테고리: 최고 점수 (키워드 길이 반영 전)}
+        #   (용어 전체와 같은 키워드는 정방향에서 이미 점수를 받는다)
+        self._reverse: dict[str, dict[str, float]] = {}
+        for cat, terms in self._weights.items():
+            for term, weight in terms.items():
+                for i in range(len(term)):
+                    for j in range(i + MIN_REVERSE_LEN, len(term) + 1):
+                        sub = term[i:j]
+                        if sub == term:
+                            continue
+                        score = weight * REVERSE_FACTOR * (len(sub) / len(term))
+                        slot = self._reverse.setdefault(sub, {})
+                        if score > slot.get(cat, 0.0):
+                            slot[cat] = score
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self._weights)
+
+    @property
+    def term_count(self) -> int:
+        return sum(len(terms) for terms in self._weights.values())
+
+    # ── 조회 ──────────────────────────────────────────────────
+
+    def scores(self, keyword: str) -> dict[str, float]:
+        """카테고리별 점수 (0 초과만, 높은 순)."""
+        text = keyword.strip().lower()
+        totals: dict[str, float] = {}
+        for hit in self._matcher.iter_hits(text):
+            term = hit.phrase
+            starts = _boundary(text, hit.start, hit.start - 1)
+            if not starts and len(term) <= SHORT_TERM_LEN:
+                continue
+            edges = starts + _boundary(text, hit.end - 1, hit.end)
+            weight = self._weights[hit.category][term]
+            totals[hit.category] = totals.get(hit.category, 0.0) + weight * len(term) * _POSITION_WEIGHT[edges]
+
+        compact = "".join(text.split())
+        if len(compact) >= MIN_REVERSE_LEN:
+            for cat, score in self._reverse.get(compact, {}).items():
+                totals[cat] = totals.get(cat, 0.0) + score * len(compact)
+
+        return dict(sorted(((c, round(s, 3)) for c, s in totals.items() if s > 0),
+                           key=lambda cs: (-cs[1], self._rank[cs[0]])))
+
+    def best(self, keyword: str) -> Optional[str]:
+        """가장 높은 점수의 카테고리 (동점이면 정의 순서). 일치 없으면 None."""
+        return next(iter(self.scores(keyword)), None)
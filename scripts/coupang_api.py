@@ -14,16 +14,16 @@ import datetime
 import hashlib
 import hmac
 import logging
-import time
 import urllib.parse
 from dataclasses import dataclass, field
 
-import requests
+from rate_limit import get_limiter
 
 log = logging.getLogger(__name__)
 
 COUPANG_BASE = "https://api-gateway.coupang.com"
 SEARCH_PATH  = "/v2/providers/affiliate_open_api/apis/openapi/v1/products/search"
+MAX_RETRIES  = 3   # 429 포함 최대 시도 횟수
 
 
 # ── 상품 데이터 클래스 ─────────────────────────────────────────────────────────
@@ -110,6 +110,8 @@ def search_products(
     Returns:
         CoupangProduct 리스트 (검색 실패 시 빈 리스트)
     """
+    import requests   # 첫 검색 시 로드 (blog_generator import 비용 절감)
+
     params = {
         "keyword": keyword,
         "limit":   str(min(limit, 50)),
@@ -117,75 +119,67 @@ def search_products(
     }
     qs              = urllib.parse.urlencode(params)
     path_with_query = f"{SEARCH_PATH}?{qs}"
-    auth            = _make_auth_header("GET", path_with_query, access_key, secret_key)
     url             = f"{COUPANG_BASE}{path_with_query}"
 
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # 재시도 시 인증 헤더 재생성 (타임스탬프 갱신)
-            if attempt > 0:
-                auth = _make_auth_header("GET", path_with_query, access_key, secret_key)
-
-            resp = requests.get(
-                url,
-                headers={
-                    "Authorization": auth,
-                    "Content-Type":  "application/json;charset=UTF-8",
-                },
-                timeout=15,
-            )
+    def do_request():
+        # 재시도마다 인증 헤더 재생성 (타임스탬프 갱신)
+        auth = _make_auth_header("GET", path_with_query, access_key, secret_key)
+        return requests.get(
+            url,
+            headers={
+                "Authorization": auth,
+                "Content-Type":  "application/json;charset=UTF-8",
+            },
+            timeout=15,
+        )
+
+    try:
+        # 호스트 공용 리미터 — 호출 간격 조절 + 429 시 Retry-After/감속 후 재시도
+        resp = get_limiter(COUPANG_BASE).send(do_request, retries=MAX_RETRIES - 1)
+        if resp.status_code == 429:
+            log.warning("[쿠팡API] 429 재시도 %d회 초과 ('%s') — 빈 결과 반환", MAX_RETRIES, keyword)
+            return []
 
-            if resp.status_code == 429:
-                wait = 2 ** attempt  # 1s, 2s, 4s 지수 백오프
-                log.warning("[쿠팡API] 429 Rate Limited ('%s') — %ds 후 재시도 (%d/%d)",
-                            keyword, wait, attempt + 1, max_retries)
-                time.sleep(wait)
-                continue
-
-            if resp.status_code == 400:
-                log.warning("[쿠팡API] 잘못된 요청 ('%s'): %s", keyword, resp.text[:300])
-                return []
-            if resp.status_code == 401:
-                log.error("[쿠팡API] 인증 실패 — Access/Secret Key를 확인하세요")
-                return []
-            resp.raise_for_status()
-
-            body     = resp.json()
-            raw_list = body.get("data", {}).get("productData", [])
-            products: list[CoupangProduct] = []
-
-            for item in raw_list:
-                try:
-                    sale_price = int(item.get("productPrice", 0) or 0)
-                    orig_price = int(item.get("originalPrice", sale_price) or sale_price)
-                    products.append(CoupangProduct(
-                        product_name   = (item.get("productName") or "").strip(),
-                        product_price  = sale_price,
-                        original_price = orig_price,
-                        discount_rate  = int(item.get("discountRate", 0) or 0),
-                        rating         = float(item.get("ratingValue", 0.0) or 0.0),
-                        rating_count   = int(item.get("ratingCount", 0) or 0),
-                        product_image  = item.get("productImage", ""),
-                        product_url    = item.get("productUrl", ""),
-                        is_rocket      = bool(item.get("isRocket", False)),
-                    ))
-                except Exception as e:
-                    log.debug("[쿠팡API] 상품 파싱 스킵: %s", e)
-
-            log.info("[쿠팡API] '%s' → %d개 상품 수집", keyword, len(products))
-            return products
-
-        except requests.HTTPError as e:
-            log.warning("[쿠팡API] HTTP %s ('%s'): %s",
-                        e.response.status_code, keyword, e.response.text[:200])
+        if resp.status_code == 400:
+            log.warning("[쿠팡API] 잘못된 요청 ('%s'): %s", keyword, resp.text[:300])
             return []
-        except Exception as e:
-            log.warning("[쿠팡API] 검색 실패 ('%s'): %s", keyword, e)
+        if resp.status_code == 401:
+            log.error("[쿠팡API] 인증 실패 — Access/Secret Key를 확인하세요")
             return []
-
-    log.warning("[쿠팡API] 재시도 %d회 초과 ('%s') — 빈 결과 반환", max_retries, keyword)
-    return []
+        resp.raise_for_status()
+
+        body     = resp.json()
+        raw_list = body.get("data", {}).get("productData", [])
+        products: list[CoupangProduct] = []
+
+        for item in raw_list:
+            try:
+                sale_price = int(item.get("productPrice", 0) or 0)
+                orig_price = int(item.get("originalPrice", sale_price) or sale_price)
+                products.append(CoupangProduct(
+                    product_name   = (item.get("productName") or "").strip(),
+                    product_price  = sale_price,
+                    original_price = orig_price,
+                    discount_rate  = int(item.get("discountRate", 0) or 0),
+                    rating         = float(item.get("ratingValue", 0.0) or 0.0),
+                    rating_count   = int(item.get("ratingCount", 0) or 0),
+                    product_image  = item.get("productImage", ""),
+                    product_url    = item.get("productUrl", ""),
+                    is_rocket      = bool(item.get("isRocket", False)),
+                ))
+            except Exception as e:
+                log.debug("[쿠팡API] 상품 파싱 스킵: %s", e)
+
+        log.info("[쿠팡API] '%s' → %d개 상품 수집", keyword, len(products))
+        return products
+
+    except requests.HTTPError as e:
+        log.warning("[쿠팡API] HTTP %s ('%s'): %s",
+                    e.response.status_code, keyword, e.response.text[:200])
+        return []
+    except Exception as e:
+        log.warning("[쿠팡API] 검색 실패 ('%s'): %s", keyword, e)
+        return []
 
 
 # ── LLM 프롬프트용 상품 텍스트 포맷 ──────────────────────────────────────────
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+ThiveLab 데이터 작업 러너 — ETL · 가격 갱신 · 블로그 생성을 한 프로세스에서 실행
+
+steam_etl / tmdb_etl / refresh_prices / blog_generator 를 각각 cron 으로 띄우면
+작업마다 인터프리터 기동 · 모듈 import · 클라이언트 생성 · 로깅 설정을 따로 치른다.
+이 러너는 네 파이프라인을 작업(Job)으로 등록해 한 프로세스에서 돌린다.
+
+  - 작업마다 실행 주기(every)와 선행 작업(after)을 둔다
+  - 선행 관계가 없는 작업은 스레드 풀에서 동시에 실행 — Steam/TMDB 수집 I/O 와
+    블로그 생성(LLM 대기)이 겹친다. 선행 작업이 실패하면 후행 작업은 건너뜀
+  - 같은 프로세스라 Supabase 커넥션 풀(supabase_rest.get_client) 등 공용 클라이언트를 공유
+  - 작업별 시작 · 소요 시간 · 결과를 로그와 요약 표로 남기고, 마지막 성공 시각을
+    .job_runner_state.json 에 기록해 다음 실행에서 주기 도래 여부를 판단
+
+Usage:
+    python job_runner.py                     # 주기가 된 작업만 실행 (cron 매시간 등록용)
+    python job_runner.py --jobs steam tmdb   # 지정 작업 즉시 실행
+    python job_runner.py --all               # 전체 작업 즉시 실행
+    python job_runner.py --loop              # 상주 모드 — 주기가 될 때마다 실행
+    python job_runner.py --list              # 등록 작업 · 마지막 실행 · 다음 예정 출력
+    python job_runner.py --all --blog-args "--count 2 --category 가전/IT"
+
+Cron (매시간):
+    0 * * * * cd /path/to/thive-lab && python scripts/job_runner.py >> logs/jobs.log 2>&1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+import rate_limit
+
+# ── 환경변수 로드 (.env.local 우선, 없으면 scripts/.env) ──────────────────────
+# 작업 모듈은 설정을 import 시점에 읽으므로 작업 실행 전에 로드해 둔다
+load_dotenv(Path(__file__).parent.parent / ".env.local")
+load_dotenv(Path(__file__).parent / ".env")
+
+log = logging.getLogger(__name__)
+
+STATE_FILE      = Path(__file__).parent / ".job_runner_state.json"
+MAX_WORKERS     = 4
+LOOP_MAX_SLEEP  = 300   # 상주 모드에서 다음 확인까지 최대 대기 (초)
+FAIL_RETRY      = 1800  # 실패한 작업 재시도 간격 (초) — 주기보다 짧으면 이 간격으로 재시도
+
+HOUR = 3600
+
+
+# ── 작업 정의 ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class Job:
+    name:        str
+    run:         Callable[[list[str]], object]
+    every:       float                 # 실행 주기 (초)
+    after:       tuple[str, ...] = ()  # 같은 실행에 포함된 경우 먼저 끝나야 하는 작업
+    description: str = ""
+
+
+@dataclass
+class JobResult:
+    name:    str
+    status:  str          # ok | failed | skipped
+    started: float = 0.0
+    seconds: float = 0.0
+    error:   str   = ""
+
+
+# 작업 모듈은 실행할 때 import 한다 (등록만으로는 자격 증명 · 클라이언트를 요구하지 않음)
+
+def _run_steam(args: list[str]) -> None:
+    import steam_etl
+    steam_etl.run_etl_pipeline()
+
+
+def _run_tmdb(args: list[str]) -> None:
+    import tmdb_etl
+    tmdb_etl.run_etl_pipeline()
+
+
+def _run_refresh_prices(args: list[str]) -> None:
+    import refresh_prices
+    refresh_prices.main()
+
+
+def _run_blog(args: list[str]) -> None:
+    import blog_generator
+    blog_generator.main(args)
+
+
+JOBS: dict[str, Job] = {j.name: j for j in (
+    Job("steam",          _run_steam,          6 * HOUR,  description="Steam 할인 게임 수집"),
+    Job("tmdb",           _run_tmdb,           24 * HOUR, description="TMDB 영화 수집"),
+    Job("refresh_prices", _run_refresh_prices, 6 * HOUR,  description="쿠팡 상품 가격 갱신"),
+    # 가격 갱신과 블로그 생성은 같은 쿠팡 파트너스 API 호출 한도를 나눠 쓰므로 순서대로 실행
+    Job("blog",           _run_blog,           24 * HOUR, after=("refresh_prices",),
+        description="쿠팡 파트너스 리뷰 생성 · 발행"),
+)}
+
+
+# ── 러너 ──────────────────────────────────────────────────────────────────────
+
+class JobRunner:
+    """등록 작업을 선행 관계에 맞춰 스레드 풀에서 실행하고 마지막 성공 시각을 기록."""
+
+    def __init__(self, jobs: dict[str, Job], state_path: Path = STATE_FILE,
+                 max_workers: int = MAX_WORKERS, job_args: Optional[dict[str, list[str]]] = None):
+        self.jobs        = jobs
+        self.state_path  = state_path
+        self.max_workers = max_workers
+        self.job_args    = job_args or {}
+        self.last_ok:     dict[str, float] = {}
+        self.last_failed: dict[str, float] = {}
+        try:
+            loaded = json.loads(state_path.read_text("utf-8"))
+            if isinstance(loaded, dict):
+                self.last_ok     = {k: float(v) for k, v in (loaded.get("last_ok") or {}).items()}
+                self.last_failed = {k: float(v) for k, v in (loaded.get("last_failed") or {}).items()}
+        except Exception:
+            pass
+
+    def _save_state(self) -> None:
+        """임시 파일에 쓴 뒤 교체 (중간에 중단돼도 기존 파일 유지)."""
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps({"last_ok": self.last_ok, "last_failed": self.last_failed},
+                                      indent=2), "utf-8")
+            os.replace(tmp, self.state_path)
+        except Exception as e:
+            log.warning("[Jobs] 상태 저장 실패: %s", e)
+
+    # ── 일정 ──────────────────────────────────────────────────
+
+    def next_due(self, name: str) -> float:
+        """다음 실행 예정 시각 (한 번도 성공한 적 없으면 0 — 즉시). 최근 실패 후엔 FAIL_RETRY 뒤."""
+        last   = self.last_ok.get(name, 0.0)
+        failed = self.last_failed.get(name, 0.0)
+        due    = last + self.jobs[name].every if last else 0.0
+        if failed > last:
+            due = min(max(due, failed + FAIL_RETRY), failed + self.jobs[name].every)
+        return due
+
+    def due(self, now: Optional[float] = None) -> list[str]:
+        now = time.time() if now is None else now
+        return [name for name in self.jobs if self.next_due(name) <= now]
+
+    # ── 실행 ──────────────────────────────────────────────────
+
+    def _execute(self, job: Job) -> JobResult:
+        thread = threading.current_thread()
+        prev_name, thread.name = thread.name, job.name   # 로그에 작업 이름 표시
+        result = JobResult(job.name, "ok", started=time.time())
+        t0 = time.perf_counter()
+        log.info("[Jobs] ▶ %s 시작", job.name)
+        try:
+            job.run(self.job_args.get(job.name, []))
+        except SystemExit as e:
+            # CLI main() 의 sys.exit — 0/None 은 정상 종료
+            if e.code not in (0, None):
+                result.status, result.error = "failed", f"exit {e.code}"
+        except Exception as e:
+            log.exception("[Jobs] %s 실패", job.name)
+            result.status, result.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            result.seconds = time.perf_counter() - t0
+            log.info("[Jobs] ■ %s %s (%.1fs)%s", job.name, result.status, result.seconds,
+                     f" — {result.error}" if result.error else "")
+            thread.name = prev_name
+        return result
+
+    def run(self, names: list[str]) -> list[JobResult]:
+        """
+        names 작업 실행. 선행 작업(after)이 이번 실행에 포함돼 있으면 그 작업이 성공한 뒤
+        시작하고, 실패 · 건너뜀이면 건너뛴다. 포함되지 않은 선행 작업은 무시한다.
+        """
+        selected = [n for n in self.jobs if n in set(names)]   # 등록 순서 유지
+        results:  dict[str, JobResult] = {}
+        running:  dict[Future, str] = {}
+        pending = list(selected)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job") as pool:
+            while pending or running:
+                progressed = False
+                for name in list(pending):
+                    deps = [d for d in self.jobs[name].after if d in selected]
+                    if any(d in results and results[d].status != "ok" for d in deps):
+                        pending.remove(name)
+                        results[name] = JobResult(name, "skipped", error="선행 작업 실패")
+                        log.warning("[Jobs] %s 건너뜀 — 선행 작업 실패 (%s)", name, ", ".join(deps))
+                        progressed = True
+                    elif all(d in results for d in deps):
+                        pending.remove(name)
+                        running[pool.submit(self._execute, self.jobs[name])] = name
+                        progressed = True
+                if not running:
+                    if not progressed:   # 순환 선행 관계 — 남은 작업은 실행할 수 없다
+                        for name in pending:
+                            results[name] = JobResult(name, "skipped", error="순환 선행 관계")
+                        pending.clear()
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    result = fut.result()
+                    results[running.pop(fut)] = result
+                    if result.status == "ok":
+                        self.last_ok[result.name] = result.started
+                    else:
+                        self.last_failed[result.name] = result.started
+        self._save_state()
+        ordered = [results[n] for n in selected]
+        self._log_summary(ordered)
+        rate_limit.log_stats()   # 작업들이 공유한 호스트별 호출 속도 제한 현황
+        return ordered
+
+    @staticmethod
+    def _log_summary(results: list[JobResult]) -> None:
+        if not results:
+            log.info("[Jobs] 실행할 작업 없음")
+            return
+        log.info("[Jobs] ── 요약 ──────────────────────────────")
+        for r in results:
+            started = datetime.fromtimestamp(r.started).strftime("%H:%M:%S") if r.started else "-"
+            log.info("[Jobs] %-16s %-8s 시작=%s 소요=%6.1fs %s",
+                     r.name, r.status, started, r.seconds, r.error)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _print_jobs(runner: JobRunner) -> None:
+    now = time.time()
+    print(f"\n{'작업':<16}{'주기':>6}  {'선행':<16}{'마지막 성공':<18}{'다음 예정':<18}설명")
+    print("─" * 96)
+    for name, job in runner.jobs.items():
+        last = runner.last_ok.get(name)
+        nxt  = runner.next_due(name)
+        print(f"{name:<16}{job.every / HOUR:>5.0f}h  {','.join(job.after) or '-':<16}"
+              f"{datetime.fromtimestamp(last).strftime('%m-%d %H:%M') if last else '-':<18}"
+              f"{'지금' if nxt <= now else datetime.fromtimestamp(nxt).strftime('%m-%d %H:%M'):<18}"
+              f"{job.description}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ThiveLab 데이터 작업 러너")
+    parser.add_argument("--jobs",      nargs="+", choices=list(JOBS), default=None,
+                        help="지정 작업 즉시 실행 (주기 무시)")
+    parser.add_argument("--all",       action="store_true", help="전체 작업 즉시 실행")
+    parser.add_argument("--loop",      action="store_true", help="상주 모드 — 주기가 된 작업 반복 실행")
+    parser.add_argument("--list",      action="store_true", help="등록 작업 목록 출력 후 종료")
+    parser.add_argument("--workers",   type=int, default=MAX_WORKERS,
+                        help=f"동시 실행 작업 수 (기본: {MAX_WORKERS})")
+    parser.add_argument("--blog-args", type=str, default="",
+                        help='blog 작업에 넘길 blog_generator 인자 (예: "--count 2")')
+    args = parser.parse_args()
+
+    # 작업 모듈의 basicConfig 보다 먼저 — 스레드(작업) 이름을 포함한 공용 형식
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    runner = JobRunner(JOBS, max_workers=args.workers,
+                       job_args={"blog": shlex.split(args.blog_args)})
+    if args.list:
+        _print_jobs(runner)
+        return
+
+    if args.jobs or args.all:
+        results = runner.run(args.jobs or list(JOBS))
+        sys.exit(1 if any(r.status != "ok" for r in results) else 0)
+
+    if not args.loop:
+        results = runner.run(runner.due())
+        sys.exit(1 if any(r.status != "ok" for r in results) else 0)
+
+    log.info("[Jobs] 상주 모드 시작 — 작업 %d개", len(JOBS))
+    while True:
+        due = runner.due()
+        if due:
+            runner.run(due)
+        wait_s = min(runner.next_due(n) for n in JOBS) - time.time()
+        time.sleep(min(max(wait_s, 1.0), LOOP_MAX_SLEEP))
+
+
+if __name__ == "__main__":
+    main()
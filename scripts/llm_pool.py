@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Ollama 멀티 백엔드 풀 — 헬스 체크 + 부하 기반 라우팅 + 페일오버
+
+여러 Ollama 호스트를 하나의 풀로 묶어 각 /api/chat 호출을
+'해당 모델을 가진 정상 백엔드 중 가장 한가한 곳'으로 보낸다.
+
+  - probe()   : 각 호스트의 /api/tags(설치 모델) + /api/ps(로드된 모델 수) 조회
+  - ping()    : 캐시에서 복원한 백엔드의 생존만 /api/version 으로 가볍게 확인
+  - chat()    : 진행 중 요청 수 + 로드 상태 기준 최소 부하 백엔드 선택,
+                연결 실패/5xx 시 해당 백엔드를 쿨다운시키고 다음 백엔드로 재시도
+  - 쿨다운이 끝난 백엔드는 다음 선택 시 자동 재검사
+
+Usage:
+    from llm_pool import LLMBackendPool
+    pool = LLMBackendPool(["http://gpu-a:11434", "http://gpu-b:11434"])
+    pool.probe()
+    text = pool.chat({"model": "gemma4:e4b", "messages": [...], "stream": False})
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+log = logging.getLogger(__name__)
+
+PROBE_TIMEOUT  = 5     # /api/tags, /api/ps 조회 타임아웃 (초)
+FAIL_COOLDOWN  = 60    # 장애 백엔드 재시도 대기 (초)
+PROBE_INTERVAL = 300   # 정상 백엔드 모델 목록 재조회 주기 (초)
+
+# 임베딩 전용 모델은 채팅 후보에서 제외
+EMBED_KEYWORDS = ("embed", "nomic", "bge", "e5-")
+
+
+class NoBackendAvailable(RuntimeError):
+    """요청한 모델을 처리할 수 있는 정상 백엔드가 없음."""
+
+
+# ── 백엔드 상태 ───────────────────────────────────────────────────────────────
+
+@dataclass
+class OllamaBackend:
+    url:         str
+    models:      set[str] = field(default_factory=set)
+    healthy:     bool  = False
+    in_flight:   int   = 0      # 이 프로세스에서 진행 중인 요청 수
+    loaded:      int   = 0      # /api/ps 기준 서버에 로드된 모델 수
+    probed_at:   float = 0.0
+    failed_at:   float = 0.0
+    last_error:  str   = ""
+
+    @property
+    def load(self) -> int:
+        """라우팅 부하 지표 — 진행 중 요청 우선, 로드된 모델 수는 보조."""
+        return self.in_flight * 10 + self.loaded
+
+    def has_model(self, model: str) -> bool:
+        m = model.lower()
+        return any(
+            name.lower() == m or name.lower() == f"{m}:latest"
+            for name in self.models
+        )
+
+
+# ── 풀 ────────────────────────────────────────────────────────────────────────
+
+class LLMBackendPool:
+    """Ollama 백엔드 풀. 스레드 안전 (섹션 동시 작성 등에서 공유)."""
+
+    def __init__(self, urls: list[str]):
+        seen: dict[str, OllamaBackend] = {}
+        for u in urls:
+            u = u.strip().rstrip("/")
+            if u and u not in seen:
+                seen[u] = OllamaBackend(url=u)
+        self.backends: list[OllamaBackend] = list(seen.values())
+        self._lock = threading.Lock()
+
+    # ── 헬스 체크 ─────────────────────────────────────────────
+
+    def _probe_one(self, b: OllamaBackend) -> None:
+        import requests   # 첫 호출 시 로드 (모듈 import 비용 절감)
+
+        try:
+            resp = requests.get(f"{b.url}/api/tags", timeout=PROBE_TIMEOUT)
+            resp.raise_for_status()
+            models = {
+                m["name"] for m in resp.json().get("models", [])
+                if not any(kw in m["name"].lower() for kw in EMBED_KEYWORDS)
+            }
+            loaded = 0
+            try:
+                ps = requests.get(f"{b.url}/api/ps", timeout=PROBE_TIMEOUT)
+                if ps.ok:
+                    loaded = len(ps.json().get("models", []))
+            except Exception:
+                pass  # /api/ps 미지원 구버전 — 부하 정보 없이 진행
+            with self._lock:
+                b.models, b.loaded = models, loaded
+                b.healthy, b.last_error = True, ""
+                b.probed_at = time.time()
+        except Exception as e:
+            with self._lock:
+                b.healthy    = False
+                b.failed_at  = time.time()
+                b.probed_at  = b.failed_at
+                b.last_error = str(e)[:200]
+            log.warning("[LLMPool] %s 헬스 체크 실패: %s", b.url, e)
+
+    def probe(self) -> list[OllamaBackend]:
+        """전체 백엔드 헬스 체크 (병렬). 정상 백엔드 목록 반환."""
+        threads = [threading.Thread(target=self._probe_one, args=(b,)) for b in self.backends]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        healthy = [b for b in self.backends if b.healthy]
+        log.info("[LLMPool] 정상 백엔드 %d/%d", len(healthy), len(self.backends))
+        return healthy
+
+    def _ping_one(self, b: OllamaBackend) -> None:
+        import requests
+
+        try:
+            requests.get(f"{b.url}/api/version", timeout=PROBE_TIMEOUT).raise_for_status()
+        except Exception as e:
+            self._mark_failed(b, e)
+
+    def ping(self) -> list[OllamaBackend]:
+        """
+        정상으로 표시된 백엔드의 생존 확인 (병렬, /api/version). 모델 목록은 그대로 두고
+        응답 없는 백엔드만 장애 처리한다. 살아 있는 백엔드 목록 반환.
+        """
+        targets = [b for b in self.backends if b.healthy]
+        threads = [threading.Thread(target=self._ping_one, args=(b,)) for b in targets]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return [b for b in targets if b.healthy]
+
+    def snapshot(self) -> dict[str, dict]:
+        """정상 백엔드의 모델 목록 스냅샷 — {url: {models, probed_at}} (디스크 캐시용)."""
+        with self._lock:
+            return {
+                b.url: {"models": sorted(b.models), "probed_at": b.probed_at}
+                for b in self.backends if b.healthy
+            }
+
+    def restore(self, snapshot: dict[str, dict]) -> int:
+        """
+        캐시된 스냅샷으로 백엔드 상태 복원 (네트워크 조회 없음).
+        복원된 백엔드는 PROBE_INTERVAL 이 지나면 호출 시점에 자동 재검사된다.
+        """
+        restored = 0
+        with self._lock:
+            for b in self.backends:
+                entry = snapshot.get(b.url)
+                if not entry or not entry.get("models"):
+                    continue
+                b.models    = set(entry["models"])
+                b.probed_at = float(entry.get("probed_at", 0))
+                b.healthy   = True
+                restored += 1
+        return restored
+
+    def _refresh_stale(self) -> None:
+        """쿨다운이 끝난 장애 백엔드 · 오래된 정상 백엔드 재검사."""
+        now = time.time()
+        for b in self.backends:
+            if (not b.healthy and now - b.failed_at >= FAIL_COOLDOWN) or \
+               (b.healthy and now - b.probed_at >= PROBE_INTERVAL):
+                self._probe_one(b)
+
+    def _mark_failed(self, b: OllamaBackend, err: object) -> None:
+        with self._lock:
+            b.healthy    = False
+            b.failed_at  = time.time()
+            b.last_error = str(err)[:200]
+        log.warning("[LLMPool] %s 장애 — %ds 쿨다운: %s", b.url, FAIL_COOLDOWN, err)
+
+    # ── 조회 ─────────────────────────────────────────────────
+
+    def available_models(self) -> list[str]:
+        """정상 백엔드 전체의 채팅 모델 합집합 (정렬)."""
+        names: set[str] = set()
+        for b in self.backends:
+            if b.healthy:
+                names |= b.models
+        return sorted(names)
+
+    def candidates(self, model: str) -> list[OllamaBackend]:
+        """모델을 가진 정상 백엔드 — 부하 오름차순."""
+        with self._lock:
+            ok = [b for b in self.backends if b.healthy and b.has_model(model)]
+            return sorted(ok, key=lambda b: b.load)
+
+    # ── 호출 ─────────────────────────────────────────────────
+
+    def chat(self, payload: dict, timeout: int = 300) -> dict:
+        """
+        /api/chat 호출을 최소 부하 백엔드로 라우팅. 실패 시 다음 백엔드로 페일오버.
+
+        Raises:
+            NoBackendAvailable: 모델을 가진 정상 백엔드가 하나도 없을 때
+            requests.HTTPError: 모든 백엔드가 4xx 로 거부했을 때 (마지막 응답)
+        """
+        import requests
+
+        model = payload.get("model", "")
+        self._refresh_stale()
+        tried: set[str] = set()
+        last_error: Exception | None = None
+
+        while True:
+            pool = [b for b in self.candidates(model) if b.url not in tried]
+            if not pool:
+                break
+            b = pool[0]
+            tried.add(b.url)
+            with self._lock:
+                b.in_flight += 1
+            t0 = time.time()
+            try:
+                resp = requests.post(f"{b.url}/api/chat", json=payload, timeout=timeout)
+                if resp.status_code >= 500:
+                    raise requests.HTTPError(f"{resp.status_code} {resp.text[:100]}", response=resp)
+                if resp.status_code == 404:
+                    # 모델이 내려간 경우 — 해당 백엔드 모델 목록에서 제외
+                    with self._lock:
+                        b.models.discard(model)
+                    last_error = requests.HTTPError(f"404 model '{model}' not found", response=resp)
+                    continue
+                resp.raise_for_status()
+                log.debug("[LLMPool] %s %s %.1fs", b.url, model, time.time() - t0)
+                return resp.json()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._mark_failed(b, e)
+                last_error = e
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code < 500:
+                    raise
+                self._mark_failed(b, e)
+                last_error = e
+            finally:
+                with self._lock:
+                    b.in_flight -= 1
+
+        if last_error is not None:
+            raise last_error
+        raise NoBackendAvailable(f"모델 '{model}' 을 가진 정상 Ollama 백엔드 없음")
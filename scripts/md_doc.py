@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+블로그 본문 블록 문서 모델 — assemble 후처리 · stage_review 검수 · HTML 렌더링이 공유
+
+마크다운을 한 번만 블록 노드(헤딩 · 단락 · 테이블 · 이미지 · 링크 · tags · 빈 줄)로 나눠
+Document 에 담고, 후처리 수정기(테이블 행 병합, 깨진 링크, 고아 대괄호, 상품 이미지 삽입,
+비한국어 제거)가 같은 노드 목록을 제자리에서 고친다. 마크다운 · HTML 직렬화는 마지막에
+한 번씩만 한다 — 단계마다 문자열 전체를 다시 split/join 하지 않는다.
+
+노드는 원문 줄을 그대로 들고 있어 to_markdown() 은 원문을 바이트 단위로 복원한다.
+수정기가 노드의 줄 내용을 바꿔 종류가 달라질 수 있으면(예: '[**굵게**]' → '**굵게**'
+소제목) retype() 으로 그 노드만 다시 분류한다. 검수 엔진은 줄 스트림 규칙이라
+lines 로 평탄화해 한 번 훑고 결과 줄 목록을 넣는다 (노드는 다시 읽을 때만 나눈다).
+
+HTML 은 md_render 의 블록 문법(리스트 · 코드 · 수평선 포함)으로 렌더링하므로 to_html() 은
+render_markdown(to_markdown()) 과 같다. 노드 종류는 수정기가 보는 구분이라 코드 펜스 ·
+리스트는 단락으로 둔다 (수정기들이 원래 코드 블록을 따로 다루지 않는다).
+
+Usage:
+    from md_doc import Document
+    doc = Document.parse(markdown)
+    for node in doc.nodes:                        # 수정기는 노드를 직접 고친다
+        if node.kind == "heading" and node.level == 2: ...
+    md, html = doc.to_markdown(), doc.to_html()
+"""
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple, Optional
+
+from md_render import parse_blocks, render_blocks
+from text_patterns import RX
+
+_RUNS = ("blank", "para", "table")   # 연속된 줄을 노드 하나로 묶는 종류 (나머지는 1줄 1노드)
+_CLASSIFY_HEADS = frozenset("#![tT*")  # 이 글자로 시작하는 ASCII 줄만 classify 로 판정
+
+
+class Node(NamedTuple):
+    """
+    블록 노드. kind: heading · para · table · image · link · tags · blank.
+    lines 는 원문 줄 (빈 줄 · 단락 · 테이블은 연속 줄, 나머지는 1줄) — 제자리에서 고친다.
+    level 은 heading 만 — 1~4 는 '#' 개수, 0 은 이모지 · 굵은 글씨 소제목.
+    종류가 바뀌면 노드를 새로 만든다 (Document.retype).
+    """
+    kind:  str
+    lines: list[str]
+    level: int = 0
+
+
+def classify(stripped: str) -> tuple[str, int]:
+    """strip 된 줄 1개의 노드 종류와 헤딩 레벨."""
+    if not stripped:
+        return "blank", 0
+    head = stripped[0]
+    if head == "|":
+        return "table", 0
+    if head == "#":
+        if RX.HEADING_H1_H4.match(stripped):
+            return "heading", len(stripped) - len(stripped.lstrip("#"))
+        return "para", 0
+    if head == "!" and stripped.startswith("!["):
+        return "image", 0
+    if head == "[" and RX.LINK_LINE.match(stripped):
+        return "link", 0
+    if head in "tT" and RX.TAGS_LINE.match(stripped):
+        return "tags", 0
+    # LLM 이 쓰는 소제목 — 이모지(U+2300 이후 문자) + 공백, 또는 줄 전체가 **굵게**
+    if ((ord(head) >= 0x2300 and len(stripped) >= 2 and stripped[1] == " ") or
+            (stripped.startswith("**") and stripped.endswith("**") and len(stripped) > 4)):
+        return "heading", 0
+    return "para", 0
+
+
+def parse_nodes(lines: list[str]) -> list[Node]:
+    """줄 목록 → 노드 목록 (단일 패스). 첫 글자로 갈리는 흔한 줄은 classify 를 거치지 않는다."""
+    nodes: list[Node] = []
+    last: Optional[Node] = None
+    last_kind = ""
+    for line in lines:
+        stripped = line.strip()
+        level = 0
+        if not stripped:
+            kind = "blank"
+        else:
+            head = stripped[0]
+            if head == "|":
+                kind = "table"
+            elif ord(head) >= 0x2300:      # 한글 · 이모지로 시작 — 이모지 소제목 판정만 남는다
+                kind = "heading" if stripped[1:2] == " " else "para"
+            elif head in _CLASSIFY_HEADS:
+                kind, level = classify(stripped)
+            else:
+                kind = "para"
+        if kind == last_kind and kind in _RUNS:
+            last.lines.append(line)                                       # type: ignore[union-attr]
+        else:
+            last, last_kind = Node(kind, [line], level), kind
+            nodes.append(last)
+    return nodes
+
+
+class Document:
+    """
+    블록 노드 목록. 수정기는 nodes 와 각 노드의 lines 를 제자리에서 고친다.
+    줄 목록으로 만들거나 넣은 문서는 nodes 를 처음 읽을 때 노드로 나눈다
+    (노드를 보지 않는 검수 · 직렬화만 거치면 분류 비용이 없다).
+    """
+
+    __slots__ = ("_nodes", "_lines")
+
+    def __init__(self, nodes: list[Node]):
+        self._nodes: Optional[list[Node]] = nodes
+        self._lines: Optional[list[str]]  = None
+
+    @classmethod
+    def parse(cls, text: str) -> "Document":
+        doc = cls.__new__(cls)
+        doc._nodes, doc._lines = None, text.split("\n")
+        return doc
+
+    @property
+    def nodes(self) -> list[Node]:
+        if self._nodes is None:
+            self._nodes, self._lines = parse_nodes(self._lines), None   # type: ignore[arg-type]
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: list[Node]) -> None:
+        self._nodes, self._lines = nodes, None
+
+    # ── 줄 뷰 ─────────────────────────────────────────────────
+
+    @property
+    def lines(self) -> list[str]:
+        """노드 줄을 이어 붙인 목록 — 읽기 전용으로 쓰고, 바꾸려면 새 목록을 대입한다."""
+        if self._nodes is None:
+            return self._lines                                            # type: ignore[return-value]
+        return [line for node in self._nodes for line in node.lines]
+
+    @lines.setter
+    def lines(self, lines: list[str]) -> None:
+        self._nodes, self._lines = None, lines
+
+    def retype(self, indices: Iterable[int]) -> None:
+        """줄 내용이 바뀐 노드만 다시 분류 (나뉘거나 비면 그 자리에서 교체 · 삭제)."""
+        nodes = self.nodes
+        for i in sorted(set(indices), reverse=True):
+            nodes[i:i + 1] = parse_nodes(nodes[i].lines)
+
+    def next_content(self, ni: int, k: int) -> Optional[tuple[int, int]]:
+        """nodes[ni].lines[k] 다음의 첫 내용 줄 위치 (노드, 줄) — 없으면 None."""
+        nodes = self.nodes
+        for j in range(ni, len(nodes)):
+            lines = nodes[j].lines
+            for kk in range(k + 1 if j == ni else 0, len(lines)):
+                if lines[kk].strip():
+                    return j, kk
+        return None
+
+    def cut_after(self, ni: int, k: int, nj: int, kj: int) -> None:
+        """(ni, k) 줄 바로 다음부터 (nj, kj) 줄까지 제거 — 사이에서 빈 노드는 지운다."""
+        nodes = self.nodes
+        if nj == ni:
+            del nodes[ni].lines[k + 1:kj + 1]
+            return
+        del nodes[ni].lines[k + 1:]
+        del nodes[nj].lines[:kj + 1]
+        end = nj + 1 if not nodes[nj].lines else nj
+        del nodes[ni + 1:end]
+
+    # ── 직렬화 ────────────────────────────────────────────────
+
+    def to_markdown(self) -> str:
+        return "\n".join(self.lines)
+
+    def to_html(self) -> str:
+        """prose-blog HTML — render_markdown(self.to_markdown()) 과 동일."""
+        view = _stripped(self.lines)
+        return render_blocks(view, parse_blocks(view))
+
+    # ── 공백 정리 (str.strip 과 동일) ─────────────────────────
+
+    def strip(self) -> None:
+        if self._nodes is None:
+            self._lines = _stripped(self._lines)                          # type: ignore[arg-type]
+            return
+        nodes = self._nodes
+        lo, hi = 0, len(nodes)
+        while lo < hi and nodes[lo].kind == "blank":
+            lo += 1
+        while hi > lo and nodes[hi - 1].kind == "blank":
+            hi -= 1
+        if lo == hi:
+            self.nodes = [Node("blank", [""])]
+            return
+        nodes = nodes[lo:hi]
+        nodes[0].lines[0]   = nodes[0].lines[0].lstrip()
+        nodes[-1].lines[-1] = nodes[-1].lines[-1].rstrip()
+        self.nodes = nodes
+
+
+def _stripped(lines: list[str]) -> list[str]:
+    """strip() 한 문서의 줄 목록 — 앞뒤 빈 줄 제외, 첫 줄 lstrip · 끝 줄 rstrip."""
+    lo, hi = 0, len(lines)
+    while lo < hi and not lines[lo].strip():
+        lo += 1
+    while hi > lo and not lines[hi - 1].strip():
+        hi -= 1
+    if lo == hi:
+        return [""]
+    view = lines[lo:hi]
+    view[0]  = view[0].lstrip()
+    view[-1] = view[-1].rstrip()
+    return view
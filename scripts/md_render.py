@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+마크다운 → prose-blog HTML 단일 패스 렌더러
+
+blog_generator.md_to_html 의 regex 캐스케이드(문서 전체 re.sub 15회 내외)를 대체한다.
+줄 단위로 한 번만 훑으며 블록(코드·테이블·헤딩·수평선·리스트·단락)을 판별하고,
+인라인 요소(`code`, ***, **, *)는 블록 텍스트에 한 번씩만 적용한다 — O(문서 길이).
+
+지원 범위는 기존 함수와 동일한 마크다운 부분집합이며 출력 마크업(prose-blog 태그,
+_md_table_to_html 테이블 클래스)도 동일하다. 차이점:
+  - 리스트: 연속된 항목만 하나의 <ul>/<ol> 로 묶음
+    (기존: 문서의 첫 <li> ~ 마지막 <li> 전체를 <ul> 하나로 감쌈)
+  - 번호 리스트(1. 항목) → <ol>
+  - 코드 블록 내부는 인라인 변환하지 않음
+  - 헤딩 바로 아래 붙은 텍스트도 <p> 로 감쌈
+
+블록 판별(parse_blocks)과 HTML 출력(render_blocks)은 분리되어 있어
+md_doc.Document.to_html 이 같은 블록 문법으로 노드 문서를 렌더링한다.
+
+Usage:
+    from md_render import render_markdown
+    html = render_markdown(md)
+"""
+from __future__ import annotations
+
+import re
+from typing import Callable, NamedTuple, Optional
+
+_FENCE_RE   = re.compile(r"^```(\w*)")
+_TABLE_ROW  = re.compile(r"^[ \t]*\|.+\|[ \t]*$")
+_TABLE_SEP  = re.compile(r"^[\s|:-]+$")
+_HEADING_RE = re.compile(r"^(#{1,4}) (.+)$")
+_HR_RE      = re.compile(r"^(?:---+|\*\*\*+)$")
+_UL_RE      = re.compile(r"^[ \t]*[-*] (.+)$")
+_OL_RE      = re.compile(r"^[ \t]*\d+[.)] (.+)$")
+_INLINE_RE  = re.compile(
+    r"`([^`]+)`"
+    r"|\*\*\*(.+?)\*\*\*"
+    r"|\*\*(.+?)\*\*"
+    r"|\*(.+?)\*"
+)
+
+
+def _inline(text: str) -> str:
+    """인라인 요소 변환 — 코드 스팬은 그대로, 강조 내부는 재귀 적용."""
+    def repl(m: re.Match) -> str:
+        code, bold_em, bold, em = m.groups()
+        if code is not None:
+            return f"<code>{code}</code>"
+        if bold_em is not None:
+            return f"<strong><em>{_inline(bold_em)}</em></strong>"
+        if bold is not None:
+            return f"<strong>{_inline(bold)}</strong>"
+        return f"<em>{_inline(em)}</em>"
+    if "`" not in text and "*" not in text:
+        return text
+    return _INLINE_RE.sub(repl, text)
+
+
+def md_table_to_html(block: str, inline: Optional[Callable[[str], str]] = None) -> str:
+    """마크다운 테이블 블록 → HTML <table> 변환 (inline 지정 시 셀 내용에 적용)"""
+    lines = [l.strip() for l in block.strip().split("\n") if l.strip()]
+    if len(lines) < 2:
+        return block
+
+    def parse_row(line: str) -> list[str]:
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        return [inline(c) for c in cells] if inline else cells
+
+    # 두 번째 줄이 구분선(---|---)인지 확인
+    if not _TABLE_SEP.match(lines[1]):
+        return block
+
+    header_cells = parse_row(lines[0])
+    rows = [parse_row(l) for l in lines[2:] if not _TABLE_SEP.match(l)]
+
+    parts = ['<div class="overflow-x-auto mb-6"><table class="w-full text-sm border-collapse">\n<thead><tr>']
+    for cell in header_cells:
+        parts.append(f'<th class="border border-zinc-700 bg-zinc-800/50 px-3 py-2 text-left text-xs font-semibold text-zinc-200">{cell}</th>')
+    parts.append('</tr></thead>\n<tbody>')
+    for row in rows:
+        parts.append('<tr>')
+        for cell in row:
+            parts.append(f'<td class="border border-zinc-800 px-3 py-2 text-zinc-300">{cell}</td>')
+        parts.append('</tr>\n')
+    parts.append('</tbody></table></div>')
+    return "".join(parts)
+
+
+class Block(NamedTuple):
+    """블록 1개 — lines[start:end] 범위와 종류 (heading/para/table/code/hr/ul/ol)."""
+    kind:  str
+    start: int
+    end:   int
+    info:  str = ""   # heading: 레벨 숫자, code: 언어
+
+
+def parse_blocks(lines: list[str]) -> list[Block]:
+    """
+    줄 목록 → 블록 목록 (단일 패스). 빈 줄은 블록에 속하지 않는다
+    (리스트 항목 사이 빈 줄 1개는 리스트 블록 범위에 포함).
+    """
+    n = len(lines)
+    blocks: list[Block] = []
+    para_start = -1
+
+    def flush_para(end: int) -> None:
+        nonlocal para_start
+        if para_start >= 0:
+            blocks.append(Block("para", para_start, end))
+            para_start = -1
+
+    i = 0
+    while i < n:
+        line = lines[i]
+
+        # 빈 줄 — 단락 경계
+        if not line.strip():
+            flush_para(i)
+            i += 1
+            continue
+
+        # 코드 블록
+        fence = _FENCE_RE.match(line)
+        if fence:
+            flush_para(i)
+            j = i + 1
+            while j < n and not lines[j].startswith("```"):
+                j += 1
+            if j < n:
+                blocks.append(Block("code", i, j + 1, fence.group(1)))
+                i = j + 1
+                continue
+            # 닫히지 않은 펜스는 일반 텍스트로 처리 (새 단락 시작)
+
+        # 테이블 (헤더 + 구분선 필수)
+        elif _TABLE_ROW.match(line):
+            j = i
+            while j < n and _TABLE_ROW.match(lines[j]):
+                j += 1
+            if j - i >= 2 and _TABLE_SEP.match(lines[i + 1].strip()):
+                flush_para(i)
+                blocks.append(Block("table", i, j))
+                i = j
+                continue
+
+        else:
+            # 헤딩
+            heading = _HEADING_RE.match(line)
+            if heading:
+                flush_para(i)
+                blocks.append(Block("heading", i, i + 1, str(len(heading.group(1)))))
+                i += 1
+                continue
+
+            # 수평선
+            if _HR_RE.match(line):
+                flush_para(i)
+                blocks.append(Block("hr", i, i + 1))
+                i += 1
+                continue
+
+            # 리스트 — 같은 종류의 연속 항목(빈 줄 1개 허용)을 하나로 묶음
+            item_re = _UL_RE if _UL_RE.match(line) else _OL_RE if _OL_RE.match(line) else None
+            if item_re is not None:
+                flush_para(i)
+                j = i
+                while j < n:
+                    if item_re.match(lines[j]):
+                        j += 1
+                    elif not lines[j].strip() and j + 1 < n and item_re.match(lines[j + 1]):
+                        j += 1
+                    else:
+                        break
+                blocks.append(Block("ul" if item_re is _UL_RE else "ol", i, j))
+                i = j
+                continue
+
+        if para_start < 0:
+            para_start = i
+        i += 1
+
+    flush_para(n)
+    return blocks
+
+
+def render_blocks(lines: list[str], blocks: list[Block]) -> str:
+    """parse_blocks 결과 → HTML (블록마다 한 번씩만 인라인 변환)"""
+    out: list[str] = []
+    for b in blocks:
+        kind = b.kind
+        if kind == "para":
+            out.append(f"<p>{'<br>'.join(_inline(l.strip()) for l in lines[b.start:b.end])}</p>")
+        elif kind == "heading":
+            m = _HEADING_RE.match(lines[b.start])
+            out.append(f"<h{b.info}>{_inline(m.group(2))}</h{b.info}>")   # type: ignore[union-attr]
+        elif kind == "table":
+            out.append(md_table_to_html("\n".join(lines[b.start:b.end]), inline=_inline))
+        elif kind == "code":
+            code = "\n".join(lines[b.start + 1:b.end - 1]).rstrip()
+            out.append(f'<pre><code class="language-{b.info}">{code}</code></pre>')
+        elif kind == "hr":
+            out.append("<hr>")
+        else:
+            item_re = _UL_RE if kind == "ul" else _OL_RE
+            items = []
+            for l in lines[b.start:b.end]:
+                m = item_re.match(l)
+                if m:
+                    items.append(f"<li>{_inline(m.group(1))}</li>")
+            out.append(f"<{kind}>{''.join(items)}</{kind}>")
+    return "\n".join(out)
+
+
+def render_markdown(md: str) -> str:
+    """마크다운 → prose-blog 클래스 호환 HTML (단일 패스)"""
+    lines = md.strip().split("\n")
+    return render_blocks(lines, parse_blocks(lines))
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Ollama 모델 레지스트리 — 태그 목록 캐시 + 모델별 실측 처리량 기록 + 정책 기반 모델 선택
+
+디스크(.model_registry.json)에 다음을 보관한다.
+  - tags   : 백엔드별 /api/tags 결과 (TTL 내에서는 재조회 없이 재사용)
+  - models : 모델별 실측 지표 (tokens/sec, 로드 시간 — 지수이동평균)
+
+지표는 /api/chat 응답의 eval_count · eval_duration · load_duration 으로 매 호출 메모리에서
+갱신되고, 디스크에는 save() 때만 쓴다 (blog_generator 는 단계 종료 · 프로세스 종료 시).
+저장은 파일 잠금(.model_registry.json.lock) 안에서 디스크 내용과 병합한 뒤 교체하므로
+job runner 와 cron 실행이 겹쳐도 서로의 지표를 덮어쓰지 않는다.
+blog_generator.py --benchmark-models 로 고정 프롬프트를 돌려 일괄 측정할 수 있다.
+
+모델 선택 정책 (select):
+  quality  : MODEL_PRIORITY 순서 그대로 (기존 동작)
+  balanced : 품질 순위와 실측 속도를 절반씩 반영
+  speed    : 실측 tokens/sec 최상위 (미측정 모델은 중간값 취급)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:          # 잠금 미지원 플랫폼 — 프로세스 내 직렬화만 보장
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+MODEL_POLICIES = {"quality": 0.0, "balanced": 0.5, "speed": 1.0}  # 정책 → 속도 가중치
+EMA_ALPHA      = 0.3   # 실측 지표 지수이동평균 가중치 (최근 값 비중)
+
+
+def _match_priority(name: str, priority: list[str]) -> Optional[int]:
+    """모델명이 MODEL_PRIORITY 의 몇 번째 항목과 일치하는지 (이름 또는 '이름:태그')."""
+    low = name.lower()
+    for rank, preferred in enumerate(priority):
+        p = preferred.lower()
+        if low == p or low.startswith(p + ":"):
+            return rank
+    return None
+
+
+class ModelRegistry:
+    """디스크 기반 모델 레지스트리. 스레드 안전."""
+
+    def __init__(self, path: Path):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()      # 저장끼리 직렬화 (파일 쓰기 중 _lock 은 놓는다)
+        self._dirty = False
+        self.data: dict = {"tags": {}, "models": {}}
+        loaded = self._read_disk()
+        self.data["tags"]   = loaded["tags"]
+        self.data["models"] = loaded["models"]
+        self._pending_runs: dict[str, int] = {}  # 아직 디스크에 반영 안 된 이 프로세스의 runs
+
+    def _read_disk(self) -> dict:
+        try:
+            loaded = json.loads(self.path.read_text("utf-8"))
+            if isinstance(loaded, dict):
+                return {"tags": loaded.get("tags") or {}, "models": loaded.get("models") or {}}
+        except Exception:
+            pass
+        return {"tags": {}, "models": {}}
+
+    @contextmanager
+    def _file_lock(self):
+        """다른 프로세스의 save() 와 겹치지 않도록 옆 잠금 파일에 배타 잠금."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _merge_disk(self, disk: dict) -> None:
+        """
+        디스크 내용을 메모리에 병합 (_lock 보유 상태에서 호출).
+          models : runs 는 디스크 값 + 이 프로세스가 아직 저장하지 않은 만큼,
+                   지표(tokens_per_sec · load_sec)는 updated_at 이 더 최근인 쪽
+          tags   : 백엔드별로 probed_at 이 더 최근인 쪽
+        """
+        models = self.data["models"]
+        for name, d in disk["models"].items():
+            m = models.get(name)
+            if m is None:
+                models[name] = dict(d)
+                continue
+            newer = m if m.get("updated_at", 0) >= d.get("updated_at", 0) else d
+            models[name] = {**newer, "runs": d.get("runs", 0) + self._pending_runs.get(name, 0)}
+        tags = self.data["tags"]
+        for url, d in disk["tags"].items():
+            if float(d.get("probed_at", 0)) > float(tags.get(url, {}).get("probed_at", 0)):
+                tags[url] = d
+
+    def save(self) -> None:
+        """
+        바뀐 내용이 있을 때만 고유 임시 파일에 쓴 뒤 교체 (중간에 중단돼도 기존 파일 유지).
+        여러 스레드가 동시에 불러도 한 번에 하나씩 쓰고, 다른 프로세스와는 파일 잠금 안에서
+        디스크 내용을 먼저 병합하므로 서로의 지표를 잃지 않는다.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+            try:
+                with self._file_lock():
+                    disk = self._read_disk()
+                    with self._lock:
+                        self._merge_disk(disk)
+                        payload = json.dumps(self.data, ensure_ascii=False, indent=2)
+                        written = dict(self._pending_runs)
+                        self._dirty = False
+                    fd, tmp = tempfile.mkstemp(prefix=f"{self.path.name}.", suffix=".tmp",
+                                               dir=self.path.parent)
+                    try:
+                        with os.fdopen(fd, "w", encoding="utf-8") as f:
+                            f.write(payload)
+                        os.replace(tmp, self.path)
+                    except Exception:
+                        try:
+                            os.unlink(tmp)
+                        except OSError:
+                            pass
+                        raise
+                    with self._lock:
+                        for name, n in written.items():
+                            left = self._pending_runs.get(name, 0) - n
+                            if left > 0:
+                                self._pending_runs[name] = left
+                            else:
+                                self._pending_runs.pop(name, None)
+            except Exception as e:
+                log.warning("[ModelRegistry] 저장 실패: %s", e)
+                with self._lock:
+                    self._dirty = True
+
+    # ── 태그 캐시 ─────────────────────────────────────────────
+
+    def cached_tags(self, max_age: float) -> dict[str, dict]:
+        """max_age 초 이내에 조회된 백엔드별 태그 목록 — {url: {models, probed_at}}."""
+        now = time.time()
+        return {
+            url: entry for url, entry in self.data["tags"].items()
+            if now - float(entry.get("probed_at", 0)) < max_age
+        }
+
+    def set_tags(self, snapshot: dict[str, dict]) -> None:
+        with self._lock:
+            self.data["tags"] = snapshot
+            self._dirty = True
+
+    # ── 실측 지표 ─────────────────────────────────────────────
+
+    def record(self, model: str, response: dict) -> None:
+        """/api/chat 응답의 타이밍 필드로 모델 지표 갱신 (필드 없으면 무시)."""
+        eval_count = response.get("eval_count") or 0
+        eval_ns    = response.get("eval_duration") or 0
+        if not eval_count or not eval_ns:
+            return
+        tps     = eval_count / (eval_ns / 1e9)
+        load_s  = (response.get("load_duration") or 0) / 1e9
+        with self._lock:
+            m = self.data["models"].setdefault(model, {"runs": 0})
+            if m["runs"]:
+                m["tokens_per_sec"] = round((1 - EMA_ALPHA) * m["tokens_per_sec"] + EMA_ALPHA * tps, 2)
+                m["load_sec"]       = round((1 - EMA_ALPHA) * m["load_sec"] + EMA_ALPHA * load_s, 2)
+            else:
+                m["tokens_per_sec"] = round(tps, 2)
+                m["load_sec"]       = round(load_s, 2)
+            m["runs"]      += 1
+            m["updated_at"] = time.time()
+            self._pending_runs[model] = self._pending_runs.get(model, 0) + 1
+            self._dirty = True
+
+    def stats(self, model: str) -> dict:
+        return dict(self.data["models"].get(model, {}))
+
+    # ── 모델 선택 ─────────────────────────────────────────────
+
+    def select(self, available: list[str], priority: list[str],
+               policy: str = "quality", fallback: str = "") -> str:
+        """
+        정책에 따라 모델 선택.
+
+        quality 는 기존 select_best_model 과 동일한 결과
+        (우선순위 일치 → fallback → 첫 번째 모델).
+        """
+        if not available:
+            return fallback
+        weight = MODEL_POLICIES.get(policy, 0.0)
+
+        if weight == 0.0:
+            for preferred in priority:
+                for name in available:
+                    if _match_priority(name, [preferred]) is not None:
+                        return name
+            return fallback if fallback in available else available[0]
+
+        measured = {n: self.data["models"].get(n, {}).get("tokens_per_sec") for n in available}
+        max_tps  = max((v for v in measured.values() if v), default=0.0)
+
+        def _score(name: str) -> float:
+            rank    = _match_priority(name, priority)
+            quality = 1.0 - rank / len(priority) if rank is not None and priority else 0.0
+            tps     = measured.get(name)
+            speed   = tps / max_tps if tps and max_tps else 0.5
+            return (1 - weight) * quality + weight * speed
+
+        return max(available, key=_score)
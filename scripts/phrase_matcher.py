@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+다중 문구 매처 (Aho-Corasick) — 금지 표현 · 카테고리 키워드 · 제외 키워드 공용
+
+문구 목록으로 오토마톤을 한 번 만들어 두고, 텍스트를 한 번 훑어 모든 일치
+(위치 · 문구 · 카테고리, 겹치는 일치 포함)를 찾는다. 문구가 수천 개로 늘어도
+검사 시간은 텍스트 길이에만 비례한다.
+
+루트 상태에서는 문구 첫 글자 집합 정규식으로 다음 후보 위치까지 건너뛰므로
+일치가 드문 일반 본문에서는 C 수준 속도로 진행한다.
+
+Usage:
+    from phrase_matcher import PhraseMatcher
+    matcher = PhraseMatcher({"광고성 과장": ["최저가", "강추"], ...})
+    for hit in matcher.iter_hits(text):
+        print(hit.start, hit.end, hit.phrase, hit.category)
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+
+
+class Hit(NamedTuple):
+    start:    int
+    end:      int
+    phrase:   str
+    category: str
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick 오토마톤.
+
+    groups 는 {카테고리: [문구, ...]} 또는 문구 리스트(카테고리 "").
+    같은 문구가 여러 카테고리에 있으면 카테고리마다 Hit 를 돌려준다.
+    ignore_case=True 면 문구와 검사 텍스트를 모두 소문자로 비교한다.
+    contained=True 면 역방향('텍스트가 어떤 문구의 부분 문자열인가') 조회용으로
+    문구의 모든 부분 문자열 → 카테고리 순위 색인도 만든다 (짧은 키워드 목록 전용).
+    """
+
+    def __init__(self, groups: Union[Mapping[str, Iterable[str]], Iterable[str]],
+                 ignore_case: bool = False, contained: bool = False):
+        if not isinstance(groups, Mapping):
+            groups = {"": groups}
+        self.ignore_case = ignore_case
+        # 정의 순서 유지 — (카테고리, [문구, ...])
+        self.groups: list[tuple[str, list[str]]] = [
+            (cat, [p for p in phrases if p]) for cat, phrases in groups.items()
+        ]
+        self._rank = {cat: i for i, (cat, _) in enumerate(self.groups)}
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._out:  list[list[tuple[str, str]]] = [[]]   # (원문 문구, 카테고리)
+        for cat, phrases in self.groups:
+            for phrase in phrases:
+                self._add(phrase, cat)
+        self._build_fail()
+        first = sorted(self._goto[0])
+        self._start_re = re.compile("[" + "".join(re.escape(c) for c in first) + "]") if first else None
+
+        self._contained: Optional[dict[str, int]] = None
+        if contained:
+            self._contained = {}
+            for rank, (_, phrases) in enumerate(self.groups):
+                for phrase in phrases:
+                    key = phrase.lower() if ignore_case else phrase
+                    self._contained.setdefault("", rank)
+                    for i in range(len(key)):
+                        for j in range(i + 1, len(key) + 1):
+                            self._contained.setdefault(key[i:j], rank)
+
+    def _add(self, phrase: str, category: str) -> None:
+        node = 0
+        for ch in (phrase.lower() if self.ignore_case else phrase):
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._out.append([])
+            node = nxt
+        if (phrase, category) not in self._out[node]:
+            self._out[node].append((phrase, category))
+
+    def _build_fail(self) -> None:
+        """BFS 로 실패 링크 구성 + 출력 목록을 실패 링크 방향으로 병합."""
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    # ── 검색 ──────────────────────────────────────────────────
+
+    def iter_hits(self, text: str) -> Iterator[Hit]:
+        """모든 일치 (겹침 포함) — 끝 위치 오름차순."""
+        if self._start_re is None:
+            return
+        if self.ignore_case:
+            text = text.lower()
+        goto, fail, out, start_re = self._goto, self._fail, self._out, self._start_re
+        node, i, n = 0, 0, len(text)
+        while i < n:
+            if node == 0:
+                m = start_re.search(text, i)
+                if m is None:
+                    return
+                i = m.start()
+            ch = text[i]
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            i += 1
+            for phrase, cat in out[node]:
+                yield Hit(i - len(phrase), i, phrase, cat)
+
+    def find_all(self, text: str) -> list[Hit]:
+        return list(self.iter_hits(text))
+
+    def search(self, text: str) -> bool:
+        """문구가 하나라도 포함되어 있는지."""
+        return next(self.iter_hits(text), None) is not None
+
+    def first_category(self, text: str) -> Optional[str]:
+        """
+        텍스트에 포함된 문구(contained=True 면 텍스트를 포함하는 문구도)의
+        카테고리 중 정의 순서가 가장 앞선 것. 없으면 None.
+        """
+        best = None
+        if self._contained is not None:
+            best = self._contained.get(text.lower() if self.ignore_case else text)
+        for hit in self.iter_hits(text):
+            rank = self._rank[hit.category]
+            if best is None or rank < best:
+                best = rank
+            if best == 0:
+                break
+        return None if best is None else self.groups[best][0]
+
+    def group(self, hits: Iterable[Hit]) -> dict[str, list[str]]:
+        """Hit 목록 → {카테고리: [발견 문구, ...]} (모든 카테고리 포함, 문구는 정의 순서)."""
+        found = {(h.category, h.phrase) for h in hits}
+        return {cat: [p for p in phrases if (cat, p) in found] for cat, phrases in self.groups}
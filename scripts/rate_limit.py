@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+호스트별 적응형 호출 속도 제한기 — 토큰 버킷 + Retry-After + AIMD
+
+외부 API 연동마다 고정 sleep(Steam 1.5초, TMDB 0.3초, 쿠팡 1.5초, Google Trends 2~3초)을
+두던 것을 호스트 단위 리미터 하나로 모은다. 같은 호스트를 부르는 모듈 · 스레드는
+같은 버킷을 공유한다 (job_runner 로 한 프로세스에서 돌 때 쿠팡 호출 한도 공유 등).
+
+  - 토큰 버킷: rate(초당 호출) 로 채워지고 burst 만큼 쌓인다. acquire() 는 토큰이
+    없으면 다음 토큰 시각까지 기다린다 (동시 호출은 순서대로 예약)
+  - AIMD: 성공 응답마다 rate 를 조금씩 올려(가산 증가) max_rate 까지 탐색하고,
+    429 를 받으면 절반으로 줄인다(곱셈 감소, min_rate 하한)
+  - Retry-After: 429/503 응답의 대기 시간 동안 해당 호스트 호출 전체를 멈춘다
+  - 동기 acquire() · send() 와 비동기 acquire_async() · send_async() 제공
+
+Usage:
+    from rate_limit import get_limiter
+    limiter = get_limiter("https://store.steampowered.com")
+    resp = limiter.send(lambda: requests.get(url, timeout=30))   # 대기 + 429 재시도 + 속도 조정
+
+    limiter.acquire()            # 직접 제어 — 호출 전 대기
+    ...                          # 호출
+    limiter.success() / limiter.throttled(retry_after=30)
+
+    await limiter.acquire_async()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LimitConfig:
+    rate:     float          # 시작 속도 (초당 호출)
+    min_rate: float          # 429 연속 시 하한
+    max_rate: float          # 성공 시 상한 (API 공개 한도)
+    burst:    float = 1.0    # 쉬고 있을 때 연달아 보낼 수 있는 호출 수
+    step:     float = 0.0    # 성공 1회당 가산 증가량 (0 이면 시작 속도의 10%)
+
+
+# 호스트별 설정 — 시작 속도는 기존 고정 sleep 과 같게, 상한은 공개 한도 기준
+LIMITS: dict[str, LimitConfig] = {
+    # Steam Store appdetails: 비공식 한도 약 200회/5분 — 시작부터 한도 속도
+    "store.steampowered.com":   LimitConfig(rate=200 / 300, min_rate=0.1, max_rate=200 / 300),
+    # TMDB: 약 40~50회/초
+    "api.themoviedb.org":       LimitConfig(rate=1 / 0.3, min_rate=1.0, max_rate=40.0, burst=5),
+    # 쿠팡 파트너스 Open API — 한도 비공개, 429 기준으로 탐색
+    "api-gateway.coupang.com":  LimitConfig(rate=1 / 1.5, min_rate=0.1, max_rate=2.0),
+    # Google Trends (RSS · pytrends 공용) — 한도 비공개, 429 에 민감
+    "trends.google.com":        LimitConfig(rate=0.5, min_rate=0.05, max_rate=1.0),
+}
+DEFAULT_LIMIT = LimitConfig(rate=2.0, min_rate=0.2, max_rate=10.0)
+
+MAX_RETRY_AFTER   = 120.0   # Retry-After 상한 (초)
+DECREASE_FACTOR   = 0.5     # 429 시 속도 배율
+DECREASE_COOLDOWN = 1.0     # 동시에 도착한 429 여러 건을 한 번의 감소로 취급 (초)
+
+
+def retry_after_seconds(resp: Any) -> Optional[float]:
+    """응답의 Retry-After 헤더 (초 단위만 지원) — 없거나 형식이 다르면 None."""
+    value = (getattr(resp, "headers", None) or {}).get("Retry-After", "")
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """호스트 1개의 토큰 버킷. 스레드 안전."""
+
+    def __init__(self, name: str, config: LimitConfig = DEFAULT_LIMIT):
+        self.name    = name
+        self.config  = config
+        self.rate    = config.rate
+        self.step    = config.step or config.rate * 0.1
+        self._tokens = config.burst
+        self._last   = time.monotonic()   # 토큰 충전 기준 시각 (Retry-After 대기 중이면 미래)
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        # 지표
+        self.calls      = 0
+        self.throttles  = 0
+        self.waited_s   = 0.0
+
+    # ── 대기 ──────────────────────────────────────────────────
+
+    def _reserve(self) -> float:
+        """토큰 1개 예약 후 기다려야 할 시간(초). 토큰이 음수면 앞선 예약이 밀려 있는 것."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._last:
+                self._tokens = min(self.config.burst, self._tokens + (now - self._last) * self.rate)
+                self._last   = now
+            self._tokens -= 1
+            wait = (self._last - now) + max(-self._tokens, 0.0) / self.rate
+            self.calls    += 1
+            self.waited_s += wait
+            return wait
+
+    def acquire(self) -> float:
+        """호출 1회 허가를 받을 때까지 대기. 대기한 시간(초) 반환."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    # ── 응답 반영 (AIMD) ──────────────────────────────────────
+
+    def success(self) -> None:
+        """정상 응답 — 속도 가산 증가."""
+        with self._lock:
+            self.rate = min(self.config.max_rate, self.rate + self.step)
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """429 등 속도 초과 응답 — 속도 절반 + Retry-After 동안 호스트 전체 대기."""
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                self.rate = max(self.config.min_rate, self.rate * DECREASE_FACTOR)
+                self._last_decrease = now
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            # 대기 동안은 충전하지 않고, 끝난 뒤엔 1건만 바로 보낼 수 있게 (몰아 보내기 방지)
+            self._tokens = min(self._tokens, 1.0)
+            self._last   = max(self._last, now + pause)
+        log.warning("[RateLimit] %s 속도 초과 — %.1fs 대기, 속도 %.2f/s",
+                    self.name, pause, self.rate)
+
+    def observe(self, resp: Any) -> bool:
+        """HTTP 응답으로 속도 조정. 속도 초과(429, 또는 Retry-After 가 붙은 503)면 True."""
+        status = getattr(resp, "status_code", 0)
+        retry_after = retry_after_seconds(resp)
+        if status == 429 or (status == 503 and retry_after is not None):
+            self.throttled(retry_after)
+            return True
+        if status < 500:
+            self.success()
+        return False
+
+    # ── 호출 래퍼 ─────────────────────────────────────────────
+
+    def send(self, do_request: Callable[[], Any], retries: int = 3) -> Any:
+        """
+        대기 → do_request() → 응답 반영. 속도 초과 응답이면 (Retry-After 만큼 기다린 뒤)
+        최대 retries 회 다시 보낸다. 마지막 응답을 반환 (상태 코드 처리는 호출 측).
+        do_request 는 매번 새로 요청을 만든다 (서명 · 타임스탬프 갱신이 필요한 API 대응).
+        """
+        for attempt in range(retries + 1):
+            self.acquire()
+            resp = do_request()
+            if not self.observe(resp) or attempt == retries:
+                return resp
+        return resp
+
+    async def send_async(self, do_request: Callable[[], Awaitable[Any]], retries: int = 3) -> Any:
+        for attempt in range(retries + 1):
+            await self.acquire_async()
+            resp = await do_request()
+            if not self.observe(resp) or attempt == retries:
+                return resp
+        return resp
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "throttles": self.throttles,
+                    "waited_s": round(self.waited_s, 2), "rate": round(self.rate, 3)}
+
+
+# ── 프로세스 공용 레지스트리 ──────────────────────────────────────────────────
+
+_LIMITERS: dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(url_or_host: str) -> RateLimiter:
+    """호스트별 공용 리미터 (URL 을 넘겨도 호스트만 사용). 처음 요청 시 LIMITS 설정으로 생성."""
+    host = urlsplit(url_or_host).hostname if "//" in url_or_host else url_or_host
+    host = (host or url_or_host).lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = _LIMITERS[host] = RateLimiter(host, LIMITS.get(host, DEFAULT_LIMIT))
+        return limiter
+
+
+def log_stats() -> None:
+    """사용된 리미터별 호출 수 · 속도 초과 · 누적 대기 · 현재 속도."""
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    for limiter in limiters:
+        s = limiter.stats()
+        log.info("[RateLimit] %-26s %4d회 대기=%.1fs 429=%d 속도=%.2f/s",
+                 limiter.name, s["calls"], s["waited_s"], s["throttles"], s["rate"])
@@ -16,7 +16,6 @@ from __future__ import annotations
 import logging
 import os
 import sys
-import time
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -26,7 +25,8 @@ load_dotenv(Path(__file__).parent.parent / ".env.local")
 load_dotenv(Path(__file__).parent / ".env")
 
 from coupang_api import search_products, pick_best_product
-from supabase import create_client
+from rate_limit import log_stats as log_rate_limits
+from supabase_rest import SupabaseREST, get_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,28 +36,24 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 # ── Supabase / 쿠팡 설정 ──────────────────────────────────────────────────────
-SUPABASE_URL       = os.environ["NEXT_PUBLIC_SUPABASE_URL"]
-SUPABASE_KEY       = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
-COUPANG_ACCESS_KEY = os.environ["COUPANG_ACCESS_KEY"]
-COUPANG_SECRET_KEY = os.environ["COUPANG_SECRET_KEY"]
-
-# 쿠팡 API 호출 간격 (초) — Rate limit 회피
-API_CALL_DELAY = 1.5
-
-
-def fetch_products_to_refresh(supabase) -> list[dict]:
-    """search_keyword 가 있는 published 상품 목록 조회"""
-    resp = (
-        supabase.table("products")
-        .select("id, name, search_keyword, sale_price, original_price, discount_percent")
-        .eq("status", "published")
-        .not_.is_("search_keyword", "null")
-        .execute()
-    )
-    return resp.data or []
+# 누락 검사는 main() 에서 — import 만으로는 실패하지 않는다
+SUPABASE_URL       = os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
+SUPABASE_KEY       = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+COUPANG_ACCESS_KEY = os.getenv("COUPANG_ACCESS_KEY", "")
+COUPANG_SECRET_KEY = os.getenv("COUPANG_SECRET_KEY", "")
+
 
+def fetch_products_to_refresh(supabase: SupabaseREST) -> list[dict]:
+    """search_keyword 가 있는 published 상품 목록 조회 (페이지 단위 — 1000행 제한 없음)"""
+    return supabase.select("products", {
+        "select":         "id,name,search_keyword,sale_price,original_price,discount_percent",
+        "status":         "eq.published",
+        "search_keyword": "not.is.null",
+        "order":          "id.asc",   # offset 페이지 순서 고정
+    })
 
-def refresh_product_price(supabase, product: dict) -> bool:
+
+def refresh_product_price(supabase: SupabaseREST, product: dict) -> bool:
     """단일 상품의 가격을 쿠팡 API로 갱신. 성공 여부 반환."""
     keyword = product["search_keyword"]
     product_id = product["id"]
@@ -83,13 +79,13 @@ def refresh_product_price(supabase, product: dict) -> bool:
     old_price = product.get("sale_price") or product.get("original_price") or 0
     new_price  = best.product_price
 
-    supabase.table("products").update({
+    supabase.update("products", {
         "sale_price":       best.product_price,
         "original_price":   best.original_price,
         "discount_percent": best.discount_rate,
         "price_updated_at": "now()",
         "updated_at":       "now()",
-    }).eq("id", product_id).execute()
+    }, {"id": f"eq.{product_id}"})
 
     price_diff = new_price - old_price
     sign       = "+" if price_diff >= 0 else ""
@@ -101,7 +97,17 @@ def refresh_product_price(supabase, product: dict) -> bool:
 
 
 def main() -> None:
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    missing = [name for name, value in (
+        ("NEXT_PUBLIC_SUPABASE_URL", SUPABASE_URL),
+        ("SUPABASE_SERVICE_ROLE_KEY", SUPABASE_KEY),
+        ("COUPANG_ACCESS_KEY", COUPANG_ACCESS_KEY),
+        ("COUPANG_SECRET_KEY", COUPANG_SECRET_KEY),
+    ) if not value]
+    if missing:
+        log.error("필수 환경변수 누락: %s", ", ".join(missing))
+        sys.exit(1)
+
+    supabase = get_client(SUPABASE_URL, SUPABASE_KEY)   # keep-alive 세션을 전체 갱신에 재사용
 
     products = fetch_products_to_refresh(supabase)
     if not products:
@@ -111,10 +117,8 @@ def main() -> None:
     log.info("총 %d개 상품 가격 갱신 시작", len(products))
     success = 0
 
-    for i, product in enumerate(products):
-        if i > 0:
-            time.sleep(API_CALL_DELAY)  # Rate limit 방지
-
+    # 쿠팡 API 호출 간격은 search_products 의 호스트 공용 리미터(rate_limit)가 조절
+    for product in products:
         try:
             if refresh_product_price(supabase, product):
                 success += 1
@@ -122,6 +126,8 @@ def main() -> None:
             log.error("  오류 발생 [#%d %s]: %s", product["id"], product["name"], e)
 
     log.info("완료: %d/%d 상품 갱신됨", success, len(products))
+    supabase.log_stats()
+    log_rate_limits()
 
 
 if __name__ == "__main__":
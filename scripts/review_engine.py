@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+단일 패스 검수 엔진 — stage_review 의 자동 수정 + 지표 수집 + 경고 판정
+
+문서를 줄 단위로 한 번만 훑으면서
+  1) 줄 병합 규칙(join)    : 줄을 넘나드는 수정 (깨진 링크, 테이블 셀 개행, \\n 이스케이프)
+  2) 줄 수정 규칙(line)    : 줄 안에서 끝나는 수정 (LaTeX, 가격 콤마, 중복 H3 제거 …)
+  3) 지표 수집             : 헤딩·테이블·링크·강조·단락·금지 표현 등 (수정 후 줄 기준)
+을 동시에 처리하고, 마지막에 각 규칙의 finish() 가 지표만 보고 경고/통과를 판정한다.
+규칙을 추가해도 문서 재탐색은 늘지 않는다.
+
+규칙 세트는 Rule 서브클래스 리스트로 교체·확장할 수 있다 (규칙은 실행 상태를 가지므로
+검수 1회마다 새 인스턴스 사용).
+
+Usage:
+    from review_engine import ReviewEngine, default_rules
+    engine = ReviewEngine(default_rules(), PhraseMatcher(banned_expressions))
+    fixed, report, metrics = engine.run(content, products)
+    report, metrics = engine.run_doc(doc, products)        # Document 제자리 수정
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from md_doc import Document
+from phrase_matcher import PhraseMatcher
+from text_patterns import RX
+
+# LaTeX 명령어 → 유니코드
+#   A) $\rightarrow$ — 달러 기호 포함
+#   B) \rightarrow   — 백슬래시 그대로
+#   C) JSON 파싱 후 \r → CR, \t → TAB 으로 변환된 케이스 (예: CR + "ightarrow")
+#      LF 케이스(\neq → LF + "eq")는 줄을 넘나들므로 LatexRule.join 에서 처리
+LATEX_MAP: dict[str, str] = {
+    r'$\leftrightarrow$': '↔', r'$\rightarrow$': '→', r'$\leftarrow$': '←',
+    r'$\uparrow$': '↑',        r'$\downarrow$': '↓', r'$\Rightarrow$': '⇒',
+    r'$\Leftarrow$': '⇐',      r'$\leq$': '≤',        r'$\geq$': '≥',
+    r'$\neq$': '≠',             r'$\approx$': '≈',     r'$\times$': '×',
+    r'\rightarrow':  '→',  r'\leftarrow':  '←',  r'\leftrightarrow': '↔',
+    r'\Rightarrow':  '⇒',  r'\Leftarrow':  '⇐',
+    r'\uparrow':     '↑',  r'\downarrow':  '↓',
+    r'\leq':         '≤',  r'\geq':        '≥',
+    r'\approx':      '≈',
+    '\rightarrow':  '→',   # \r = CR(0x0D)
+    '\times':       '×',   # \t = TAB(0x09)
+    '\to':          '→',   # \t = TAB + o
+}
+# LATEX_MAP 에서 만들어지는 패턴이라 RX 레지스트리가 아니라 여기서 컴파일한다
+_LATEX_RE = re.compile("|".join(re.escape(k) for k in sorted(LATEX_MAP, key=len, reverse=True)))
+
+CONCLUSION_KEYWORDS = ["이런 분", "이런 경우", "결론", "최종 정리", "어떤 분", "추천 대상"]
+
+
+# ══════════════════════════════════════════════════════════════
+# 컨텍스트 · 규칙 베이스
+# ══════════════════════════════════════════════════════════════
+
+class ReviewContext:
+    """단일 검수 실행 상태 — 규칙 간 공유."""
+
+    def __init__(self, products: list[dict]):
+        self.products = products
+        self.report: dict[str, list[str]] = {"fixed": [], "warnings": [], "passed": []}
+        self.metrics: dict = {}
+        # 후순위 병합 규칙이 만든 이음매 (병합된 줄, 다음 줄 내용 시작 위치).
+        # 기존 순차 치환에서는 앞선 규칙이 이미 끝난 뒤 병합되므로, 앞선 병합 규칙은
+        # 이 위치 이전의 텍스트를 근거로 다시 병합하지 않는다.
+        self.seam: tuple[str, int] = ("", 0)
+        # join 중 원문 줄 목록과 nxt 의 위치 — 빈 줄 너머를 봐야 하는 병합 규칙용
+        self.src: list[str] = []
+        self.pos = 0
+
+
+class Rule:
+    """
+    검수 규칙 베이스. 필요한 훅만 오버라이드한다.
+
+      join(ctx, cur, nxt) : 현재 줄과 다음 줄을 병합해야 하면 병합 결과, 아니면 None
+      line(ctx, line)     : 수정된 줄 반환, None 이면 줄 삭제
+      post(ctx, lines)    : 전체 순회 후 수정된 줄 목록의 문서 끝단 보정 (O(1) 수준 작업만)
+      finish(ctx)         : ctx.metrics 로 report 의 fixed/warnings/passed 추가
+    """
+
+    def join(self, ctx: ReviewContext, cur: str, nxt: str) -> Optional[str]:
+        return None
+
+    def line(self, ctx: ReviewContext, line: str) -> Optional[str]:
+        return line
+
+    def post(self, ctx: ReviewContext, lines: list[str]) -> None:
+        pass
+
+    def finish(self, ctx: ReviewContext) -> None:
+        pass
+
+
+# ══════════════════════════════════════════════════════════════
+# 자동 수정 규칙 (Auto-fix)
+# ══════════════════════════════════════════════════════════════
+
+class LinkSpaceRule(Rule):
+    """] (URL) 공백 → ](URL) — 줄바꿈으로 떨어진 경우 포함."""
+
+    def __init__(self):
+        self.count = 0
+
+    def join(self, ctx, cur, nxt):
+        if not RX.LINK_END.search(cur):
+            return None
+        if RX.LINK_START.match(nxt):
+            self.count += 1
+            return cur.rstrip()[:-1] + "](" + nxt.lstrip()[1:]
+        if not nxt.strip():
+            # 기존 \]\s+\(http 치환은 빈 줄도 건넌다 — 빈 줄 뒤가 (http 로 시작하면 빈 줄을 흡수
+            src, j = ctx.src, ctx.pos + 1
+            while j < len(src) and not src[j].strip():
+                j += 1
+            if j < len(src) and RX.LINK_START.match(src[j]):
+                return cur
+        return None
+
+    def line(self, ctx, line):
+        if "]" in line:
+            line, n = RX.LINK_SPACE.subn('](http', line)
+            self.count += n
+        return line
+
+    def finish(self, ctx):
+        if self.count:
+            ctx.report["fixed"].append(f"깨진 링크 {self.count}건 수정 ('] URL' 공백 제거)")
+
+
+class TrailingWhitespaceRule(Rule):
+    """줄 끝 불필요 공백 제거 (보고 대상 아님)."""
+
+    def line(self, ctx, line):
+        return line.rstrip(" \t")
+
+
+class BlankLinesRule(Rule):
+    """
+    연속 개행 4개 이상 → 3개 (본문 사이 빈 줄 최대 2줄, 문서 앞뒤는 3줄).
+    공백만 있는 줄은 빈 줄로 보지 않는다.
+    """
+
+    def __init__(self):
+        self.run = 0
+        self.dropped = 0
+        self.started = False
+        self.changed = False
+
+    def line(self, ctx, line):
+        if line:
+            if self.dropped:
+                self.changed = True
+            self.run, self.dropped, self.started = 0, 0, True
+            return line
+        self.run += 1
+        if self.run > (2 if self.started else 3):
+            self.dropped += 1
+            return None
+        return line
+
+    def post(self, ctx, lines):
+        # 문서 끝 빈 줄은 본문 사이보다 1줄 더 허용 (빈 줄만 있는 문서도 같은 규칙)
+        if self.dropped:
+            lines.append("")
+            self.changed = self.changed or self.dropped > 1
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("과다 빈 줄 압축 (3줄 이상 → 2줄)")
+
+
+class TableCellJoinRule(Rule):
+    """테이블 셀 안 개행 제거 (| 뒤 텍스트가 다음 줄의 | 까지 이어지는 경우)."""
+
+    def __init__(self):
+        self.changed = False
+        self._merged = ""   # 직전 병합 결과
+        self._floor  = 0    # 직전 병합 줄에서 다시 병합 판정을 시작할 위치
+
+    def join(self, ctx, cur, nxt):
+        cur = cur.rstrip(" \t")
+        # 기존 re.sub 와 같이 겹치지 않게 — 이미 소비된 다음 줄 첫 | 까지는 다시 보지 않음
+        floor = self._floor if cur == self._merged else 0
+        if cur == ctx.seam[0]:
+            floor = max(floor, ctx.seam[1])
+        if "|" in nxt and RX.TABLE_TAIL.search(cur, floor) and RX.TABLE_HEAD.match(nxt):
+            self.changed = True
+            merged = f"{cur} {nxt}"
+            self._merged = merged.rstrip(" \t")
+            self._floor  = len(cur) + 2 + nxt.index("|")
+            return merged
+        return None
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("테이블 셀 내부 개행 제거")
+
+
+class LatexRule(Rule):
+    """LaTeX 수식 기호 → 유니코드, 남은 $...$ 는 달러 기호만 제거."""
+
+    def __init__(self):
+        self.changed = False
+
+    def join(self, ctx, cur, nxt):
+        # C) \neq 가 JSON 파싱으로 LF + "eq" 가 된 경우
+        if nxt.startswith("eq"):
+            self.changed = True
+            cur = cur.rstrip(" \t") + "≠"
+            merged = cur + nxt[2:]
+            ctx.seam = (merged.rstrip(" \t"), len(cur))
+            return merged
+        return None
+
+    def line(self, ctx, line):
+        if "\\" in line or "\r" in line or "\t" in line:
+            new = _LATEX_RE.sub(lambda m: LATEX_MAP[m.group()], line)
+            if new != line:
+                self.changed, line = True, new
+        if "$" in line:
+            new = RX.LATEX_DOLLAR.sub(lambda m: m.group().strip('$'), line)
+            if new != line:
+                self.changed, line = True, new
+        return line
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("LaTeX 수식 기호 유니코드로 치환")
+
+
+class DuplicateSectionRule(Rule):
+    """중복 H3 섹션 제거 (동일 제목) + 동일 상품 구매 버튼 중복 제거."""
+
+    def __init__(self):
+        self.seen_headings: set[str] = set()
+        self.seen_buy_urls: set[str] = set()
+        self.skipping = False
+        self.changed = False
+
+    def line(self, ctx, line):
+        if line.startswith('### '):
+            key = RX.HEADING_KEY_DROP.sub('', line.lower())
+            if key in self.seen_headings:
+                # 이 섹션 전체를 다음 ### 또는 ## 또는 *** 까지 스킵
+                self.skipping = self.changed = True
+                return None
+            self.seen_headings.add(key)
+            self.skipping = False
+        elif self.skipping and RX.SECTION_END.match(line):
+            self.skipping = False
+
+        if self.skipping:
+            return None
+        if "🛒" in line:
+            m = RX.BUY_BUTTON.search(line)
+            if m:
+                if m.group(1) in self.seen_buy_urls:
+                    self.changed = True
+                    return None
+                self.seen_buy_urls.add(m.group(1))
+        return line
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("중복 H3 섹션 또는 중복 구매링크 제거")
+
+
+class RawCoupangUrlRule(Rule):
+    """줄에 그대로 노출된 쿠팡 URL → [쿠팡에서 보기](URL)."""
+
+    def __init__(self):
+        self.changed = False
+
+    def line(self, ctx, line):
+        if "coupang.com" in line:
+            new = RX.RAW_COUPANG_URL.sub(lambda m: f"[쿠팡에서 보기]({m.group(0)})", line)
+            if new != line:
+                self.changed, line = True, new
+        return line
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("Raw 쿠팡 URL 마크다운 링크로 자동 래핑")
+
+
+class UnclosedBoldRule(Rule):
+    """** 강조 미닫힘(홀수 개) → 문서 끝에 ** 추가."""
+
+    def __init__(self):
+        self.changed = False
+
+    def post(self, ctx, lines):
+        if ctx.metrics["bold_markers"] % 2 != 0:
+            self.changed = True
+            # 문서 끝 공백 제거 (text.rstrip()) 후 닫는 ** 추가
+            while len(lines) > 1 and not lines[-1].strip():
+                lines.pop()
+            lines[-1] = lines[-1].rstrip() + "**"
+            ctx.metrics["bold_markers"] += 1
+            ctx.metrics["char_count"]   += 2
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("** 마크다운 강조 미닫힘 자동 수정")
+
+
+class PriceCommaRule(Rule):
+    """가격 표기 일관성 — 콤마 없는 4자리 이상 '숫자원' → '12,345원'."""
+
+    def __init__(self):
+        self.changed = False
+
+    def line(self, ctx, line):
+        if "원" in line:
+            new = RX.PRICE_PLAIN.sub(lambda m: f"{int(m.group(1)):,}원", line)
+            if new != line:
+                self.changed, line = True, new
+        return line
+
+    def finish(self, ctx):
+        if self.changed:
+            ctx.report["fixed"].append("가격 표기 콤마 자동 삽입")
+
+
+# ══════════════════════════════════════════════════════════════
+# 경고 규칙 (Warnings) — 지표만 사용
+# ══════════════════════════════════════════════════════════════
+
+class RawUrlCheck(Rule):
+    def finish(self, ctx):
+        raw_urls = ctx.metrics["raw_urls"]
+        if raw_urls:
+            ctx.report["warnings"].append(
+                f"Raw URL {len(raw_urls)}개 감지 (마크다운 링크 미적용): "
+                + ", ".join(u[:60] for u in raw_urls[:3])
+            )
+        else:
+            ctx.report["passed"].append("모든 URL 마크다운 링크 형식 ✓")
+
+
+class BuyLinkCheck(Rule):
+    def finish(self, ctx):
+        if not ctx.products:
+            return
+        buy_links, n = ctx.metrics["buy_links"], len(ctx.products)
+        if buy_links == 0:
+            ctx.report["warnings"].append(f"구매 링크 없음 (상품 {n}개 대비 0개)")
+        elif buy_links < n:
+            ctx.report["warnings"].append(f"구매 링크 {buy_links}개 < 상품 {n}개 (일부 누락 가능)")
+        else:
+            ctx.report["passed"].append(f"구매 링크 {buy_links}개 ✓")
+
+
+class LengthCheck(Rule):
+    def __init__(self, min_chars: int = 1500):
+        self.min_chars = min_chars
+
+    def finish(self, ctx):
+        char_count = ctx.metrics["char_count"]
+        if char_count < self.min_chars:
+            ctx.report["warnings"].append(f"분량 부족: {char_count}자 (최소 {self.min_chars}자 권장)")
+        else:
+            ctx.report["passed"].append(f"분량 {char_count:,}자 ✓")
+
+
+class BannedExpressionCheck(Rule):
+    def finish(self, ctx):
+        for category, found in ctx.metrics["banned"].items():
+            if found:
+                ctx.report["warnings"].append(f"{category} 표현 잔류: {', '.join(found)}")
+            else:
+                ctx.report["passed"].append(f"{category} 표현 없음 ✓")
+
+
+class TableCheck(Rule):
+    def finish(self, ctx):
+        if ctx.metrics["has_table"]:
+            ctx.report["passed"].append("비교 테이블 포함 ✓")
+        else:
+            ctx.report["warnings"].append("비교 테이블 없음 (구조화 데이터 부재 → SEO 감점 가능)")
+
+
+class H2Check(Rule):
+    def finish(self, ctx):
+        h2 = ctx.metrics["h2"]
+        if h2 >= 3:
+            ctx.report["passed"].append(f"H2 헤딩 {h2}개 ✓")
+        else:
+            ctx.report["warnings"].append(f"H2 헤딩 {h2}개 (최소 3개 권장)")
+
+
+class ProductImageCheck(Rule):
+    def finish(self, ctx):
+        if not ctx.products:
+            return
+        urls = ctx.metrics["urls"]
+        missing = [
+            p.get('product_name', '')[:20]
+            for p in ctx.products
+            if p.get('product_image') and p['product_image'] not in urls
+        ]
+        if missing:
+            ctx.report["warnings"].append(
+                f"이미지 미삽입 상품 {len(missing)}개: {', '.join(missing)}"
+            )
+        else:
+            img_count = sum(1 for p in ctx.products if p.get('product_image'))
+            if img_count:
+                ctx.report["passed"].append(f"전체 상품 이미지 삽입 확인 ({img_count}개) ✓")
+
+
+class InternalLinkCheck(Rule):
+    def finish(self, ctx):
+        n = ctx.metrics["internal_links"]
+        if n:
+            ctx.report["warnings"].append(
+                f"내부 /blog/ 링크 {n}개 감지 (존재하지 않는 URL 가능성)"
+            )
+
+
+class BoldBalanceCheck(Rule):
+    def finish(self, ctx):
+        if ctx.metrics["bold_markers"] % 2 != 0:
+            ctx.report["warnings"].append("** 마크다운 강조 미닫힘 감지 (렌더링 오류 가능성)")
+        else:
+            ctx.report["passed"].append("마크다운 강조 정상 닫힘 ✓")
+
+
+class ConclusionCheck(Rule):
+    def finish(self, ctx):
+        if ctx.metrics["has_conclusion"]:
+            ctx.report["passed"].append("결론부 존재 ✓")
+        else:
+            ctx.report["warnings"].append("결론부 누락 — '이런 분에게 적합/이런 분은 다른 선택' 형태 결론 권장")
+
+
+class H3Check(Rule):
+    def finish(self, ctx):
+        if not ctx.products:
+            return
+        h3, n = ctx.metrics["h3"], len(ctx.products)
+        if h3 < n:
+            ctx.report["warnings"].append(f"H3 섹션 {h3}개 < 상품 {n}개 (일부 상품 섹션 누락 가능)")
+        else:
+            ctx.report["passed"].append(f"H3 섹션 {h3}개 / 상품 {n}개 ✓")
+
+
+class ParagraphLengthCheck(Rule):
+    def finish(self, ctx):
+        long_paras = ctx.metrics["long_paragraphs"]
+        if long_paras:
+            ctx.report["warnings"].append(
+                f"과도하게 긴 단락 {len(long_paras)}개 감지 (300자 초과, 모바일 가독성 저하): "
+                + repr(long_paras[0]) + "..."
+            )
+        else:
+            ctx.report["passed"].append("단락 길이 적절 ✓")
+
+
+class TagsLineCheck(Rule):
+    def finish(self, ctx):
+        if ctx.metrics["has_tags"]:
+            ctx.report["passed"].append("tags 줄 존재 ✓")
+        else:
+            ctx.report["warnings"].append("tags 줄 누락 — 마지막 줄에 'tags: 태그1, 태그2, ...' 형식 필요")
+
+
+def default_rules() -> list[Rule]:
+    """기존 stage_review 와 동일한 규칙 세트 (보고 순서 포함). 실행마다 새 인스턴스."""
+    return [
+        # Auto-fix
+        LinkSpaceRule(), BlankLinesRule(), TrailingWhitespaceRule(), TableCellJoinRule(),
+        LatexRule(), DuplicateSectionRule(), RawCoupangUrlRule(), UnclosedBoldRule(),
+        PriceCommaRule(),
+        # Warnings
+        RawUrlCheck(), BuyLinkCheck(), LengthCheck(), BannedExpressionCheck(), TableCheck(),
+        H2Check(), ProductImageCheck(), InternalLinkCheck(), BoldBalanceCheck(),
+        ConclusionCheck(), H3Check(), ParagraphLengthCheck(), TagsLineCheck(),
+    ]
+
+
+# ══════════════════════════════════════════════════════════════
+# 엔진
+# ══════════════════════════════════════════════════════════════
+
+class ReviewEngine:
+    """규칙 세트를 받아 문서를 한 번만 순회하며 수정·지표·보고를 만든다."""
+
+    def __init__(self, rules: list[Rule], banned: Optional[PhraseMatcher] = None):
+        self.rules   = rules
+        self.banned  = banned
+        self._joins  = [r for r in rules if type(r).join is not Rule.join]
+        self._lines  = [r for r in rules if type(r).line is not Rule.line]
+
+    def run(self, text: str, products: Optional[list[dict]] = None) -> tuple[str, dict, dict]:
+        """Returns: (수정된 본문, report{fixed,warnings,passed}, metrics)"""
+        doc = Document.parse(text)
+        report, metrics = self.run_doc(doc, products)
+        return doc.to_markdown(), report, metrics
+
+    def run_doc(self, doc: Document, products: Optional[list[dict]] = None) -> tuple[dict, dict]:
+        """
+        문서 모델을 제자리에서 검수 — doc.lines 를 한 번 훑고 수정된 줄 목록으로 교체
+        (노드는 다음에 읽을 때 다시 나눈다).
+        Returns: (report{fixed,warnings,passed}, metrics)
+        """
+        ctx = ReviewContext(products or [])
+        src = ctx.src = doc.lines
+        out: list[str] = []
+        joins, line_rules, banned = self._joins, self._lines, self.banned
+
+        h2 = h3 = list_items = char_count = buy_links = bold_markers = internal_links = 0
+        has_table = has_tags = has_conclusion = False
+        raw_urls: list[str] = []
+        urls: set[str] = set()
+        long_paras: list[str] = []
+
+        # 단락 = 빈 줄로 구분된 줄 묶음 (기존 split('\n\n') 기준)
+        # 단락은 다음 단락이 시작될 때 닫는다 — 마지막 단락은 post 자동 수정(** 닫기 등)이
+        # 끝난 뒤 out 에서 다시 읽어 판정한다 (기존 stage_review 는 수정 후 본문으로 판정)
+        para: list[str] = []
+        para_chars = blank_run = para_lead = para_start = 0
+        started = False
+
+        def close_para() -> None:
+            if para:
+                if para_chars > 300 and not para[0].lstrip().startswith(("#", "|")):
+                    # 기존 split('\n\n') 단락과 동일한 발췌 (짝수 빈 줄 뒤 단락은 '\n' 으로 시작)
+                    lead = "\n" * (para_lead % 2)
+                    long_paras.append((lead + "\n".join(para))[:40])
+                para.clear()
+
+        i, n = 0, len(src)
+        while i < n:
+            cur = src[i]
+            # 1) 줄 병합
+            while i + 1 < n:
+                ctx.pos = i + 1
+                for rule in joins:
+                    merged = rule.join(ctx, cur, src[i + 1])
+                    if merged is not None:
+                        cur = merged
+                        i += 1
+                        break
+                else:
+                    break
+            i += 1
+
+            # 2) 줄 수정
+            line: Optional[str] = cur
+            for rule in line_rules:
+                line = rule.line(ctx, line)
+                if line is None:
+                    break
+            if line is None:
+                continue
+            out.append(line)
+
+            # 3) 지표 수집
+            if not line:
+                blank_run += 1
+                continue
+            if blank_run and para:
+                close_para()
+            if not para:
+                para_lead, para_chars, para_start = blank_run + started, 0, len(out) - 1
+            blank_run, started = 0, True
+            para.append(line)
+
+            chars = len("".join(line.split()))
+            char_count += chars
+            para_chars += chars
+            head = line[0]
+            if head == "#":
+                if line.startswith("## "):
+                    h2 += 1
+                elif line.startswith("### "):
+                    h3 += 1
+            elif head == "|" and not has_table:
+                has_table = bool(RX.TABLE_ROW.match(line))
+            if RX.LIST_ITEM.match(line):
+                list_items += 1
+            if not has_tags and head in "tT" and RX.TAGS_LINE.match(line):
+                has_tags = True
+            if "**" in line:
+                bold_markers += line.count("**")
+            if "://" in line:
+                raw_urls.extend(RX.RAW_URL.findall(line))
+                urls.update(RX.URL.findall(line))
+                if "](" in line:
+                    buy_links += len(RX.BUY_LINK.findall(line))
+            if "/blog/" in line:
+                internal_links += len(RX.INTERNAL_LINK.findall(line))
+            if not has_conclusion:
+                has_conclusion = any(kw in line for kw in CONCLUSION_KEYWORDS)
+
+        m = {
+            "h2": h2, "h3": h3, "has_table": has_table, "list_items": list_items,
+            "has_tags": has_tags, "char_count": char_count, "buy_links": buy_links,
+            "bold_markers": bold_markers, "internal_links": internal_links,
+            "has_conclusion": has_conclusion, "raw_urls": raw_urls, "urls": urls,
+            "long_paragraphs": long_paras,
+        }
+        # 금지 표현은 줄을 넘지 않으므로 오토마톤 1회 순회로 수정본 전체를 검사
+        m["banned"] = banned.group(banned.iter_hits("\n".join(out))) if banned is not None else {}
+        ctx.metrics = m
+        for rule in self.rules:
+            rule.post(ctx, out)
+        if para:
+            para[:] = []
+            for line in out[para_start:]:
+                if not line:
+                    break
+                para.append(line)
+            para_chars = sum(len("".join(line.split())) for line in para)
+            close_para()
+        doc.lines = out
+        for rule in self.rules:
+            rule.finish(ctx)
+        return ctx.report, m
+
+
+def collect_metrics(text: str, banned: Optional[PhraseMatcher] = None) -> dict:
+    """수정 없이 지표만 수집 (사전 채점 등)."""
+    return ReviewEngine([], banned).run(text)[2]
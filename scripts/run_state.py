@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+파이프라인 실행 상태 저장소 — SQLite, 실행(run id)별 분리 + 변경 필드만 기록
+
+기존 .pipeline_state.json 은 스테이지마다 상태 dict 전체(초고 · 개선본 포함)를
+indent=2 로 다시 직렬화해 덮어썼고, 쓰기가 원자적이지 않았으며 동시에 도는 실행이
+같은 파일을 서로 덮어썼다.
+
+  - 실행마다 run id 를 발급하고 필드(products, draft, improved …)를 행 단위로 저장
+  - RunState 는 dict 처럼 쓰되 바뀐 필드만 기억해 save() 때 한 트랜잭션으로 기록
+    (트랜잭션 단위 원자성 — 중간에 죽어도 직전 save() 상태가 남는다)
+  - WAL 모드 + busy timeout 으로 여러 실행이 같은 DB 를 동시에 써도 안전
+  - --stage 재개는 run id 지정(없으면 가장 최근에 갱신된 미완료 실행) 기준
+
+Usage:
+    from run_state import RunStateStore
+    store = RunStateStore(Path(".pipeline_state.db"))
+    state = store.create(topic_key="webcam")          # 새 실행
+    state["draft"] = draft; state.save()             # 바뀐 필드만 기록
+    state = store.open(run_id) or store.latest()      # 재개
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+KEEP_RUNS    = 50     # 완료된 실행 보관 개수 (초과분은 오래된 순 삭제)
+BUSY_TIMEOUT = 10.0   # 다른 실행이 쓰는 중일 때 대기 (초)
+
+_MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     TEXT PRIMARY KEY,
+    topic_key  TEXT NOT NULL DEFAULT '',
+    status     TEXT NOT NULL DEFAULT 'running',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    run_id     TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS runs_updated ON runs(updated_at);
+"""
+
+
+def new_run_id() -> str:
+    """시각 + pid + 난수 — 동시에 시작한 실행끼리도 겹치지 않는다."""
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{os.urandom(2).hex()}"
+
+
+class RunState(dict):
+    """
+    실행 1건의 상태. dict 와 같게 읽고 쓰며, 바뀐 키만 save() 때 기록한다.
+    값은 JSON 직렬화 가능한 것만 (기존 상태 파일과 동일).
+    """
+
+    def __init__(self, store: "RunStateStore", run_id: str, data: Optional[dict] = None):
+        super().__init__(data or {})
+        self.store  = store
+        self.run_id = run_id
+        self._dirty:   set[str] = set()
+        self._deleted: set[str] = set()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._dirty.add(key)
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._dirty.discard(key)
+        self._deleted.add(key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        if key in self:
+            value = super().pop(key)
+            self._dirty.discard(key)
+            self._deleted.add(key)
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:   # type: ignore[override]
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def save(self) -> None:
+        """바뀐 필드만 한 트랜잭션으로 기록."""
+        if not self._dirty and not self._deleted:
+            return
+        self.store._write(
+            self.run_id,
+            {k: self[k] for k in self._dirty},
+            self._deleted,
+        )
+        self._dirty.clear()
+        self._deleted.clear()
+
+    def finish(self) -> None:
+        """실행 완료 표시 (latest() 재개 대상에서 제외, 보관 개수 정리 대상)."""
+        self.save()
+        self.store._set_status(self.run_id, "done")
+
+
+class RunStateStore:
+    """SQLite 기반 실행 상태 저장소. 스레드 · 프로세스 동시 사용 안전."""
+
+    def __init__(self, path: Path, keep_runs: int = KEEP_RUNS):
+        self.path      = path
+        self.keep_runs = keep_runs
+        self._lock     = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        # 연결은 처음 쓸 때 연다 (상태 저장소를 쓰지 않는 명령은 파일을 만들지 않음)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # ── 실행 생성 · 조회 ──────────────────────────────────────
+
+    def create(self, topic_key: str = "", run_id: Optional[str] = None) -> RunState:
+        run_id = run_id or new_run_id()
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "INSERT OR IGNORE INTO runs(run_id, topic_key, status, created_at, updated_at) "
+                "VALUES (?, ?, 'running', ?, ?)",
+                (run_id, topic_key, now, now),
+            )
+        return RunState(self, run_id)
+
+    def open(self, run_id: str) -> Optional[RunState]:
+        """저장된 실행 상태 복원 (없으면 None)."""
+        with self._lock:
+            db = self._db()
+            if db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is None:
+                return None
+            rows = db.execute("SELECT key, value FROM fields WHERE run_id = ?", (run_id,)).fetchall()
+        data = {}
+        for key, value in rows:
+            try:
+                data[key] = json.loads(value)
+            except ValueError:
+                log.warning("[RunState] 손상된 필드 무시: %s.%s", run_id, key)
+        return RunState(self, run_id, data)
+
+    def latest(self) -> Optional[RunState]:
+        """가장 최근에 갱신된 미완료 실행."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT run_id FROM runs WHERE status != 'done' ORDER BY updated_at DESC LIMIT 1"
+            ).fetchone()
+        return self.open(row[0]) if row else None
+
+    def list_runs(self, limit: int = 20) -> list[dict]:
+        """최근 실행 목록 — [{run_id, topic_key, status, updated_at, fields}]"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT r.run_id, r.topic_key, r.status, r.updated_at, "
+                "       (SELECT group_concat(key, ',') FROM fields f WHERE f.run_id = r.run_id) "
+                "FROM runs r ORDER BY r.updated_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"run_id": r[0], "topic_key": r[1], "status": r[2],
+             "updated_at": r[3], "fields": (r[4] or "").split(",") if r[4] else []}
+            for r in rows
+        ]
+
+    def import_json(self, path: Path, run_id: str = "legacy") -> Optional[RunState]:
+        """기존 .pipeline_state.json 을 실행 1건으로 가져오기 (없거나 이미 있으면 None)."""
+        try:
+            data = json.loads(path.read_text("utf-8"))
+        except Exception:
+            return None
+        if not isinstance(data, dict) or not data:
+            return None
+        with self._lock:
+            if self._db().execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+                return None
+        state = self.create(topic_key=(data.get("topic") or {}).get("key", ""), run_id=run_id)
+        state.update(data)
+        state.save()
+        return state
+
+    # ── 기록 ──────────────────────────────────────────────────
+
+    def _write(self, run_id: str, changed: dict[str, Any], deleted: set[str]) -> None:
+        now  = time.time()
+        rows = [(run_id, k, json.dumps(v, ensure_ascii=False), now) for k, v in changed.items()]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if rows:
+                    db.executemany(
+                        "INSERT INTO fields(run_id, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(run_id, key) DO UPDATE SET value = excluded.value, "
+                        "updated_at = excluded.updated_at",
+                        rows,
+                    )
+                if deleted:
+                    db.executemany("DELETE FROM fields WHERE run_id = ? AND key = ?",
+                                   [(run_id, k) for k in deleted])
+                db.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _set_status(self, run_id: str, status: str) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                       (status, time.time(), run_id))
+            # 오래된 완료 실행 정리 (필드는 ON DELETE CASCADE)
+            db.execute(
+                "DELETE FROM runs WHERE status = 'done' AND run_id NOT IN "
+                "(SELECT run_id FROM runs WHERE status = 'done' ORDER BY updated_at DESC LIMIT ?)",
+                (self.keep_runs,),
+            )
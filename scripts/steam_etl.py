@@ -8,8 +8,9 @@ import time
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
-import requests
-from supabase import create_client, Client
+
+from rate_limit import get_limiter
+from supabase_rest import SupabaseREST, get_client
 
 # Configure logging
 logging.basicConfig(
@@ -22,16 +23,25 @@ logger = logging.getLogger(__name__)
 FEATURED_URL = "https://store.steampowered.com/api/featuredcategories/?l=english&cc=us"
 APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails?appids={}"
 MIN_DISCOUNT = 50
-RATE_LIMIT_DELAY = 1.5  # seconds between API calls
+
+# Shared per-host limiter (token bucket, backs off on 429) instead of a fixed sleep
+steam_limiter = get_limiter(FEATURED_URL)
 
 # Supabase Configuration
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Use service role for write access
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Missing Supabase credentials in environment variables")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+def get_supabase() -> SupabaseREST:
+    """
+    Return the shared Supabase client, created on first use.
+    
+    Credentials are validated here rather than at import time so the
+    module's functions can be imported without a configured environment.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing Supabase credentials in environment variables")
+    return get_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 def fetch_discount_list() -> List[Dict]:
@@ -43,8 +53,10 @@ def fetch_discount_list() -> List[Dict]:
     """
     logger.info("Fetching discount list from Steam...")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(FEATURED_URL, timeout=30)
+        response = steam_limiter.send(lambda: requests.get(FEATURED_URL, timeout=30))
         response.raise_for_status()
         data = response.json()
         
@@ -91,8 +103,12 @@ def enrich_with_steam_deck_data(game: Dict) -> Dict:
     app_id = game["app_id"]
     logger.info(f"Enriching data for {game['name']} (App ID: {app_id})")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(APP_DETAILS_URL.format(app_id), timeout=30)
+        response = steam_limiter.send(
+            lambda: requests.get(APP_DETAILS_URL.format(app_id), timeout=30)
+        )
         response.raise_for_status()
         data = response.json()
         
@@ -188,12 +204,13 @@ def load_to_supabase(games: List[Dict]) -> int:
     
     try:
         # Perform upsert (insert or update on conflict)
-        result = supabase.table("steam_deals").upsert(
+        rows = get_supabase().upsert(
+            "steam_deals",
             records,
             on_conflict="app_id"  # Use app_id as the unique key
-        ).execute()
+        )
         
-        loaded_count = len(result.data) if result.data else 0
+        loaded_count = len(rows)
         logger.info(f"Successfully loaded {loaded_count} games to database")
         return loaded_count
         
@@ -206,6 +223,8 @@ def run_etl_pipeline():
     """
     Execute the complete ETL pipeline.
     """
+    get_supabase()  # Fail fast on missing credentials before any API calls
+    
     start_time = time.time()
     logger.info("=" * 60)
     logger.info("Starting Steam Deals ETL Pipeline")
@@ -226,13 +245,9 @@ def run_etl_pipeline():
     for idx, game in enumerate(games, 1):
         logger.info(f"Processing {idx}/{len(games)}: {game['name']}")
         
+        # Rate limiting is handled by steam_limiter inside the request
         enriched = enrich_with_steam_deck_data(game)
         enriched_games.append(enriched)
-        
-        # Rate limiting: sleep between requests to avoid Steam API ban
-        if idx < len(games):  # Don't sleep after the last item
-            logger.debug(f"Sleeping {RATE_LIMIT_DELAY}s to respect rate limits...")
-            time.sleep(RATE_LIMIT_DELAY)
     
     logger.info(f"\nStep 2 Complete: Enriched {len(enriched_games)} games")
     
@@ -249,6 +264,8 @@ def run_etl_pipeline():
     logger.info(f"Total games enriched: {len(enriched_games)}")
     logger.info(f"Total games loaded: {loaded_count}")
     logger.info(f"Execution time: {elapsed_time:.2f} seconds")
+    get_supabase().log_stats()  # Supabase request count / latency
+    logger.info(f"Steam API rate limiter: {steam_limiter.stats()}")
     logger.info("=" * 60)
 
 
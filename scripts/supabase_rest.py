@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Supabase REST(PostgREST) 공용 클라이언트 — 커넥션 풀 세션 + 재시도 + 요청 지표
+
+blog_generator 는 요청마다 헤더를 새로 만들어 requests.get/post 를 직접 호출했고
+(매번 새 TCP/TLS 연결), ETL 스크립트들은 각자 supabase.create_client 를 썼다.
+모든 스크립트가 이 모듈의 클라이언트 하나를 공유한다.
+
+  - keep-alive Session 1개 (HTTPAdapter 커넥션 풀) — 같은 호스트 연결 재사용
+  - 연결 실패 · 429 · 5xx 는 지수 백오프로 재시도 (429 는 Retry-After 우선).
+    POST 는 중복 삽입 위험이 있어 upsert 처럼 멱등인 호출만 재시도
+  - 테이블 · 메서드별 호출 수 / 오류 / 재시도 / 누적 · 최대 소요 시간 (stats())
+  - 대량 헬퍼: select() limit/offset 페이지 조회, upsert() 청크 단위 업서트
+  - requests 와 세션은 첫 요청 때 생성 — import · get_client() 만으로는 네트워크
+    라이브러리를 로드하지 않는다
+
+Usage:
+    from supabase_rest import get_client
+    db = get_client()                                    # 환경변수 자격 증명, 프로세스 공용
+    rows = db.select("products", {"select": "id,name", "status": "eq.published"})
+    db.upsert("steam_deals", records, on_conflict="app_id")
+    db.update("products", {"sale_price": 9900}, {"id": "eq.3"})
+    db.log_stats()
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+log = logging.getLogger(__name__)
+
+POOL_SIZE    = 10      # 호스트당 유지할 keep-alive 연결 수
+TIMEOUT      = 15      # 요청 타임아웃 (초)
+MAX_RETRIES  = 3       # 재시도 횟수 (첫 시도 제외)
+BACKOFF      = 0.5     # 재시도 대기 0.5 → 1 → 2초
+MAX_BACKOFF  = 10.0
+PAGE_SIZE    = 1000    # PostgREST 기본 max-rows
+UPSERT_CHUNK = 500     # 업서트 1회 요청당 행 수
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT   = frozenset({"GET", "HEAD", "PATCH", "DELETE"})
+
+
+class SupabaseError(RuntimeError):
+    """PostgREST 오류 응답 (상태 코드 + 본문 일부를 메시지에 포함)."""
+
+    def __init__(self, resp: requests.Response):
+        self.response    = resp
+        self.status_code = resp.status_code
+        self.text        = resp.text
+        super().__init__(f"{resp.status_code} {resp.request.method} {resp.url}: {resp.text[:200]}")
+
+
+@dataclass
+class _OpStats:
+    count:    int   = 0
+    errors:   int   = 0
+    retries:  int   = 0
+    total_ms: float = 0.0
+    max_ms:   float = 0.0
+
+
+class SupabaseREST:
+    """PostgREST 클라이언트. 스레드 안전 (Session · 지표 공유)."""
+
+    def __init__(self, url: str, key: str, pool_size: int = POOL_SIZE,
+                 timeout: float = TIMEOUT, max_retries: int = MAX_RETRIES):
+        self.base_url    = f"{url.rstrip('/')}/rest/v1"
+        self.timeout     = timeout
+        self.max_retries = max_retries
+        self.pool_size   = pool_size
+        self._key        = key
+        self._session: Optional[requests.Session] = None
+        self._stats: dict[str, _OpStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """keep-alive 세션 (첫 요청 때 생성)."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({
+                        "apikey":        self._key,
+                        "Authorization": f"Bearer {self._key}",
+                        "Content-Type":  "application/json",
+                    })
+                    self._session = session
+        return self._session
+
+    # ── 저수준 요청 ───────────────────────────────────────────
+
+    def request(self, method: str, table: str, *, params: Optional[dict] = None,
+                json: Any = None, prefer: str = "", retry: Optional[bool] = None,
+                timeout: Optional[float] = None) -> requests.Response:
+        """
+        /rest/v1/{table} 요청 1건 (재시도 포함). 오류 응답도 그대로 반환하므로
+        상태 코드별 처리(예: 409 slug 충돌)는 호출 측에서 한다.
+        retry 미지정 시 멱등 메서드(GET/PATCH/DELETE)만 재시도.
+        """
+        import requests
+
+        session = self.session
+        method  = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT
+        headers = {"Prefer": prefer} if prefer else None
+        url     = f"{self.base_url}/{table}"
+        op      = f"{method} {table}"
+        attempt = 0
+        t0 = time.perf_counter()
+        while True:
+            resp, error = None, None
+            try:
+                resp = session.request(method, url, params=params, json=json, headers=headers,
+                                       timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            retryable = error is not None or resp.status_code in RETRY_STATUS
+            if not (retry and retryable and attempt < self.max_retries):
+                break
+            delay = min(BACKOFF * 2 ** attempt, MAX_BACKOFF)
+            if resp is not None and resp.headers.get("Retry-After", "").isdigit():
+                delay = min(float(resp.headers["Retry-After"]), MAX_BACKOFF)
+            attempt += 1
+            log.warning("[DB] %s 재시도 %d/%d (%.1fs 후): %s", op, attempt, self.max_retries, delay,
+                        error or f"{resp.status_code} {resp.text[:80]}")
+            time.sleep(delay)
+        self._record(op, (time.perf_counter() - t0) * 1000, attempt,
+                     failed=error is not None or not resp.ok)
+        if error is not None:
+            raise error
+        return resp
+
+    def _record(self, op: str, ms: float, retries: int, failed: bool) -> None:
+        with self._lock:
+            s = self._stats.setdefault(op, _OpStats())
+            s.count    += 1
+            s.errors   += failed
+            s.retries  += retries
+            s.total_ms += ms
+            s.max_ms    = max(s.max_ms, ms)
+
+    @staticmethod
+    def _check(resp: requests.Response) -> requests.Response:
+        if not resp.ok:
+            raise SupabaseError(resp)
+        return resp
+
+    # ── 조회 ──────────────────────────────────────────────────
+
+    def iter_select(self, table: str, params: Optional[dict] = None,
+                    page_size: int = PAGE_SIZE) -> Iterator[dict]:
+        """
+        limit/offset 페이지 단위 조회 — max-rows 제한 없이 전체 행. 오류 시 SupabaseError.
+        페이지끼리 겹치거나 빠지지 않으려면 params 에 고유 키 기준 order 를 넣을 것.
+        """
+        params = dict(params or {})
+        offset = 0
+        while True:
+            rows = self._check(self.request(
+                "GET", table, params={**params, "limit": page_size, "offset": offset},
+            )).json()
+            yield from rows
+            if len(rows) < page_size:
+                return
+            offset += len(rows)
+
+    def select(self, table: str, params: Optional[dict] = None,
+               page_size: int = PAGE_SIZE) -> list[dict]:
+        return list(self.iter_select(table, params, page_size))
+
+    # ── 쓰기 ──────────────────────────────────────────────────
+
+    def insert(self, table: str, rows: Any, returning: bool = True) -> list[dict]:
+        """행 삽입 (재시도 없음 — 중복 삽입 방지). returning 이면 삽입된 행 반환."""
+        resp = self._check(self.request(
+            "POST", table, json=rows,
+            prefer="return=representation" if returning else "return=minimal",
+        ))
+        return resp.json() if returning else []
+
+    def upsert(self, table: str, rows: list[dict], on_conflict: str,
+               chunk_size: int = UPSERT_CHUNK, returning: bool = True) -> list[dict]:
+        """on_conflict 키 기준 병합 업서트, chunk_size 행씩 나눠 요청. 멱등이라 재시도 대상."""
+        prefer = "resolution=merge-duplicates," + ("return=representation" if returning else "return=minimal")
+        out: list[dict] = []
+        for i in range(0, len(rows), chunk_size):
+            resp = self._check(self.request(
+                "POST", table, params={"on_conflict": on_conflict},
+                json=rows[i:i + chunk_size], prefer=prefer, retry=True,
+            ))
+            if returning:
+                out.extend(resp.json())
+        return out
+
+    def update(self, table: str, values: dict, filters: dict,
+               returning: bool = False) -> list[dict]:
+        """filters(PostgREST 연산자 형식, 예: {"id": "eq.3"})에 맞는 행 갱신."""
+        if not filters:
+            raise ValueError("update 에는 필터가 필요합니다 (전체 행 갱신 방지)")
+        resp = self._check(self.request(
+            "PATCH", table, params=filters, json=values,
+            prefer="return=representation" if returning else "return=minimal",
+        ))
+        return resp.json() if returning else []
+
+    # ── 지표 ──────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, dict]:
+        """'{METHOD} {table}' → {count, errors, retries, total_ms, avg_ms, max_ms}"""
+        with self._lock:
+            return {
+                op: {"count": s.count, "errors": s.errors, "retries": s.retries,
+                     "total_ms": round(s.total_ms, 1),
+                     "avg_ms": round(s.total_ms / s.count, 1) if s.count else 0.0,
+                     "max_ms": round(s.max_ms, 1)}
+                for op, s in sorted(self._stats.items())
+            }
+
+    def log_stats(self) -> None:
+        for op, s in self.stats().items():
+            log.info("[DB] %-28s %4d건 avg=%.0fms max=%.0fms 재시도=%d 오류=%d",
+                     op, s["count"], s["avg_ms"], s["max_ms"], s["retries"], s["errors"])
+
+
+# ── 프로세스 공용 클라이언트 ──────────────────────────────────────────────────
+
+_CLIENTS: dict[tuple[str, str], SupabaseREST] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(url: Optional[str] = None, key: Optional[str] = None) -> SupabaseREST:
+    """
+    자격 증명별 공용 클라이언트 (처음 호출 시 생성). 인자를 생략하면
+    NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY 환경변수를 쓴다.
+    """
+    url = (url or os.getenv("NEXT_PUBLIC_SUPABASE_URL") or "").rstrip("/")
+    key = key or os.getenv("SUPABASE_SERVICE_ROLE_KEY") or ""
+    if not url or not key:
+        raise ValueError("Supabase 자격 증명 누락: NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY")
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get((url, key))
+        if client is None:
+            client = _CLIENTS[(url, key)] = SupabaseREST(url, key)
+        return client
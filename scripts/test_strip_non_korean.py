@@ -0,0 +1,80 @@
+"""
+_strip_non_korean 동등성 검사 — 의심 줄만 판별하는 현재 구현이 줄마다 두 번 정규식을
+돌리던 이전 구현과 같은 결과를 내는지, 시드 고정 무작위 문자열로 비교한다.
+
+    python -m pytest -q test_strip_non_korean.py
+"""
+import random
+import re
+
+from blog_generator import _strip_non_korean
+
+# ── 이전 구현 (고정 사본 — text_patterns 가 바뀌어도 기준은 그대로) ─────────────
+
+_OLD_FOREIGN = re.compile(r"[\u4e00-\u9fff\u3040-\u30ff\u0400-\u04ff"
+                          r"\u0600-\u06ff\u0750-\u077f\u08a0-\u08ff\u0e00-\u0e7f\u0900-\u097f"
+                          r"\u0530-\u058f\u0590-\u05ff\u10a0-\u10ff]+")
+_OLD_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_OLD_ASCII_ONLY = re.compile(r"^[a-zA-Z0-9\s\-_.,!?:;\'\"()\[\]{}<>/@#$%^&*+=~`|\\/#*>]+$")
+_OLD_INNER_SPACES = re.compile(r"(?<!\n)  +(?!\s*$)")
+
+
+def _old_strip_non_korean(text: str) -> str:
+    text = _OLD_FOREIGN.sub("", text)
+    cleaned = []
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if not stripped or _OLD_HANGUL.search(stripped) or _OLD_ASCII_ONLY.match(stripped):
+            cleaned.append(line)
+    text = "\n".join(cleaned)
+    text = _OLD_INNER_SPACES.sub(" ", text)
+    return text.strip()
+
+
+# ── 무작위 입력 ───────────────────────────────────────────────────────────────
+
+SEED = 20261019
+CASES = 20000
+
+# 한글 · ASCII · 제거 대상 스크립트 · 그 밖의 문자(이모지 · 라틴 확장 · 전각 기호) ·
+# 줄바꿈/탭/유니코드 공백 · 마크다운 기호를 섞는다
+_POOLS = [
+    "가나다한글테스트ㄱㅎㅏㅣ",
+    "abcXYZ019",
+    "-_.,!?:;'\"()[]{}<>/@#$%^&*+=~`|\\",
+    "中文字漢日本ひらがなカタカナ",
+    "Русскийالعربيةไทยहिन्दीՀայերենעבריתქართული",
+    "😀🛒→★éñü€©・。、（）",
+    "  \t\r\u3000\u00a0\u2003\x0b\x0c",
+    "\n\n\n",
+    "# ## ### | --- ** ![](",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 60)):
+        pool = rng.choice(_POOLS)
+        parts.append("".join(rng.choice(pool) for _ in range(rng.randint(1, 6))))
+    return "".join(parts)
+
+
+def test_matches_previous_implementation_on_random_text():
+    rng = random.Random(SEED)
+    for i in range(CASES):
+        text = _random_text(rng)
+        assert _strip_non_korean(text) == _old_strip_non_korean(text), (i, text)
+
+
+def test_matches_previous_implementation_on_samples():
+    samples = [
+        "",
+        "   \n\n  ",
+        "## 제목\n本文 中文\nEnglish only line\n한글  두칸  공백  \n끝",
+        "| 항목 | 값 |\n|---|---|\n| 가격 | 29,900원 |\nПривет мир\n\ntags: a, b",
+        "줄 끝 더블스페이스  \n다음 줄",
+        "😀 only emoji line\n😀 이모지와 한글",
+        "前置き\n  들여쓰기  유지\t탭\n",
+    ]
+    for text in samples:
+        assert _strip_non_korean(text) == _old_strip_non_korean(text), text
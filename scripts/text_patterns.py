@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+blog_generator 공용 정규식 레지스트리 — 지연 컴파일
+
+후처리·응답 파싱에 쓰는 패턴 정의(소스 + 플래그)를 한곳에 모으고,
+처음 사용할 때 한 번만 컴파일해 레지스트리 속성으로 캐시한다.
+줄 단위 루프 안에서도 re 모듈 캐시 조회 없이 컴파일된 패턴을 바로 쓴다.
+
+Usage:
+    from text_patterns import RX
+    text = RX.THINK_BLOCK.sub("", raw)
+    if RX.TAGS_LINE.match(line): ...
+"""
+from __future__ import annotations
+
+import re
+
+# 이름 → (패턴, 플래그)
+_SPECS: dict[str, tuple[str, int]] = {
+    # ── LLM 응답 정리 ──────────────────────────────────────────
+    "THINK_BLOCK":      (r"<think>[\s\S]*?</think>", re.IGNORECASE),
+    "JSON_OBJECT":      (r"\{[\s\S]+\}", 0),
+    "FENCE_OPEN_JSON":  (r"^```(?:json)?\s*", re.IGNORECASE),
+    "FENCE_OPEN_MD":    (r"^```(?:markdown|md)?\s*", re.IGNORECASE),
+    "FENCE_OPEN_ANY":   (r"^```(?:json|markdown)?\s*", re.IGNORECASE),
+    "FENCE_CLOSE":      (r"\s*```$", 0),
+
+    # ── slug ──────────────────────────────────────────────────
+    "SLUG_INVALID":     (r"[^a-zA-Z0-9\s-]", 0),
+    "SLUG_SEPARATOR":   (r"[\s_]+", 0),
+    "SLUG_DASHES":      (r"-+", 0),
+
+    # ── 헤딩 · tags 줄 판별 ───────────────────────────────────
+    "H1_LINE":          (r"^#\s", 0),
+    "H1_TITLE":         (r"^# .+\n?", 0),
+    "H2_OUTLINE":       (r"^##\s+\S", 0),
+    "HEADING_ANY":      (r"^#{1,6}\s", 0),
+    "HEADING_H1_H4":    (r"^#{1,4}\s", 0),
+    "HEADING_H2_H4":    (r"^#{2,4}\s", 0),
+    "HEADING_MARKS":    (r"^#+\s*", 0),
+    "OUTLINE_LABEL":    (r"^(?:\d️?⃣\s*)?(?:\[[^\]]*\]\s*)?(?:\(H2:\s*)?", 0),
+    "HEADING_KEY_DROP": (r"[^\w가-힣]", 0),
+    # 아웃라인에서 상품 소개(3단계) 섹션 — 번호 이모지 또는 단계 이름 · H2 설명
+    "PRODUCT_SECTION":  (r"3️?⃣|상품 등장|추천 상품|상품 비교|제품 비교|추천 제품", 0),
+    "TAGS_LINE":        (r"^tags?\s*:", re.IGNORECASE),
+    "TAGS_HEADING":     (r"^tags?\s*:?$", re.IGNORECASE),
+    "TAGS_VALUE":       (r"tags?:\s*(.+)$", re.IGNORECASE | re.MULTILINE),
+    "TAGS_TRAILER":     (r"\ntags?:.*$", re.IGNORECASE | re.MULTILINE),
+    "FIRST_LINE":       (r"^(.+?)(?:\n|$)", 0),
+    "WHITESPACE":       (r"\s", 0),
+
+    # ── 마크다운 정리 · 이미지 삽입 ───────────────────────────
+    "LINK_SPACE":       (r"\]\s+\(http", 0),
+    "LINK_LINE":        (r"^\[[^\]]+\]\([^)\s]+\)$", 0),
+    "ORPHAN_BRACKET":   (r"(?<!!)\[([^\]\n]+)\](?!\s*[\(\[])", 0),
+    "TABLE_SEPARATOR":  (r"^[\s|:-]+$", 0),
+    "NAME_TOKEN_SPLIT": (r"[\s,\(\)\[\]/·]+", 0),
+    "COUPANG_BUY_TEXT": (r"쿠팡.*구매|구매.*쿠팡", 0),
+
+    # ── 검수 엔진 (review_engine) ─────────────────────────────
+    "LINK_END":         (r"\]\s*$", 0),
+    "LINK_START":       (r"^\s*\(http", 0),
+    "TABLE_TAIL":       (r"\|[^\n|]+$", 0),
+    "TABLE_HEAD":       (r"^[^\n|]*\|", 0),
+    "TABLE_ROW":        (r"^\|.+\|.+\|", 0),
+    "LIST_ITEM":        (r"^\s*[-*] ", 0),
+    "LATEX_DOLLAR":     (r"\$[^$\n]{1,40}\$", 0),
+    "SECTION_END":      (r"^#{2,3} |^\*{3}$", 0),
+    "PRICE_PLAIN":      (r"(\d{4,})원", 0),
+    "BUY_BUTTON":       (r"\[🛒[^\]]*\]\((https?://[^\)]+)\)", 0),
+    "BUY_LINK":         (r"\[.*?(?:구매|바로가기|보러가기|주문).*?\]\(https?://", 0),
+    "RAW_COUPANG_URL":  (r"(?<!\()(?<!\[)(https?://(?:link\.coupang\.com|ads-partners\.coupang\.com)"
+                         r"/[^\s\)\"\'\>]+)", 0),
+    "RAW_URL":          (r"(?<!\()(?<!\[)(?<!image:\s)https?://[^\s\)\"\'\>]+(?!\))", 0),
+    "URL":              (r"https?://[^\s\)\"\'\>]+", 0),
+    "INTERNAL_LINK":    (r"\(/blog/[^\)]+\)", 0),
+
+    # ── 비한국어 스크립트 제거 ────────────────────────────────
+    # 한자 · 히라가나/카타카나 · 키릴 · 아랍 · 태국 · 데바나가리 · 아르메니아/히브리/그루지아
+    "FOREIGN_SCRIPT":   (r"[\u4e00-\u9fff\u3040-\u30ff\u0400-\u04ff"
+                         r"\u0600-\u06ff\u0750-\u077f\u08a0-\u08ff\u0e00-\u0e7f\u0900-\u097f"
+                         r"\u0530-\u058f\u0590-\u05ff\u10a0-\u10ff]+", 0),
+    "HANGUL_CHAR":      (r"[가-힣ㄱ-ㅎㅏ-ㅣ]", 0),
+    # 영문/숫자/기호 · 공백 · 한글 어디에도 속하지 않는 문자 — 이런 문자가 있는 줄만
+    # 한글 포함 여부로 유지/삭제를 판별한다 (나머지 줄은 항상 유지)
+    "LINE_SUSPECT":     (r"[^a-zA-Z0-9\s\-_.,!?:;\'\"()\[\]{}<>/@#$%^&*+=~`|\\가-힣ㄱ-ㅎㅏ-ㅣ]", 0),
+    # 줄 머리가 아닌 2칸 이상 공백 (후행 공백 제외). 리터럴 공백으로 시작해야
+    # 엔진이 공백 위치로 바로 건너뛴다 — (?<!\n)  + 와 같은 매칭
+    "INNER_SPACES":     (r" (?<!\n ) +(?!\s*$)", 0),
+}
+
+
+class _PatternRegistry:
+    """속성 접근 시 컴파일 후 캐시. 사용하지 않는 패턴은 컴파일하지 않는다."""
+
+    def __getattr__(self, name: str) -> re.Pattern:
+        try:
+            pattern, flags = _SPECS[name]
+        except KeyError:
+            raise AttributeError(f"등록되지 않은 패턴: {name}") from None
+        compiled = re.compile(pattern, flags)
+        setattr(self, name, compiled)
+        return compiled
+
+    def compile_all(self) -> int:
+        """모든 패턴 미리 컴파일 (벤치마크 워밍업용). 컴파일된 패턴 수 반환."""
+        for name in _SPECS:
+            getattr(self, name)
+        return len(_SPECS)
+
+
+RX = _PatternRegistry()
@@ -4,12 +4,12 @@ Fetches popular and trending movies from TMDB API and loads to Supabase.
 """
 
 import os
-import time
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-import requests
-from supabase import create_client, Client
+
+from rate_limit import get_limiter
+from supabase_rest import SupabaseREST, get_client
 
 # Configure logging
 logging.basicConfig(
@@ -21,19 +21,21 @@ logger = logging.getLogger(__name__)
 # Constants
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
-RATE_LIMIT_DELAY = 0.3  # TMDB allows ~40 requests/second
+
+# Shared per-host limiter: starts at the old 0.3s spacing and ramps toward
+# TMDB's ~40 requests/second, halving on 429
+tmdb_limiter = get_limiter(TMDB_BASE_URL)
 
 # Supabase Configuration
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Missing Supabase credentials in environment variables")
 
-if not TMDB_API_KEY:
-    raise ValueError("Missing TMDB_API_KEY in environment variables")
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+def get_supabase() -> SupabaseREST:
+    """Shared Supabase client; credentials are checked on first use, not at import."""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing Supabase credentials in environment variables")
+    return get_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 def fetch_popular_movies(page: int = 1) -> List[Dict]:
@@ -48,8 +50,10 @@ def fetch_popular_movies(page: int = 1) -> List[Dict]:
     """
     logger.info(f"Fetching popular movies (page {page})...")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(
+        response = tmdb_limiter.send(lambda: requests.get(
             f"{TMDB_BASE_URL}/movie/popular",
             params={
                 "api_key": TMDB_API_KEY,
@@ -57,7 +61,7 @@ def fetch_popular_movies(page: int = 1) -> List[Dict]:
                 "page": page,
             },
             timeout=30
-        )
+        ))
         response.raise_for_status()
         data = response.json()
         
@@ -79,15 +83,17 @@ def fetch_trending_movies() -> List[Dict]:
     """
     logger.info("Fetching trending movies...")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(
+        response = tmdb_limiter.send(lambda: requests.get(
             f"{TMDB_BASE_URL}/trending/movie/week",
             params={
                 "api_key": TMDB_API_KEY,
                 "language": "en-US",
             },
             timeout=30
-        )
+        ))
         response.raise_for_status()
         data = response.json()
         
@@ -112,8 +118,10 @@ def fetch_top_rated_movies(page: int = 1) -> List[Dict]:
     """
     logger.info(f"Fetching top-rated movies (page {page})...")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(
+        response = tmdb_limiter.send(lambda: requests.get(
             f"{TMDB_BASE_URL}/movie/top_rated",
             params={
                 "api_key": TMDB_API_KEY,
@@ -121,7 +129,7 @@ def fetch_top_rated_movies(page: int = 1) -> List[Dict]:
                 "page": page,
             },
             timeout=30
-        )
+        ))
         response.raise_for_status()
         data = response.json()
         
@@ -146,8 +154,10 @@ def fetch_now_playing_movies(page: int = 1) -> List[Dict]:
     """
     logger.info(f"Fetching now playing movies (page {page})...")
     
+    import requests  # imported on first fetch, not at module import
+
     try:
-        response = requests.get(
+        response = tmdb_limiter.send(lambda: requests.get(
             f"{TMDB_BASE_URL}/movie/now_playing",
             params={
                 "api_key": TMDB_API_KEY,
@@ -155,7 +165,7 @@ def fetch_now_playing_movies(page: int = 1) -> List[Dict]:
                 "page": page,
             },
             timeout=30
-        )
+        ))
         response.raise_for_status()
         data = response.json()
         
@@ -223,12 +233,13 @@ def load_to_supabase(movies: List[Dict]) -> int:
     
     try:
         # Perform upsert (insert or update on conflict)
-        result = supabase.table("movies").upsert(
+        rows = get_supabase().upsert(
+            "movies",
             movies,
             on_conflict="tmdb_id"
-        ).execute()
+        )
         
-        loaded_count = len(result.data) if result.data else 0
+        loaded_count = len(rows)
         logger.info(f"Successfully loaded {loaded_count} movies to database")
         return loaded_count
         
@@ -241,6 +252,11 @@ def run_etl_pipeline():
     """
     Run the complete ETL pipeline for TMDB movies.
     """
+    # Fail fast on missing configuration before any API calls
+    if not TMDB_API_KEY:
+        raise ValueError("Missing TMDB_API_KEY in environment variables")
+    get_supabase()
+    
     logger.info("=" * 60)
     logger.info("Starting TMDB Movies ETL Pipeline")
     logger.info("=" * 60)
@@ -262,11 +278,9 @@ def run_etl_pipeline():
             for page in pages:
                 movies = fetch_func(page)
                 all_movies.extend(movies)
-                time.sleep(RATE_LIMIT_DELAY)
         else:
             movies = fetch_func()
             all_movies.extend(movies)
-            time.sleep(RATE_LIMIT_DELAY)
     
     # Remove duplicates based on TMDB ID
     unique_movies = {str(m["id"]): m for m in all_movies}.values()
@@ -280,6 +294,8 @@ def run_etl_pipeline():
     
     logger.info("=" * 60)
     logger.info(f"ETL Pipeline Complete: {loaded_count} movies loaded")
+    get_supabase().log_stats()  # Supabase request count / latency
+    logger.info(f"TMDB API rate limiter: {tmdb_limiter.stats()}")
     logger.info("=" * 60)
 
 
@@ -17,30 +17,260 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import io
+import json
 import logging
+import os
+import tempfile
+import threading
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Optional
 
-# ── urllib3 v2 / pytrends 4.9.x 호환성 패치 ─────────────────────────────────
-# urllib3 v2 에서 method_whitelist → allowed_methods 로 변경됨.
-# pytrends 4.9.x 가 아직 method_whitelist 를 사용해 TypeError 발생.
-try:
-    import urllib3.util.retry as _retry_mod
-    _OrigRetry = _retry_mod.Retry
-    class _PatchedRetry(_OrigRetry):
-        def __init__(self, *args, **kwargs):
-            if "method_whitelist" in kwargs and "allowed_methods" not in kwargs:
-                kwargs["allowed_methods"] = kwargs.pop("method_whitelist")
-            elif "method_whitelist" in kwargs:
-                kwargs.pop("method_whitelist")
-            super().__init__(*args, **kwargs)
-    _retry_mod.Retry = _PatchedRetry
-except Exception:
-    pass
+from category_index import CategoryIndex
+from phrase_matcher import PhraseMatcher
+from rate_limit import get_limiter, retry_after_seconds
+from trend_store import STRATEGIES, TrendStore, strategy_score
 
 log = logging.getLogger(__name__)
 
+
+# ── pytrends 클라이언트 (지연 로드) ─────────────────────────────────────────
+# pytrends 는 pandas 를 끌고 와 import 만 수백 ms 가 걸린다. 모듈 import 시점이
+# 아니라 실제로 트렌드를 조회할 때 로드하고, urllib3 호환성 패치도 그때 한 번만 적용.
+
+_URLLIB3_PATCHED = False
+
+
+def _patch_urllib3_retry() -> None:
+    """
+    urllib3 v2 / pytrends 4.9.x 호환성 패치.
+    urllib3 v2 에서 method_whitelist → allowed_methods 로 변경됨.
+    pytrends 4.9.x 가 아직 method_whitelist 를 사용해 TypeError 발생.
+    """
+    global _URLLIB3_PATCHED
+    if _URLLIB3_PATCHED:
+        return
+    _URLLIB3_PATCHED = True
+    try:
+        import urllib3.util.retry as _retry_mod
+        _OrigRetry = _retry_mod.Retry
+        class _PatchedRetry(_OrigRetry):
+            def __init__(self, *args, **kwargs):
+                if "method_whitelist" in kwargs and "allowed_methods" not in kwargs:
+                    kwargs["allowed_methods"] = kwargs.pop("method_whitelist")
+                elif "method_whitelist" in kwargs:
+                    kwargs.pop("method_whitelist")
+                super().__init__(*args, **kwargs)
+        _retry_mod.Retry = _PatchedRetry
+    except Exception:
+        pass
+
+
+def _trend_req():
+    """pytrends TrendReq 생성 (첫 호출 시 pytrends 로드 + 패치). 미설치 시 ImportError."""
+    _patch_urllib3_retry()
+    from pytrends.request import TrendReq
+    # 생성 시 쿠키 발급 요청이 나가므로 이것도 호출 한도에 포함
+    return _trends_call(TrendReq, hl="ko-KR", tz=540, timeout=(10, 30), retries=2, backoff_factor=1.0)
+
+
+# ── 공유 세션 ─────────────────────────────────────────────────────────────────
+# 수집 함수마다 TrendReq 를 새로 만들면 호출마다 쿠키 발급 요청이 한 번씩 더 나간다.
+# 쓰고 난 TrendReq(쿠키)는 풀에 돌려놓아 재사용하고, RSS 는 keep-alive Session 1개를 공유한다.
+# TrendReq 는 마지막 build_payload 를 상태로 들고 있으므로 한 번에 한 스레드만 쓴다.
+
+COLLECT_TIMEOUT = 20.0   # 소스 동시 수집 대기 상한 (초)
+
+_SHARED_LOCK   = threading.Lock()
+_idle_pytrends: list = []    # 쉬고 있는 TrendReq
+_shared_http   = None
+
+
+@contextmanager
+def _trend_client():
+    """TrendReq 1개 대여 — 쉬는 인스턴스가 있으면 재사용, 없으면 새로 생성 (미설치 시 ImportError)."""
+    with _SHARED_LOCK:
+        pytrends = _idle_pytrends.pop() if _idle_pytrends else None
+    if pytrends is None:
+        pytrends = _trend_req()
+    try:
+        yield pytrends
+    finally:
+        with _SHARED_LOCK:
+            _idle_pytrends.append(pytrends)
+
+
+def _http_session():
+    """RSS 등 Google Trends 직접 요청용 keep-alive 세션."""
+    global _shared_http
+    with _SHARED_LOCK:
+        if _shared_http is None:
+            import requests
+            _shared_http = requests.Session()
+            _shared_http.headers["User-Agent"] = "Mozilla/5.0 (compatible; ThiveLab/1.0)"
+        return _shared_http
+
+
+def _payload_query(kw_list: list[str], fetch: str, **payload):
+    """대여한 TrendReq 로 build_payload → fetch (예: "interest_over_time") 를 한 묶음으로 실행."""
+    with _trend_client() as pytrends:
+        _trends_call(pytrends.build_payload, kw_list, **payload)
+        return _trends_call(getattr(pytrends, fetch))
+
+
+# ── Google Trends 호출 속도 제한 ──────────────────────────────────────────────
+# RSS · pytrends 는 같은 호스트라 리미터 하나를 공유한다 (고정 sleep 2~3초 대체)
+
+TRENDS_HOST = "trends.google.com"
+
+
+def _trends_call(fn, *args, **kwargs):
+    """Google Trends 호출 1건 — 리미터로 간격 조절, 429 응답이면 감속 후 예외 그대로 전달."""
+    limiter = get_limiter(TRENDS_HOST)
+    limiter.acquire()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        resp = getattr(e, "response", None)
+        if getattr(resp, "status_code", 0) == 429 or "429" in str(e):
+            limiter.throttled(retry_after_seconds(resp))
+        raise
+    limiter.success()
+    return result
+
+
+def _replace_file(path: Path, data: bytes) -> None:
+    """같은 디렉터리의 고유 임시 파일에 쓴 뒤 교체 — 스레드 · 프로세스끼리 임시 파일을 공유하지 않는다."""
+    fd, tmp = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ── 관심도 점수 캐시 ──────────────────────────────────────────────────────────
+# "now 7-d" 관심도는 한 시간 안에는 거의 변하지 않는다. 키워드별 점수를 시간 단위
+# 버킷으로 디스크에 보관해, 같은 버킷 안에서는 재조회 없이 재사용한다
+# (--count 연속 실행에서 두 번째 토픽부터는 새 후보만 조회).
+
+SCORE_CACHE_FILE   = Path(__file__).parent / ".trend_score_cache.json"
+SCORE_BUCKET_SEC   = 3600   # 캐시 버킷 크기 (초) — 같은 버킷 안의 점수만 재사용
+SCORE_KEEP_BUCKETS = 48     # 이보다 오래된 항목은 저장 시 정리
+
+
+class TrendScoreCache:
+    """(범위, 키워드) → 시간 버킷별 관심도 점수. 범위는 "geo|앵커" 처럼 척도가 같은 묶음. 디스크(JSON) 기반, 스레드 안전."""
+
+    def __init__(self, path: Path = SCORE_CACHE_FILE, bucket_sec: int = SCORE_BUCKET_SEC):
+        self.path       = path
+        self.bucket_sec = bucket_sec
+        self._lock      = threading.Lock()
+        self._entries: dict[str, list] = {}    # "scope|kw" → [bucket, score | None]
+        self._loaded    = False
+        self.hits       = 0
+        self.misses     = 0
+        self.stored     = 0
+
+    def _bucket(self) -> int:
+        return int(time.time() // self.bucket_sec)
+
+    def _load(self) -> None:
+        """첫 사용 시 한 번 로드 (파일이 없거나 깨졌으면 빈 캐시)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            loaded = json.loads(self.path.read_text("utf-8"))
+            if isinstance(loaded, dict):
+                self._entries = {k: v for k, v in loaded.items()
+                                 if isinstance(v, list) and len(v) == 2}
+        except Exception:
+            pass
+
+    def lookup(self, keywords: list[str], scope: str) -> tuple[dict[str, int], list[str]]:
+        """
+        현재 버킷의 캐시 점수와 조회가 필요한 키워드로 분리 → (scores, missing).
+        Google 이 데이터 없음으로 응답한 키워드도 같은 버킷 안에서는 재조회하지 않는다.
+        """
+        bucket = self._bucket()
+        scores: dict[str, int] = {}
+        missing: list[str] = []
+        with self._lock:
+            self._load()
+            for kw in keywords:
+                entry = self._entries.get(f"{scope}|{kw}")
+                if entry is not None and entry[0] == bucket:
+                    self.hits += 1
+                    if entry[1] is not None:
+                        scores[kw] = entry[1]
+                else:
+                    self.misses += 1
+                    missing.append(kw)
+        return scores, missing
+
+    def store(self, results: dict[str, Optional[int]], scope: str) -> None:
+        """조회 결과 기록 (None = 데이터 없음). 실패한 배치는 넘기지 말 것 — 다음에 재조회."""
+        bucket = self._bucket()
+        with self._lock:
+            self._load()
+            for kw, score in results.items():
+                self._entries[f"{scope}|{kw}"] = [bucket, score]
+            self.stored += len(results)
+
+    def save(self) -> None:
+        """오래된 버킷 정리 후 고유 임시 파일에 쓰고 교체 (잠금 안에서 — 저장끼리 겹치지 않음)."""
+        oldest = self._bucket() - SCORE_KEEP_BUCKETS
+        with self._lock:
+            if not self._loaded:
+                return
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > oldest}
+            try:
+                _replace_file(self.path, json.dumps(self._entries, ensure_ascii=False).encode("utf-8"))
+            except Exception as e:
+                log.warning("[Trends] 점수 캐시 저장 실패: %s", e)
+
+    def stats(self) -> dict:
+        """이번 프로세스의 적중 · 미스 · 저장 수와 현재 버킷 항목 수."""
+        bucket = self._bucket()
+        with self._lock:
+            self._load()
+            fresh = sum(1 for v in self._entries.values() if v[0] == bucket)
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "stored": self.stored,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                    "entries": len(self._entries), "fresh": fresh}
+
+
+_SCORE_CACHE = TrendScoreCache()
+
+# ── 트렌드 이력 (trend_store.py) ──────────────────────────────────────────────
+# RSS · 관련 쿼리 · 관심도 관측을 SQLite 에 쌓고, 순위에 키워드별 모멘텀을 반영한다.
+# TREND_RANKING: score (현재 관심도만, 기본) / momentum (예상 관심도) / blend (예상 × 지속성)
+#   이력은 전략과 상관없이 쌓이므로 momentum · blend 는 backtest 로 확인한 뒤 켠다
+TREND_RANKING = os.getenv("TREND_RANKING", "score")
+_TREND_STORE  = TrendStore()
+
+
+def trend_cache_stats() -> dict:
+    return _SCORE_CACHE.stats()
+
+
+def log_trend_cache_stats() -> None:
+    s = _SCORE_CACHE.stats()
+    log.info("[Trends] 관심도 캐시: 적중 %d · 조회 %d (적중률 %.0f%%) · 저장 %d · 항목 %d (현재 버킷 %d)",
+             s["hits"], s["misses"], s["hit_rate"] * 100, s["stored"], s["entries"], s["fresh"])
+
 # ── 카테고리별 매핑 키워드 ────────────────────────────────────────────────────
 # 트렌드 키워드가 아래 단어를 포함하면 해당 카테고리로 분류
 CATEGORY_KEYWORDS: dict[str, list[str]] = {
@@ -98,65 +328,181 @@ EXCLUDE_KEYWORDS: list[str] = [
 ]
 
 
+# 추가 카테고리 용어 (선택) — {카테고리: [용어, ...] | {용어: 가중치}} JSON, CATEGORY_KEYWORDS 에 병합
+CATEGORY_TERMS_FILE = Path(__file__).parent / "category_terms.json"
+
+# 모듈 로드 시 한 번만 구성
+#   카테고리: 가중 점수 색인 (정방향 Aho-Corasick + 역방향 부분 문자열 사전) — category_index.py
+#   제외 키워드: 다중 문구 매처 (Aho-Corasick)
+_CATEGORY_INDEX  = CategoryIndex(CATEGORY_KEYWORDS).extend_from_file(CATEGORY_TERMS_FILE)
+_EXCLUDE_MATCHER = PhraseMatcher(EXCLUDE_KEYWORDS)
+
+
 def _is_shopping_relevant(keyword: str) -> bool:
     """쇼핑과 무관한 키워드 필터링"""
-    kw_lower = keyword.lower()
-    return not any(exc in kw_lower for exc in EXCLUDE_KEYWORDS)
+    return not _EXCLUDE_MATCHER.search(keyword.lower())
 
 
 def match_category(keyword: str) -> Optional[str]:
-    """키워드를 SITE_CATEGORIES 중 하나로 매핑. 매핑 실패 시 None."""
-    for category, kw_list in CATEGORY_KEYWORDS.items():
-        for kw in kw_list:
-            if kw in keyword or keyword in kw:
-                return category
-    return None
+    """키워드를 SITE_CATEGORIES 중 점수가 가장 높은 하나로 매핑 (동점이면 정의 순서). 매핑 실패 시 None."""
+    return _CATEGORY_INDEX.best(keyword)
 
 
-def fetch_realtime_trends(limit: int = 30) -> list[str]:
+# ── 실시간 급상승 (RSS) ───────────────────────────────────────────────────────
+# 피드 본문과 ETag / Last-Modified 를 로컬에 보관해 조건부 GET 으로 받고 (변경 없으면 304),
+# RSS_FRESH_SEC 안에 받은 피드는 요청 없이 재사용한다 (pick_topic 마다 호출되므로).
+# 파싱은 iterparse 로 item 단위 스트리밍, limit 개를 채우면 멈춘다.
+
+RSS_URL        = "https://trends.google.com/trending/rss?geo=KR"
+RSS_CACHE_FILE = Path(__file__).parent / ".trends_rss_cache.xml"
+RSS_META_FILE  = RSS_CACHE_FILE.with_suffix(".json")
+RSS_FRESH_SEC  = 300
+
+_RSS_LOCK = threading.Lock()
+_rss_feed: dict = {}     # {"body", "etag", "last_modified", "fetched_at"} — 메모리 사본
+
+
+@dataclass
+class TrendItem:
+    """급상승 키워드 1개 + 순위 보조 신호."""
+    keyword:   str
+    traffic:   int = 0                                  # ht:approx_traffic ("1,000+" → 1000)
+    published: str = ""                                 # pubDate 원문
+    news:      list[dict] = field(default_factory=list) # [{title, source, url}]
+
+
+def fetch_realtime_trend_items(limit: int = 30) -> list[TrendItem]:
     """
     Google Trends 한국 실시간 급상승 검색어 수집.
 
-    방법 1: Google Trends RSS (geo=KR) — 가장 안정적, API 키 불필요
-    방법 2: pytrends realtime_trending_searches (fallback)
+    방법 1: Google Trends RSS (geo=KR) — 가장 안정적, API 키 불필요. 검색량 · 관련 뉴스 포함
+    방법 2: pytrends realtime_trending_searches (fallback) — 키워드만
     실패 시 빈 리스트 반환 (blog_generator 는 고정 TOPICS 로 fallback).
     """
     # ── 방법 1: Google Trends RSS 피드 ────────────────────────────
-    keywords = _fetch_trends_rss(limit)
-    if keywords:
-        return keywords
+    items = _fetch_trends_rss(limit)
+    if items:
+        return items
 
     # ── 방법 2: pytrends realtime_trending_searches (fallback) ───
     keywords = _fetch_trends_pytrends(limit)
     if keywords:
-        return keywords
+        return [TrendItem(kw) for kw in keywords]
 
     log.warning("[Trends] 모든 수집 방법 실패")
     return []
 
 
-def _fetch_trends_rss(limit: int = 30) -> list[str]:
-    """Google Trends 공식 RSS 피드에서 한국 급상승 키워드 파싱."""
-    import requests
+def fetch_realtime_trends(limit: int = 30) -> list[str]:
+    """실시간 급상승 키워드 문자열만 (fetch_realtime_trend_items 참고)."""
+    return [item.keyword for item in fetch_realtime_trend_items(limit)]
+
+
+def _parse_traffic(text: str) -> int:
+    """'1,000+' · '2만+' · '5K+' → 정수 (해석 불가면 0)."""
+    m = re.search(r"([\d,.]+)\s*(만|천|[KkMm])?", text or "")
+    if not m:
+        return 0
+    try:
+        value = float(m.group(1).replace(",", ""))
+    except ValueError:
+        return 0
+    unit = {"만": 10_000, "천": 1_000, "k": 1_000, "m": 1_000_000}.get((m.group(2) or "").lower(), 1)
+    return int(value * unit)
+
+
+def _parse_trend_items(body: bytes, limit: int) -> list[TrendItem]:
+    """RSS 본문을 iterparse 로 item 단위 파싱 (ht: 네임스페이스 버전과 무관하게 로컬 이름으로 매칭)."""
     import xml.etree.ElementTree as ET
 
-    url = "https://trends.google.com/trending/rss?geo=KR"
+    def local(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1]
+
+    items: list[TrendItem] = []
+    for _, el in ET.iterparse(io.BytesIO(body), events=("end",)):
+        if local(el.tag) != "item":
+            continue
+        fields = {local(child.tag): (child.text or "").strip() for child in el}
+        keyword = fields.get("title", "")
+        if keyword:
+            news = []
+            for n in el:
+                if local(n.tag) == "news_item":
+                    sub = {local(c.tag): (c.text or "").strip() for c in n}
+                    news.append({"title":  sub.get("news_item_title", ""),
+                                 "source": sub.get("news_item_source", ""),
+                                 "url":    sub.get("news_item_url", "")})
+            items.append(TrendItem(keyword, _parse_traffic(fields.get("approx_traffic", "")),
+                                   fields.get("pubDate", ""), news))
+        el.clear()
+        if len(items) >= limit:
+            break
+    return items
+
+
+def _load_rss_cache() -> dict:
     try:
-        resp = requests.get(url, timeout=15, headers={
-            "User-Agent": "Mozilla/5.0 (compatible; ThiveLab/1.0)"
-        })
-        resp.raise_for_status()
-        root = ET.fromstring(resp.content)
-        # RSS <item><title> 파싱
-        keywords = []
-        for item in root.iter("item"):
-            title_el = item.find("title")
-            if title_el is not None and title_el.text:
-                keywords.append(title_el.text.strip())
-            if len(keywords) >= limit:
-                break
-        log.info("[Trends RSS] %d개 키워드 수집", len(keywords))
-        return keywords
+        meta = json.loads(RSS_META_FILE.read_text("utf-8"))
+        return {**meta, "body": RSS_CACHE_FILE.read_bytes()}
+    except Exception:
+        return {}
+
+
+def _save_rss_cache(feed: dict) -> None:
+    """본문 → 메타 순서로 각각 임시 파일에 쓴 뒤 교체 (호출자가 _RSS_LOCK 보유)."""
+    meta = {k: v for k, v in feed.items() if k != "body"}
+    try:
+        _replace_file(RSS_CACHE_FILE, feed["body"])
+        _replace_file(RSS_META_FILE, json.dumps(meta).encode("utf-8"))
+    except Exception as e:
+        log.warning("[Trends RSS] 로컬 사본 저장 실패: %s", e)
+
+
+def _rss_body() -> tuple[bytes, bool]:
+    """
+    RSS 본문 — RSS_FRESH_SEC 안에 받은 것은 요청 없이, 그 외에는 조건부 GET
+    (304 면 로컬 사본). 동시 호출은 잠금으로 한 번의 요청에 합친다. 실패 시 예외.
+    반환: (본문, 이번에 서버에서 확인했는지 — 이력 기록 여부)
+    """
+    global _rss_feed
+    with _RSS_LOCK:
+        feed = _rss_feed or _load_rss_cache()
+        if feed and time.time() - feed.get("fetched_at", 0) < RSS_FRESH_SEC:
+            log.debug("[Trends RSS] 최근 피드 재사용")
+            _rss_feed = feed
+            return feed["body"], False
+
+        headers = {}
+        if feed.get("etag"):
+            headers["If-None-Match"] = feed["etag"]
+        if feed.get("last_modified"):
+            headers["If-Modified-Since"] = feed["last_modified"]
+        session = _http_session()
+        resp = get_limiter(TRENDS_HOST).send(
+            lambda: session.get(RSS_URL, timeout=15, headers=headers), retries=1)
+
+        if resp.status_code == 304 and feed:
+            log.info("[Trends RSS] 변경 없음 (304) — 로컬 사본 사용")
+            feed = {**feed, "fetched_at": time.time()}
+        else:
+            resp.raise_for_status()
+            feed = {"body": resp.content, "etag": resp.headers.get("ETag", ""),
+                    "last_modified": resp.headers.get("Last-Modified", ""),
+                    "fetched_at": time.time()}
+        _save_rss_cache(feed)
+        _rss_feed = feed
+        return feed["body"], True
+
+
+def _fetch_trends_rss(limit: int = 30) -> list[TrendItem]:
+    """Google Trends 공식 RSS 피드에서 한국 급상승 키워드 파싱."""
+    try:
+        body, observed = _rss_body()
+        items = _parse_trend_items(body, limit)
+        log.info("[Trends RSS] %d개 키워드 수집", len(items))
+        if observed:
+            _TREND_STORE.record("rss", {item.keyword: item.traffic for item in items})
+        return items
     except Exception as e:
         log.debug("[Trends RSS] 실패: %s", e)
         return []
@@ -165,9 +511,8 @@ def _fetch_trends_rss(limit: int = 30) -> list[str]:
 def _fetch_trends_pytrends(limit: int = 30) -> list[str]:
     """pytrends realtime_trending_searches fallback."""
     try:
-        from pytrends.request import TrendReq
-        pytrends = TrendReq(hl="ko-KR", tz=540, timeout=(10, 30), retries=2, backoff_factor=1.0)
-        df = pytrends.realtime_trending_searches(pn="KR")
+        with _trend_client() as pytrends:
+            df = _trends_call(pytrends.realtime_trending_searches, pn="KR")
         if df is not None and not df.empty:
             col = df.columns[0]
             keywords = df[col].tolist()[:limit]
@@ -178,44 +523,93 @@ def _fetch_trends_pytrends(limit: int = 30) -> list[str]:
     return []
 
 
-def score_keywords_by_trend(keywords: list[str], geo: str = "KR") -> dict[str, int]:
-    """
-    pytrends interest_over_time 으로 키워드별 최근 7일 관심도 점수 반환.
-    최대 5개씩 배치 처리 (Google 제한).
-    """
-    try:
-        from pytrends.request import TrendReq
-    except ImportError:
-        return {}
+# ── 관심도 점수 (앵커 정규화) ─────────────────────────────────────────────────
+# Google Trends 는 한 요청(최대 5개)의 키워드끼리만 0~100 으로 정규화하므로 배치가
+# 다르면 점수를 비교할 수 없다. 모든 배치에 같은 앵커 키워드를 넣고(후보 4 + 앵커 1)
+# 배치마다 앵커 값으로 나눠 "앵커 = SCORE_ANCHOR_SCALE" 인 공통 척도로 환산한다.
+# 배치는 SCORE_WORKERS 개 스레드로 동시에 보내고(간격은 Trends 리미터가 조절),
+# SCORE_DEADLINE 안에 끝나지 않은 배치의 키워드는 점수 없이 돌려준다.
+
+SCORE_ANCHOR       = "청소기"   # 쇼핑 카테고리에서 수요가 꾸준한 중간 규모 키워드
+SCORE_ANCHOR_SCALE = 50         # 공통 척도에서 앵커의 점수
+SCORE_BATCH        = 4          # 배치당 후보 수 (+ 앵커 = Google 한도 5)
+SCORE_WORKERS      = 3
+SCORE_DEADLINE     = 30.0       # 점수 조회 전체 대기 상한 (초)
+SCORE_MAX_KEYWORDS = 100        # get_trending_topics 에서 점수를 매길 최대 후보 수
+ANCHOR_FLOOR       = 0.5        # 앵커가 0 으로 반올림된 배치 (후보가 훨씬 큼) 의 환산 하한
+
+
+def _score_batch(batch: list[str], anchor: str, geo: str) -> dict[str, Optional[int]]:
+    """후보 + 앵커 1회 조회 → 공통 척도 점수 (데이터 없음 = None). 실패 시 예외."""
+    df = _payload_query(batch + [anchor], "interest_over_time",
+                        cat=18, timeframe="now 7-d", geo=geo)   # 18 = Shopping
+    if df is None or df.empty or anchor not in df.columns:
+        return {kw: None for kw in batch}
+    scale = SCORE_ANCHOR_SCALE / max(float(df[anchor].mean()), ANCHOR_FLOOR)
+    return {
+        kw: round(float(df[kw].mean()) * scale) if kw in df.columns else None
+        for kw in batch
+    }
 
-    scores: dict[str, int] = {}
-    batch_size = 5
 
-    try:
-        pytrends = TrendReq(hl="ko-KR", tz=540, timeout=(10, 30), retries=2, backoff_factor=1.0)
+def _interest_source(geo: str, anchor: str) -> str:
+    """관심도 이력의 출처 이름 — 척도(geo · 앵커)가 다르면 다른 시계열."""
+    return "interest" if (geo, anchor) == ("KR", SCORE_ANCHOR) else f"interest:{geo}|{anchor}"
 
-        for i in range(0, len(keywords), batch_size):
-            batch = keywords[i : i + batch_size]
-            try:
-                pytrends.build_payload(
-                    batch,
-                    cat=18,             # Shopping 카테고리
-                    timeframe="now 7-d",
-                    geo=geo,
-                )
-                df = pytrends.interest_over_time()
-                if not df.empty:
-                    for kw in batch:
-                        if kw in df.columns:
-                            scores[kw] = int(df[kw].mean())
-                time.sleep(2.0)         # Rate limit 방지
-            except Exception as e:
-                log.debug("[Trends] 배치 점수 조회 실패 (%s): %s", batch, e)
-                time.sleep(3.0)
-
-    except Exception as e:
-        log.warning("[Trends] 관심도 점수 조회 실패: %s", e)
 
+def score_keywords_by_trend(keywords: list[str], geo: str = "KR", use_cache: bool = True,
+                            anchor: str = SCORE_ANCHOR,
+                            deadline: float = SCORE_DEADLINE) -> dict[str, int]:
+    """
+    pytrends interest_over_time 으로 키워드별 최근 7일 관심도 점수 반환.
+    점수는 앵커 기준 공통 척도 (앵커 = SCORE_ANCHOR_SCALE, 상한 없음) 라 배치와
+    관계없이 비교 가능하다. 현재 시간 버킷에 캐시된 키워드는 재조회하지 않는다.
+    """
+    scores: dict[str, int] = {}
+    scope = f"{geo}|{anchor}"            # 앵커가 바뀌면 척도도 바뀌므로 캐시 분리
+    todo  = [kw for kw in dict.fromkeys(keywords) if kw != anchor]
+    if anchor in keywords:
+        scores[anchor] = SCORE_ANCHOR_SCALE
+
+    if use_cache:
+        cached, todo = _SCORE_CACHE.lookup(todo, scope)
+        scores.update(cached)
+        if not todo:
+            log.info("[Trends] 관심도 %d개 모두 캐시 적중", len(scores))
+            return scores
+
+    t0 = time.perf_counter()
+    batches = [todo[i:i + SCORE_BATCH] for i in range(0, len(todo), SCORE_BATCH)]
+    pool = ThreadPoolExecutor(max_workers=SCORE_WORKERS, thread_name_prefix="trends-score")
+    futures = {pool.submit(_score_batch, batch, anchor, geo): batch for batch in batches}
+    done, pending = wait(futures, timeout=deadline)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    failed = 0
+    observed: dict[str, int] = {}
+    for future in done:
+        try:
+            fetched = future.result()
+        except ImportError:
+            break                        # pytrends 미설치 — 캐시 점수만 반환
+        except Exception as e:
+            failed += 1
+            log.debug("[Trends] 배치 점수 조회 실패 (%s): %s", futures[future], e)
+            continue
+        observed.update({kw: sc for kw, sc in fetched.items() if sc is not None})
+        if use_cache:
+            _SCORE_CACHE.store(fetched, scope)
+    scores.update(observed)
+    # 이력에는 새로 조회한 값만 (캐시 적중은 같은 관측의 반복). 기본 앵커 · KR 만 "interest"
+    _TREND_STORE.record(_interest_source(geo, anchor), observed)
+    if pending:
+        log.warning("[Trends] 관심도 %d/%d 배치 %gs 초과 — 해당 키워드는 점수 없음",
+                    len(pending), len(batches), deadline)
+    log.info("[Trends] 관심도 조회 %d개 (%d배치, 실패 %d) %.1fs, 앵커 '%s'",
+             len(todo), len(batches), failed, time.perf_counter() - t0, anchor)
+
+    if use_cache:
+        _SCORE_CACHE.save()
     return scores
 
 
@@ -241,15 +635,8 @@ def _fetch_pytrends_shopping_keywords(
     pytrends 쇼핑 카테고리(cat=18) 인기 검색어를 수집.
     반환: [(keyword, category, score), ...]
     """
-    try:
-        from pytrends.request import TrendReq
-    except ImportError:
-        return []
-
     results: list[tuple[str, str, int]] = []
     try:
-        pytrends = TrendReq(hl="ko-KR", tz=540, timeout=(10, 30), retries=2, backoff_factor=1.0)
-
         # 카테고리별 대표 시드 키워드로 관련 쿼리 수집
         seed_keywords: list[str] = []
         if category_filter:
@@ -263,8 +650,8 @@ def _fetch_pytrends_shopping_keywords(
         if not seed_keywords:
             return []
 
-        pytrends.build_payload(seed_keywords, cat=18, timeframe="now 7-d", geo="KR")
-        related = pytrends.related_queries()
+        related = _payload_query(seed_keywords, "related_queries",
+                                 cat=18, timeframe="now 7-d", geo="KR")
 
         for seed in seed_keywords:
             df_top = related.get(seed, {}).get("top")
@@ -283,13 +670,50 @@ def _fetch_pytrends_shopping_keywords(
                 results.append((kw, cat, score))
 
         log.info("[Trends pytrends shopping] 수집 키워드: %d개", len(results))
-        time.sleep(2)
+        _TREND_STORE.record("related", {kw: score for kw, _, score in results})
     except Exception as e:
         log.debug("[Trends pytrends shopping] 실패: %s", e)
 
     return results
 
 
+def _collect_sources(
+    category_filter: Optional[str] = None,
+) -> tuple[list[TrendItem], list[tuple[str, str, int]]]:
+    """
+    RSS 급상승(실패 시 pytrends realtime)과 pytrends 쇼핑 관련 쿼리를 동시에 수집.
+    COLLECT_TIMEOUT 안에 끝나지 않은 소스는 빈 결과로 보고 기다리지 않는다
+    (남은 스레드는 자체 요청 타임아웃으로 끝난다).
+    """
+    t0 = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trends")
+    futures = {
+        "RSS":      pool.submit(fetch_realtime_trend_items, 50),
+        "pytrends": pool.submit(_fetch_pytrends_shopping_keywords, category_filter, 30),
+    }
+    done, _ = wait(futures.values(), timeout=COLLECT_TIMEOUT)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results: dict[str, list] = {}
+    for name, future in futures.items():
+        if future in done:
+            results[name] = future.result()     # 수집 함수는 실패 시 빈 리스트 반환
+        else:
+            log.warning("[Trends] %s 수집 %gs 초과 — 제외", name, COLLECT_TIMEOUT)
+            results[name] = []
+    log.info("[Trends] 소스 수집 %.1fs (RSS %d개, pytrends %d개)", time.perf_counter() - t0,
+             len(results["RSS"]), len(results["pytrends"]))
+    return results["RSS"], results["pytrends"]
+
+
+def _with_rss_signals(topic: dict, item: Optional[TrendItem]) -> dict:
+    """RSS 출처 토픽에 검색량 · 관련 뉴스 제목(최대 3건) 추가."""
+    if item is None:
+        return topic
+    return {**topic, "trend_traffic": item.traffic,
+            "trend_news": [n["title"] for n in item.news[:3] if n["title"]]}
+
+
 def get_trending_topics(
     category_filter: Optional[str] = None,
     limit: int = 5,
@@ -304,8 +728,10 @@ def get_trending_topics(
     전략:
     1. Google Trends RSS 급상승 → 쇼핑 키워드 필터 → 카테고리 매핑
     2. pytrends 쇼핑 카테고리(cat=18) 관련 쿼리 → 추가 키워드 수집
+       (1 · 2 는 동시에 수집, COLLECT_TIMEOUT 초과 소스는 제외)
     3. 이미 발행된 키워드(exclude_published) 제외
-    4. pytrends interest_over_time 으로 관심도 점수 계산 후 정렬
+    4. pytrends interest_over_time 으로 관심도 점수 계산 후 정렬 (앵커 키워드로 배치 간 척도 통일,
+       trend_store 이력의 모멘텀으로 보정 — TREND_RANKING)
     5. 고정 TOPICS 는 보완 소스로만 활용 (all_topics 전달 시)
 
     Returns:
@@ -314,10 +740,12 @@ def get_trending_topics(
     """
     published = exclude_published or set()
 
-    # ── Step 1: RSS 급상승 키워드 수집 ────────────────────────────
-    raw_rss = fetch_realtime_trends(limit=50)
+    # ── Step 1: RSS 급상승 + pytrends 관련 쿼리 동시 수집 ─────────
+    raw_rss, raw_pt = _collect_sources(category_filter)
     rss_candidates: list[tuple[str, str]] = []  # (keyword, category)
-    for kw in raw_rss:
+    rss_items: dict[str, TrendItem] = {}         # 검색량 · 뉴스 신호
+    for item in raw_rss:
+        kw = item.keyword
         if not _is_shopping_relevant(kw):
             continue
         if kw in published:
@@ -328,13 +756,14 @@ def get_trending_topics(
         if category_filter and category != category_filter:
             continue
         rss_candidates.append((kw, category))
-        log.info("[Trends RSS] 쇼핑 키워드: %s [%s]", kw, category)
+        rss_items[kw] = item
+        log.info("[Trends RSS] 쇼핑 키워드: %s [%s] 검색량 %d+ 뉴스 %d건",
+                 kw, category, item.traffic, len(item.news))
 
-    # ── Step 2: pytrends 쇼핑 카테고리 관련 쿼리 수집 ────────────
+    # ── Step 2: pytrends 관련 쿼리는 RSS 후보가 부족할 때만 사용 ──
     pt_candidates: list[tuple[str, str, int]] = []
     if len(rss_candidates) < limit:
-        pt_candidates = _fetch_pytrends_shopping_keywords(category_filter, limit=30)
-        pt_candidates = [(kw, cat, sc) for kw, cat, sc in pt_candidates if kw not in published]
+        pt_candidates = [(kw, cat, sc) for kw, cat, sc in raw_pt if kw not in published]
 
     # ── Step 3: 고정 TOPICS 보완 소스 ────────────────────────────
     base_topics = all_topics or []
@@ -346,14 +775,13 @@ def get_trending_topics(
         and (not category_filter or t.get("category") == category_filter)
     ]
 
-    # ── Step 4: 관심도 점수 계산 ─────────────────────────────────
-    all_kws: list[str] = list({
-        kw for kw, _ in rss_candidates
-    } | {
-        kw for kw, _, _ in pt_candidates
-    } | {
-        kw for kw, _ in fixed_candidates
-    })[:25]  # Google 제한
+    # ── Step 4: 관심도 점수 계산 (앵커 공통 척도) ─────────────────
+    # 시간 제한에 걸려도 우선순위 높은 소스부터 점수가 매겨지도록 소스 순서 유지
+    all_kws: list[str] = list(dict.fromkeys(
+        [kw for kw, _ in rss_candidates]
+        + [kw for kw, _, _ in pt_candidates]
+        + [kw for kw, _ in fixed_candidates]
+    ))[:SCORE_MAX_KEYWORDS]
 
     scores: dict[str, int] = {}
     if all_kws:
@@ -365,21 +793,44 @@ def get_trending_topics(
             log.warning("[Trends] 관심도 점수 없음 — 수집 순서 유지")
 
     # ── Step 5: 후보 통합 + 점수순 정렬 ──────────────────────────
+    # 점수는 TREND_RANKING 전략으로 보정 — 이력의 속도 · 가속도 · 지속성 (추가 Google 호출 없음).
+    # 이번에 점수를 못 받은 키워드도 최근 이력이 있으면 그 예상 관심도를 쓴다.
+    strategy = TREND_RANKING if TREND_RANKING in STRATEGIES else "score"
+    if strategy != TREND_RANKING:
+        log.warning("[Trends] 알 수 없는 TREND_RANKING=%s — score 전략 사용", TREND_RANKING)
+    moments = _TREND_STORE.momentum(all_kws, source="interest") if strategy != "score" else {}
+
+    def _ranked_score(kw: str, default: int) -> int:
+        m = moments.get(kw)
+        if kw in scores:
+            return round(strategy_score(strategy, scores[kw], m))
+        return round(m.projected()) if m is not None else default
+
+    if moments:
+        rising = sorted(moments.values(), key=lambda m: -m.velocity)[:3]
+        log.info("[Trends] 모멘텀 (%s) 상승 Top3: %s", strategy,
+                 ", ".join(f"{m.keyword}({m.velocity:+.1f}/h, 지속 {m.persistence:.1f})" for m in rising))
+
     # (keyword, category, score, source_priority) — 낮을수록 우선
     merged: dict[str, tuple[str, str, int, int]] = {}
 
     for kw, cat in rss_candidates:
-        merged[kw] = (kw, cat, scores.get(kw, 90), 1)  # RSS = 최우선
+        merged[kw] = (kw, cat, _ranked_score(kw, 90), 1)  # RSS = 최우선
 
     for kw, cat, pt_score in pt_candidates:
         if kw not in merged:
-            merged[kw] = (kw, cat, scores.get(kw, pt_score), 2)
+            merged[kw] = (kw, cat, _ranked_score(kw, pt_score), 2)
 
     for kw, cat in fixed_candidates:
         if kw not in merged:
-            merged[kw] = (kw, cat, scores.get(kw, 0), 3)
+            merged[kw] = (kw, cat, _ranked_score(kw, 0), 3)
 
-    ranked = sorted(merged.values(), key=lambda x: (x[3], -x[2]))
+    # 같은 소스 · 같은 점수(점수 조회 실패 시 RSS 는 모두 90)면 RSS 검색량 · 뉴스 수 순
+    def _rss_signal(kw: str) -> tuple[int, int]:
+        item = rss_items.get(kw)
+        return (item.traffic, len(item.news)) if item else (0, 0)
+
+    ranked = sorted(merged.values(), key=lambda x: (x[3], -x[2], *(-v for v in _rss_signal(x[0]))))
 
     # ── Step 6: 카테고리 다양성 확보 후 limit 개 선택 ─────────────
     topics: list[dict] = []
@@ -398,9 +849,10 @@ def get_trending_topics(
             None,
         )
         if base:
-            topics.append({**base, "is_trend": True, "trend_score": score})
+            topic = {**base, "is_trend": True, "trend_score": score}
         else:
-            topics.append(_keyword_to_topic(kw, cat, score))
+            topic = _keyword_to_topic(kw, cat, score)
+        topics.append(_with_rss_signals(topic, rss_items.get(kw)))
 
         log.info("[Trends] 토픽 확정: %s [%s] score=%d", kw, cat, score)
 
@@ -416,9 +868,10 @@ def get_trending_topics(
                 None,
             )
             if base:
-                topics.append({**base, "is_trend": True, "trend_score": score})
+                topic = {**base, "is_trend": True, "trend_score": score}
             else:
-                topics.append(_keyword_to_topic(kw, cat, score))
+                topic = _keyword_to_topic(kw, cat, score)
+            topics.append(_with_rss_signals(topic, rss_items.get(kw)))
 
     if not topics:
         log.warning("[Trends] 트렌드 토픽 없음 — blog_generator 가 고정 TOPICS 로 fallback")
@@ -439,12 +892,18 @@ def main() -> None:
     parser.add_argument("--category", type=str, default=None, help="특정 카테고리 필터")
     parser.add_argument("--limit",    type=int, default=5,    help="최대 토픽 수 (기본: 5)")
     parser.add_argument("--raw",      action="store_true",    help="원시 트렌드 키워드만 출력")
+    parser.add_argument("--cache-stats", action="store_true", help="관심도 점수 캐시 현황 출력")
     args = parser.parse_args()
 
+    if args.cache_stats:
+        print(json.dumps(trend_cache_stats(), ensure_ascii=False, indent=2))
+        return
+
     if args.raw:
         print("\n[실시간 급상승 검색어 - 한국]")
-        for i, kw in enumerate(fetch_realtime_trends(limit=20), 1):
-            print(f"  {i:2d}. {kw}")
+        for i, item in enumerate(fetch_realtime_trend_items(limit=20), 1):
+            traffic = f"  ({item.traffic:,}+ · 뉴스 {len(item.news)}건)" if item.traffic else ""
+            print(f"  {i:2d}. {item.keyword}{traffic}")
         return
 
     # blog_generator 의 TOPICS 를 import 해서 관심도 점수 비교
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+트렌드 이력 저장소 — SQLite 시계열 + 키워드별 모멘텀 (속도 · 가속도 · 지속성)
+
+trend_fetcher 는 실행마다 현재 스냅샷(RSS 급상승, pytrends 관련 쿼리, 관심도 점수)만
+보고 순위를 매겼다. 관측값을 모두 시각과 함께 쌓아 두고, 관측이 들어올 때마다
+키워드 · 출처별 모멘텀을 갱신한다 (전체 이력을 다시 읽지 않음).
+
+  - observations : (키워드, 출처, 값, 시각) 원본 — 구간 통계 · 백테스트용
+  - momentum     : (키워드, 출처) 별 최신 값과 시간 가중 이동 통계
+      level        값의 지수이동평균 (시간 상수 LEVEL_TAU_H)
+      velocity     시간당 변화량의 지수이동평균
+      acceleration velocity 변화량의 지수이동평균
+      persistence  관측된 시간 버킷 수 (PERSIST_TAU_H 로 감쇠) — 오래 꾸준히 보인 키워드일수록 큼
+
+출처와 값:
+  rss       ht:approx_traffic (검색량 하한)
+  related   pytrends 관련 쿼리 value (요청 내 상대값)
+  interest  앵커 공통 척도 관심도 (trend_fetcher.score_keywords_by_trend)
+
+순위 전략 (strategy_score):
+  score     현재 관심도 그대로 (기존 동작, TREND_RANKING 기본값)
+  momentum  HORIZON_H 시간 뒤 예상 관심도 (현재 + 속도·h + ½·가속도·h²)
+  blend     momentum × 지속성 가중 (1 + PERSIST_BONUS·ln(1+persistence))
+
+Usage:
+    from trend_store import TrendStore, strategy_score
+    store = TrendStore()
+    store.record("interest", {"로봇청소기": 62, "가습기": 40})
+    moments = store.momentum(["로봇청소기"], source="interest")
+
+    python trend_store.py                            # 저장소 현황
+    python trend_store.py --top 20                   # 예상 관심도 상위 키워드
+    python trend_store.py --backtest --horizon 24    # 전략별 과거 순위 성능 비교
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+TREND_DB_FILE = Path(__file__).parent / ".trend_history.db"
+BUSY_TIMEOUT  = 10.0    # 다른 실행이 쓰는 중일 때 대기 (초)
+KEEP_DAYS     = 90      # observations 보관 기간 — momentum 은 계속 유지
+PRUNE_EVERY_H = 24.0    # record() 가 이 간격마다 보관 기간 지난 관측을 함께 삭제
+
+LEVEL_TAU_H   = 6.0     # level · velocity · acceleration 지수이동평균 시간 상수 (시간)
+PERSIST_TAU_H = 24.0    # persistence 감쇠 시간 상수 (시간)
+MIN_STEP_H    = 0.25    # 직전 관측과 이보다 가까우면 미분 갱신 생략 (캐시된 같은 값 반복 방지)
+HORIZON_H     = 6.0     # momentum 전략의 예측 시점 (시간 뒤)
+PERSIST_BONUS = 0.1
+MAX_AGE_H     = 24.0    # 이보다 오래된 모멘텀은 순위에 쓰지 않음
+
+STRATEGIES = ("score", "momentum", "blend")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    keyword     TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    value       REAL NOT NULL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS obs_series ON observations(source, keyword, observed_at);
+CREATE INDEX IF NOT EXISTS obs_time   ON observations(observed_at);
+CREATE TABLE IF NOT EXISTS momentum (
+    keyword      TEXT NOT NULL,
+    source       TEXT NOT NULL,
+    last_value   REAL NOT NULL,
+    last_at      REAL NOT NULL,
+    level        REAL NOT NULL,
+    velocity     REAL NOT NULL,
+    acceleration REAL NOT NULL,
+    persistence  REAL NOT NULL,
+    last_bucket  INTEGER NOT NULL,
+    count        INTEGER NOT NULL,
+    first_at     REAL NOT NULL,
+    PRIMARY KEY (source, keyword)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Momentum:
+    keyword:      str
+    source:       str
+    last_value:   float
+    last_at:      float     # 미분 기준 관측 시각 (MIN_STEP_H 이내 재관측은 갱신 안 함)
+    level:        float
+    velocity:     float     # 값/시간
+    acceleration: float     # 값/시간²
+    persistence:  float
+    last_bucket:  int       # 마지막으로 관측된 시간 버킷 (epoch 시간)
+    count:        int
+    first_at:     float
+
+    def projected(self, horizon_h: float = HORIZON_H) -> float:
+        """horizon_h 시간 뒤 예상 값 (음수는 0)."""
+        h = horizon_h
+        return max(0.0, self.last_value + self.velocity * h + 0.5 * self.acceleration * h * h)
+
+
+def advance(m: Optional[Momentum], keyword: str, source: str, value: float, at: float) -> Momentum:
+    """관측 1건 반영한 새 모멘텀 (순수 함수 — 저장소 기록과 백테스트 재생이 같은 계산을 쓴다)."""
+    bucket = int(at // 3600)
+    if m is None:
+        return Momentum(keyword, source, value, at, value, 0.0, 0.0, 1.0, bucket, 1, at)
+
+    persistence = m.persistence
+    if bucket > m.last_bucket:
+        persistence = persistence * math.exp(-(bucket - m.last_bucket) / PERSIST_TAU_H) + 1.0
+    m = replace(m, persistence=persistence, last_bucket=max(bucket, m.last_bucket), count=m.count + 1)
+
+    dt = (at - m.last_at) / 3600
+    if dt < MIN_STEP_H:
+        return m
+
+    alpha    = 1.0 - math.exp(-dt / LEVEL_TAU_H)
+    velocity = m.velocity + alpha * ((value - m.last_value) / dt - m.velocity)
+    accel    = m.acceleration + alpha * ((velocity - m.velocity) / dt - m.acceleration)
+    return replace(m, last_value=value, last_at=at, level=m.level + alpha * (value - m.level),
+                   velocity=velocity, acceleration=accel)
+
+
+def strategy_score(strategy: str, current: float, m: Optional[Momentum]) -> float:
+    """현재 값 + 모멘텀 → 전략별 순위 값 (모멘텀이 없으면 현재 값)."""
+    if strategy == "score" or m is None:
+        return current
+    h = HORIZON_H
+    projected = max(0.0, current + m.velocity * h + 0.5 * m.acceleration * h * h)
+    if strategy == "momentum":
+        return projected
+    if strategy == "blend":
+        return projected * (1.0 + PERSIST_BONUS * math.log1p(m.persistence))
+    raise ValueError(f"알 수 없는 순위 전략: {strategy} (가능: {', '.join(STRATEGIES)})")
+
+
+class TrendStore:
+    """SQLite 기반 트렌드 이력 저장소. 스레드 · 프로세스 동시 사용 안전."""
+
+    def __init__(self, path: Path = TREND_DB_FILE):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        # 처음 쓸 때 연다 (트렌드 조회를 하지 않는 실행은 파일을 만들지 않음)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # ── 기록 ──────────────────────────────────────────────────
+
+    def record(self, source: str, values: dict[str, float], at: Optional[float] = None) -> None:
+        """
+        관측값 기록 + 모멘텀 갱신 (한 트랜잭션). 실패해도 예외를 올리지 않는다.
+        마지막 정리 후 PRUNE_EVERY_H 시간이 지났으면 같은 트랜잭션에서 오래된 관측도 삭제.
+        """
+        if not values:
+            return
+        at = at or time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    db.executemany(
+                        "INSERT INTO observations(keyword, source, value, observed_at) VALUES (?, ?, ?, ?)",
+                        [(kw, source, float(v), at) for kw, v in values.items()],
+                    )
+                    current = self._load(db, source, list(values))
+                    db.executemany(
+                        "INSERT OR REPLACE INTO momentum VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [_row(advance(current.get(kw), kw, source, float(v), at))
+                         for kw, v in values.items()],
+                    )
+                    pruned = self._prune_due(db, time.time())
+                    db.execute("COMMIT")
+                except Exception:
+                    db.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            log.debug("[TrendStore] 기록 실패 (%s %d건): %s", source, len(values), e)
+            return
+        if pruned:
+            log.info("[TrendStore] %d일 지난 관측 %d건 삭제", KEEP_DAYS, pruned)
+
+    @staticmethod
+    def _delete_old(db: sqlite3.Connection, now: float, keep_days: float) -> int:
+        cur = db.execute("DELETE FROM observations WHERE observed_at < ?", (now - keep_days * 86400,))
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('pruned_at', ?)", (now,))
+        return cur.rowcount
+
+    def _prune_due(self, db: sqlite3.Connection, now: float) -> int:
+        """마지막 정리(meta.pruned_at)가 PRUNE_EVERY_H 시간 전이면 정리. 삭제한 행 수."""
+        row = db.execute("SELECT value FROM meta WHERE key = 'pruned_at'").fetchone()
+        if row and now - row[0] < PRUNE_EVERY_H * 3600:
+            return 0
+        return self._delete_old(db, now, KEEP_DAYS)
+
+    def prune(self, keep_days: float = KEEP_DAYS) -> int:
+        """보관 기간이 지난 관측 삭제 (record() 가 하루 한 번 자동 호출하는 것과 같음). 삭제한 행 수."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._delete_old(db, time.time(), keep_days)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            return deleted
+
+    # ── 조회 ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _load(db: sqlite3.Connection, source: str, keywords: list[str]) -> dict[str, Momentum]:
+        out: dict[str, Momentum] = {}
+        for i in range(0, len(keywords), 500):      # SQLite 변수 개수 제한
+            chunk = keywords[i:i + 500]
+            rows = db.execute(
+                f"SELECT * FROM momentum WHERE source = ? AND keyword IN ({','.join('?' * len(chunk))})",
+                (source, *chunk),
+            ).fetchall()
+            out.update({r[0]: _momentum(r) for r in rows})
+        return out
+
+    def momentum(self, keywords: Iterable[str], source: str = "interest",
+                 max_age_h: Optional[float] = MAX_AGE_H) -> dict[str, Momentum]:
+        """키워드별 모멘텀 (max_age_h 시간 안에 관측된 것만). 저장소 오류 시 빈 dict."""
+        try:
+            with self._lock:
+                found = self._load(self._db(), source, list(dict.fromkeys(keywords)))
+        except Exception as e:
+            log.debug("[TrendStore] 모멘텀 조회 실패: %s", e)
+            return {}
+        if max_age_h is None:
+            return found
+        oldest = int((time.time() - max_age_h * 3600) // 3600)
+        return {kw: m for kw, m in found.items() if m.last_bucket >= oldest}
+
+    def top(self, source: str = "interest", limit: int = 20,
+            max_age_h: Optional[float] = MAX_AGE_H) -> list[Momentum]:
+        """예상 값(projected) 상위 키워드."""
+        since = 0 if max_age_h is None else int((time.time() - max_age_h * 3600) // 3600)
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT * FROM momentum WHERE source = ? AND last_bucket >= ?", (source, since),
+            ).fetchall()
+        return sorted((_momentum(r) for r in rows), key=lambda m: -m.projected())[:limit]
+
+    def window(self, keyword: str, source: str = "interest", hours: float = 24.0) -> dict:
+        """최근 hours 시간 구간 통계 — {count, mean, min, max, first, last}."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT value FROM observations WHERE source = ? AND keyword = ? AND observed_at >= ? "
+                "ORDER BY observed_at",
+                (source, keyword, time.time() - hours * 3600),
+            ).fetchall()
+        values = [r[0] for r in rows]
+        if not values:
+            return {"count": 0}
+        return {"count": len(values), "mean": sum(values) / len(values), "min": min(values),
+                "max": max(values), "first": values[0], "last": values[-1]}
+
+    def observations(self, source: str, since: float = 0.0) -> Iterator[tuple[str, float, float]]:
+        """(keyword, value, observed_at) 시간순 — 백테스트 재생용."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT keyword, value, observed_at FROM observations "
+                "WHERE source = ? AND observed_at >= ? ORDER BY observed_at",
+                (source, since),
+            ).fetchall()
+        yield from rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            by_source = db.execute(
+                "SELECT source, COUNT(*), COUNT(DISTINCT keyword), MIN(observed_at), MAX(observed_at) "
+                "FROM observations GROUP BY source ORDER BY source"
+            ).fetchall()
+        return {src: {"observations": n, "keywords": k, "first_at": lo, "last_at": hi}
+                for src, n, k, lo, hi in by_source}
+
+
+def _row(m: Momentum) -> tuple:
+    return (m.keyword, m.source, m.last_value, m.last_at, m.level, m.velocity, m.acceleration,
+            m.persistence, m.last_bucket, m.count, m.first_at)
+
+
+def _momentum(row: tuple) -> Momentum:
+    return Momentum(*row)
+
+
+# ── 백테스트 ──────────────────────────────────────────────────────────────────
+
+def backtest(store: TrendStore, source: str = "interest", horizon_h: float = 24.0,
+             top_k: int = 5, strategies: Iterable[str] = STRATEGIES) -> dict[str, dict]:
+    """
+    관측 이력을 시간 버킷 단위로 재생하며, 각 버킷 시점에 관측된 키워드를 전략별로
+    순위 매겨 상위 top_k 의 이후 horizon_h 시간 평균 값(실현 관심도)을 비교한다.
+    lift = 상위 top_k 평균 / 후보 전체 평균 (1 보다 크면 무작위보다 나음).
+    """
+    obs = list(store.observations(source))
+    series: dict[str, list[tuple[float, float]]] = {}
+    for kw, value, at in obs:
+        series.setdefault(kw, []).append((at, value))
+
+    def future_mean(kw: str, start: float) -> Optional[float]:
+        vals = [v for at, v in series[kw] if start < at <= start + horizon_h * 3600]
+        return sum(vals) / len(vals) if vals else None
+
+    strategies = list(strategies)
+    totals = {s: {"snapshots": 0, "top_mean": 0.0, "lift": 0.0} for s in strategies}
+    state: dict[str, Momentum] = {}
+    i = 0
+    while i < len(obs):
+        bucket = int(obs[i][2] // 3600)
+        current: dict[str, float] = {}
+        while i < len(obs) and int(obs[i][2] // 3600) == bucket:
+            kw, value, at = obs[i]
+            state[kw] = advance(state.get(kw), kw, source, value, at)
+            current[kw] = value
+            i += 1
+        cutoff  = (bucket + 1) * 3600
+        outcome = {kw: f for kw in current if (f := future_mean(kw, cutoff)) is not None}
+        if len(outcome) <= top_k:
+            continue
+        baseline = sum(outcome.values()) / len(outcome)
+        for s in strategies:
+            ranked = sorted(outcome, key=lambda kw: -strategy_score(s, current[kw], state[kw]))
+            top_mean = sum(outcome[kw] for kw in ranked[:top_k]) / top_k
+            totals[s]["snapshots"] += 1
+            totals[s]["top_mean"]  += top_mean
+            totals[s]["lift"]      += top_mean / baseline if baseline else 1.0
+
+    return {s: {"snapshots": t["snapshots"],
+                "top_mean": round(t["top_mean"] / t["snapshots"], 2) if t["snapshots"] else 0.0,
+                "lift": round(t["lift"] / t["snapshots"], 3) if t["snapshots"] else 0.0}
+            for s, t in totals.items()}
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        datefmt="%Y-%m-%d %H:%M:%S")
+    parser = argparse.ArgumentParser(description="트렌드 이력 저장소 조회 · 백테스트")
+    parser.add_argument("--db",       type=Path,  default=TREND_DB_FILE, help="저장소 파일")
+    parser.add_argument("--source",   default="interest", help="출처 (interest / rss / related)")
+    parser.add_argument("--top",      type=int,   default=0, help="예상 값 상위 N개 키워드 출력")
+    parser.add_argument("--backtest", action="store_true", help="순위 전략별 과거 성능 비교")
+    parser.add_argument("--horizon",  type=float, default=24.0, help="백테스트 실현 구간 (시간)")
+    parser.add_argument("--top-k",    type=int,   default=5, help="백테스트 상위 K")
+    parser.add_argument("--prune",    action="store_true", help=f"{KEEP_DAYS}일 지난 관측 삭제")
+    args = parser.parse_args()
+
+    store = TrendStore(args.db)
+    if args.prune:
+        print(f"삭제: {store.prune()}건")
+    if args.top:
+        print(f"\n{'키워드':<24}{'현재':>8}{'속도/h':>9}{'가속/h²':>9}{'지속성':>8}{'예상':>8}")
+        print("─" * 66)
+        for m in store.top(args.source, args.top):
+            print(f"{m.keyword:<24}{m.last_value:>8.1f}{m.velocity:>9.2f}{m.acceleration:>9.2f}"
+                  f"{m.persistence:>8.1f}{m.projected():>8.1f}")
+        return
+    if args.backtest:
+        result = backtest(store, args.source, args.horizon, args.top_k)
+        print(f"\n{'전략':<10}{'스냅샷':>8}{'상위 평균':>10}{'lift':>8}")
+        print("─" * 36)
+        for s, r in result.items():
+            print(f"{s:<10}{r['snapshots']:>8}{r['top_mean']:>10.2f}{r['lift']:>8.3f}")
+        return
+    for src, s in store.stats().items():
+        span = (s["last_at"] - s["first_at"]) / 86400
+        print(f"{src:<10} 관측 {s['observations']:>7}건  키워드 {s['keywords']:>5}개  기간 {span:.1f}일")
+
+
+if __name__ == "__main__":
+    main()